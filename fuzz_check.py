@@ -0,0 +1,460 @@
+"""
+Differential fuzz check: every fast cut-length path must print exactly what the reference prints.
+
+Generates random catalogues (fraction-string offsets, invalid and missing cells, duplicate
+rows, reducing tee and bushing sizes, G1 offsets) and random cuts (standard with G1 flags,
+bushing, lay-in, with and without shave). The reference is a frozen copy of the original
+calculator, kept in this file so later changes to src/ can't move it: the row-scan
+DimensionLoader.get_offset / get_offset_g1, the cut formulas, the literal 1/16" shave and
+decimal_to_fraction_16ths. Each fast path must give the same decimal, the same printed
+fraction and fail on the same inputs. Offsets and C2C values lie on the 1/64" grid the
+fixed-point engine works in. The app must be configured with the original 1/16" grid,
+truncating, and a 1/16" shave.
+
+The speedup column compares each path with that original calculator on the same cuts.
+
+Fast paths: CutBatch, cut-list upload (cached per fitting), background job queue,
+fixed-point (pair matrix), pipe-run API and fixed-point in worker processes.
+
+Usage:
+    python fuzz_check.py --catalogues 20 --cuts 2000 --seed 1
+Exits with status 1 if any path disagrees with the reference.
+"""
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from math import gcd
+import pandas as pd
+from src.api import (
+    add_cut_to_batch,
+    get_cut_length_units, get_lay_in_cut_units, get_bushing_cut_units, get_run_cut_units,
+)
+from src.config import SUPPORTED_CONNECTOR_TYPES, OFFSET_COLUMN, OFFSET_COLUMN_G1
+from src.cut_list import compute_cut_list
+from src.job_queue import compute_cut_data
+from src.formatting import DEFAULT_FORMATTER, TRUNCATE, format_length, format_length_units
+from src.lengths import SHAVE_INCHES, SHAVE_UNITS, UNITS_PER_INCH
+from src.loader import DimensionLoader
+from src.models import CutBatch
+
+BUSHING_TYPE = "Bushing (Spigot x Socket)"
+REDUCING_TEE = "Tee (Reducing)"
+NOMINAL_SIZES = ["0.5", "0.75", "1", "1.25", "1.5", "2", "2.5", "3", "4", "6", "8"]
+ERROR = "error"
+
+PATHS = ["batch", "cut list", "job queue", "fixed-point", "pipe run", "multi-process"]
+# Cut kinds each path can compute
+PATH_KINDS = {
+    "batch": {"standard"},
+    "cut list": {"standard", "bushing"},
+    "job queue": {"standard", "bushing"},
+    "fixed-point": {"standard", "bushing", "lay-in"},
+    "pipe run": {"standard", "bushing"},
+    "multi-process": {"standard", "bushing", "lay-in"},
+}
+
+
+# ----------------------------------------------------------------------------
+# Random inputs
+# ----------------------------------------------------------------------------
+
+def random_length(rng: random.Random, low: float, high: float) -> Fraction:
+    return Fraction(rng.randint(int(low * UNITS_PER_INCH), int(high * UNITS_PER_INCH)), UNITS_PER_INCH)
+
+
+def random_size(rng: random.Random, conn_type: str) -> str:
+    if conn_type == REDUCING_TEE:
+        run, branch = sorted(rng.sample(NOMINAL_SIZES, 2), key=float, reverse=True)
+        size = f"{run}x{run}x{branch}"
+    elif conn_type == BUSHING_TYPE:
+        outer, inner = sorted(rng.sample(NOMINAL_SIZES, 2), key=float, reverse=True)
+        size = f"{outer}x{inner}"
+    else:
+        return rng.choice(NOMINAL_SIZES)
+    return size.upper() if rng.random() < 0.1 else size
+
+
+def size_cell(rng: random.Random, size: str):
+    # Excel hands numeric sizes back as int or float
+    if "x" in size.lower() or rng.random() < 0.5:
+        return size
+    value = float(size)
+    return int(value) if value.is_integer() and rng.random() < 0.5 else value
+
+
+def offset_cell(rng: random.Random):
+    roll = rng.random()
+    if roll < 0.04:
+        return None
+    if roll < 0.06:
+        return rng.choice(["abc", "1 3/8", "n/a"])
+    offset = random_length(rng, 0.25, 6)
+    if roll < 0.35:
+        return str(offset)          # fraction string such as '15/32'
+    if roll < 0.45:
+        return str(float(offset))   # decimal string
+    return float(offset)
+
+
+def random_catalogue(rng: random.Random) -> pd.DataFrame:
+    rows = []
+    for conn_type in SUPPORTED_CONNECTOR_TYPES:
+        for _ in range(rng.randint(2, 12)):
+            size = random_size(rng, conn_type)
+            g1 = None
+            if conn_type == REDUCING_TEE and rng.random() < 0.6 or rng.random() < 0.05:
+                g1 = offset_cell(rng)
+            row = {"Part": conn_type, "Size": size_cell(rng, size), OFFSET_COLUMN: offset_cell(rng), OFFSET_COLUMN_G1: g1}
+            rows.append(row)
+            if rng.random() < 0.1:
+                # Duplicate key: lookups use the first row with an offset
+                rows.append(dict(row, **{OFFSET_COLUMN: offset_cell(rng)}))
+    rows.append({"Part": "Cross (Socket x Socket)", "Size": "2", OFFSET_COLUMN: 1.0, OFFSET_COLUMN_G1: None})
+    rng.shuffle(rows)
+    return pd.DataFrame(rows, columns=["Part", "Size", OFFSET_COLUMN, OFFSET_COLUMN_G1])
+
+
+def random_cuts(rng: random.Random, df: pd.DataFrame, count: int) -> list:
+    sizes = {conn_type: [str(s) for s in df.loc[df["Part"] == conn_type, "Size"]] for conn_type in SUPPORTED_CONNECTOR_TYPES}
+    end_types = [t for t in SUPPORTED_CONNECTOR_TYPES if t != BUSHING_TYPE]
+
+    def fitting(types):
+        conn_type = rng.choice(types)
+        if rng.random() < 0.03 or not sizes[conn_type]:
+            return conn_type, "99"
+        size = rng.choice(sizes[conn_type])
+        if rng.random() < 0.1 and "x" not in size.lower():
+            size = str(float(size))   # '2' typed as '2.0'
+        return conn_type, size
+
+    cuts = []
+    for _ in range(count):
+        roll = rng.random()
+        shave = rng.random() < 0.5
+        type_a, size_a = fitting(end_types)
+        type_b, size_b = fitting(end_types)
+        c2c = float(random_length(rng, 0, 120))
+        if roll < 0.6:
+            cuts.append({"kind": "standard", "type_a": type_a, "size_a": size_a, "type_b": type_b, "size_b": size_b,
+                         "c2c": c2c, "use_g1_a": rng.random() < 0.3, "use_g1_b": rng.random() < 0.3, "shave": shave})
+        elif roll < 0.85:
+            _, size_bushing = fitting([BUSHING_TYPE])
+            cuts.append({"kind": "bushing", "type_a": type_a, "size_a": size_a, "type_b": type_b, "size_b": size_b,
+                         "size_bushing": size_bushing, "c2c": c2c, "shave": shave})
+        else:
+            type_lay_in, size_lay_in = fitting(end_types)
+            cuts.append({"kind": "lay-in", "type_a": type_a, "size_a": size_a, "type_lay_in": type_lay_in,
+                         "size_lay_in": size_lay_in, "type_b": type_b, "size_b": size_b, "c2c": c2c,
+                         "c2c_lay_in": float(random_length(rng, 0, c2c)), "shave": shave})
+    return cuts
+
+
+# ----------------------------------------------------------------------------
+# Reference: the original calculator, frozen. Do not "fix" or speed up anything here.
+# ----------------------------------------------------------------------------
+
+BASELINE_SHAVE = 1 / 16
+
+
+class BaselineLoader:
+    """The original DimensionLoader lookups (row scan per call), built from a DataFrame."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.copy()
+        self.df.columns = [c.strip() for c in self.df.columns]
+        self.part_col, self.size_col = "Part", "Size"
+        self.connector_map = {}
+        for conn_type in SUPPORTED_CONNECTOR_TYPES:
+            matching_rows = []
+            for idx, row in self.df.iterrows():
+                part_val = str(row[self.part_col]).strip()
+                if part_val == conn_type:
+                    matching_rows.append(row)
+            self.connector_map[conn_type] = matching_rows
+
+    def _normalize_size_value(self, val):
+        if pd.isna(val):
+            return ""
+        val_str = str(val).strip()
+        if 'x' in val_str.lower():
+            return val_str.lower()
+        try:
+            v = float(val_str)
+            if v.is_integer():
+                return str(int(v))
+            return str(v)
+        except ValueError:
+            return val_str.lower()
+
+    def _parse_offset_value(self, val):
+        if pd.isna(val):
+            return None
+        try:
+            return float(val)
+        except (ValueError, TypeError):
+            try:
+                frac = Fraction(str(val).strip())
+                return float(frac)
+            except (ValueError, ZeroDivisionError):
+                raise ValueError(f"Cannot convert '{val}' to numeric offset")
+
+    def get_offset(self, conn_type: str, conn_size: str) -> float:
+        if conn_type not in SUPPORTED_CONNECTOR_TYPES and conn_type not in self.connector_map:
+            raise ValueError(f"Unsupported connector type: '{conn_type}'")
+        normalized_input_size = self._normalize_size_value(conn_size)
+        matching_rows = self.connector_map.get(conn_type, [])
+        if not matching_rows:
+            raise ValueError(f"No database entries found for connector type '{conn_type}'")
+        for row in matching_rows:
+            if self._normalize_size_value(row[self.size_col]) == normalized_input_size:
+                offset = row.get(OFFSET_COLUMN)
+                if pd.notna(offset):
+                    return self._parse_offset_value(offset)
+        raise ValueError(f"No matching size '{conn_size}' for connector '{conn_type}'")
+
+    def get_offset_g1(self, conn_type: str, conn_size: str) -> float:
+        if conn_type not in SUPPORTED_CONNECTOR_TYPES and conn_type not in self.connector_map:
+            raise ValueError(f"Unsupported connector type: '{conn_type}'")
+        normalized_input_size = self._normalize_size_value(conn_size)
+        matching_rows = self.connector_map.get(conn_type, [])
+        if not matching_rows:
+            raise ValueError(f"No database entries found for connector type '{conn_type}'")
+        for row in matching_rows:
+            if self._normalize_size_value(row[self.size_col]) == normalized_input_size:
+                if OFFSET_COLUMN_G1 in self.df.columns:
+                    g1_offset = row.get(OFFSET_COLUMN_G1)
+                    if pd.notna(g1_offset):
+                        try:
+                            return self._parse_offset_value(g1_offset)
+                        except ValueError:
+                            return None
+                return None
+        return None
+
+
+def baseline_fraction_16ths(decimal: float) -> str:
+    frac = Fraction(decimal).limit_denominator(1000)
+    frac_16ths = frac * 16
+    whole = int(frac_16ths) // 16
+    remainder = int(frac_16ths) % 16
+    if remainder == 0:
+        return str(whole)
+    common_divisor = gcd(remainder, 16)
+    return f"{whole} {remainder // common_divisor}/{16 // common_divisor}"
+
+
+def reference(loader: BaselineLoader, cut: dict):
+    try:
+        offset_a = loader.get_offset(cut["type_a"], cut["size_a"])
+        if cut["kind"] == "standard":
+            offset_b = loader.get_offset(cut["type_b"], cut["size_b"])
+            if cut["use_g1_a"]:
+                g1_offset_a = loader.get_offset_g1(cut["type_a"], cut["size_a"])
+                if g1_offset_a is not None:
+                    offset_a = g1_offset_a
+            if cut["use_g1_b"]:
+                g1_offset_b = loader.get_offset_g1(cut["type_b"], cut["size_b"])
+                if g1_offset_b is not None:
+                    offset_b = g1_offset_b
+            lengths = [float(cut["c2c"]) - float(offset_a) - float(offset_b)]
+        elif cut["kind"] == "bushing":
+            offset_bushing = loader.get_offset(BUSHING_TYPE, cut["size_bushing"])
+            offset_b = loader.get_offset(cut["type_b"], cut["size_b"])
+            lengths = [float(cut["c2c"]) - float(offset_a) - float(offset_b) - offset_bushing]
+        else:
+            offset_lay_in = loader.get_offset(cut["type_lay_in"], cut["size_lay_in"])
+            offset_b = loader.get_offset(cut["type_b"], cut["size_b"])
+            c2c_overall, c2c_lay_in = float(cut["c2c"]), float(cut["c2c_lay_in"])
+            # The original argument order: cut 1 takes the lay-in offset, cut 2 both end offsets
+            lengths = [c2c_overall - c2c_lay_in - float(offset_lay_in), c2c_lay_in - float(offset_a) - float(offset_b)]
+    except ValueError:
+        return ERROR
+    if cut["shave"]:
+        lengths = [length - BASELINE_SHAVE for length in lengths]
+    return tuple((length, baseline_fraction_16ths(length)) for length in lengths)
+
+
+# ----------------------------------------------------------------------------
+# Fast paths. Each returns a tuple of (decimal, fraction) per cut, or ERROR.
+# ----------------------------------------------------------------------------
+
+def _printed(lengths) -> tuple:
+    return tuple((length, format_length(length)) for length in lengths)
+
+
+def _printed_units(units) -> tuple:
+    return tuple((u / UNITS_PER_INCH, format_length_units(u)) for u in units)
+
+
+def fixed_point(loader: DimensionLoader, cut: dict):
+    try:
+        if cut["kind"] == "standard":
+            units = [get_cut_length_units(loader, cut["type_a"], cut["size_a"], cut["type_b"], cut["size_b"], cut["c2c"],
+                                          cut["use_g1_a"], cut["use_g1_b"])]
+        elif cut["kind"] == "bushing":
+            units = [get_bushing_cut_units(loader, cut["type_a"], cut["size_a"], BUSHING_TYPE, cut["size_bushing"],
+                                           cut["type_b"], cut["size_b"], cut["c2c"])]
+        else:
+            units = list(get_lay_in_cut_units(loader, cut["type_a"], cut["size_a"], cut["type_lay_in"], cut["size_lay_in"],
+                                              cut["type_b"], cut["size_b"], cut["c2c"], cut["c2c_lay_in"]))
+    except ValueError:
+        return ERROR
+    if cut["shave"]:
+        units = [u - SHAVE_UNITS for u in units]
+    return _printed_units(units)
+
+
+def pipe_run(loader: DimensionLoader, cut: dict):
+    if cut["kind"] == "standard":
+        fittings = [(cut["type_a"], cut["size_a"], cut["use_g1_a"]), (cut["type_b"], cut["size_b"], cut["use_g1_b"])]
+    else:
+        fittings = [(cut["type_a"], cut["size_a"]), (BUSHING_TYPE, cut["size_bushing"]), (cut["type_b"], cut["size_b"])]
+    try:
+        units = get_run_cut_units(loader, fittings, [cut["c2c"]], cut["shave"])
+    except ValueError:
+        return ERROR
+    return _printed_units(int(u) for u in units)
+
+
+def job_queue(loader: DimensionLoader, cut: dict):
+    spec = dict(cut, type="Standard" if cut["kind"] == "standard" else "Bushing")
+    try:
+        cut_data = compute_cut_data(loader, spec)
+    except ValueError:
+        return ERROR
+    return ((cut_data["length_decimal"], cut_data["length_fraction"]),)
+
+
+def run_batch(loader: DimensionLoader, cuts: list) -> dict:
+    batch, rows, results = CutBatch(), {}, {}
+    for i, cut in enumerate(cuts):
+        try:
+            rows[i] = add_cut_to_batch(loader, batch, cut["type_a"], cut["size_a"], cut["type_b"], cut["size_b"],
+                                       cut["c2c"], cut["use_g1_a"], cut["use_g1_b"])
+        except ValueError:
+            results[i] = ERROR
+    lengths = batch.cut_lengths()
+    for i, row in rows.items():
+        length = lengths[row] - SHAVE_INCHES if cuts[i]["shave"] else lengths[row]
+        results[i] = _printed([length])
+    return results
+
+
+def run_cut_list(loader: DimensionLoader, cuts: list) -> dict:
+    df = pd.DataFrame([{
+        "cut_type": "Standard" if cut["kind"] == "standard" else "Bushing",
+        "type_a": cut["type_a"], "size_a": cut["size_a"], "type_b": cut["type_b"], "size_b": cut["size_b"],
+        "size_bushing": cut.get("size_bushing", ""), "c2c": repr(cut["c2c"]),
+        "use_g1_a": "y" if cut.get("use_g1_a") else "", "use_g1_b": "y" if cut.get("use_g1_b") else "",
+        "shave": "y" if cut["shave"] else "", "notes": "",
+    } for cut in cuts])
+    computed, errors = compute_cut_list(loader, df)
+    failed = {row - 2 for row, _ in errors}
+    results, computed = {}, iter(computed)
+    for i in range(len(cuts)):
+        if i in failed:
+            results[i] = ERROR
+        else:
+            cut_data = next(computed)
+            results[i] = ((cut_data["length_decimal"], cut_data["length_fraction"]),)
+    return results
+
+
+_worker_loader = None
+
+
+def _init_worker(df: pd.DataFrame):
+    global _worker_loader
+    _worker_loader = DimensionLoader.from_dataframe(df)
+
+
+def _worker_chunk(cuts: list) -> list:
+    return [fixed_point(_worker_loader, cut) for cut in cuts]
+
+
+def run_multi_process(pool: ProcessPoolExecutor, cuts: list, workers: int) -> dict:
+    chunk = max(1, len(cuts) // (workers * 4))
+    chunks = [cuts[start:start + chunk] for start in range(0, len(cuts), chunk)]
+    results = {}
+    for start, chunk_results in zip(range(0, len(cuts), chunk), pool.map(_worker_chunk, chunks)):
+        for offset, result in enumerate(chunk_results):
+            results[start + offset] = result
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Driver
+# ----------------------------------------------------------------------------
+
+def check_catalogue(seed: int, cut_count: int, workers: int, stats: dict, mismatches: list):
+    rng = random.Random(seed)
+    df = random_catalogue(rng)
+    loader = DimensionLoader.from_dataframe(df)
+    baseline = BaselineLoader(df)
+    cuts = random_cuts(rng, df, cut_count)
+
+    expected, reference_time = [], {}
+    for cut in cuts:
+        start = time.perf_counter()
+        expected.append(reference(baseline, cut))
+        reference_time[cut["kind"]] = reference_time.get(cut["kind"], 0.0) + time.perf_counter() - start
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(df,)) as pool:
+        pool.submit(_worker_chunk, []).result()  # start the workers before timing
+        for path in PATHS:
+            indexes = [i for i, cut in enumerate(cuts) if cut["kind"] in PATH_KINDS[path]]
+            subset = [cuts[i] for i in indexes]
+            start = time.perf_counter()
+            if path == "batch":
+                results = run_batch(loader, subset)
+            elif path == "cut list":
+                results = run_cut_list(loader, subset)
+            elif path == "multi-process":
+                results = run_multi_process(pool, subset, workers)
+            else:
+                compute = {"job queue": job_queue, "fixed-point": fixed_point, "pipe run": pipe_run}[path]
+                results = {j: compute(loader, cut) for j, cut in enumerate(subset)}
+            elapsed = time.perf_counter() - start
+
+            path_stats = stats.setdefault(path, {"cuts": 0, "mismatches": 0, "time": 0.0, "reference_time": 0.0})
+            path_stats["cuts"] += len(subset)
+            path_stats["time"] += elapsed
+            path_stats["reference_time"] += sum(reference_time.get(kind, 0.0) for kind in PATH_KINDS[path])
+            for j, i in enumerate(indexes):
+                if results[j] != expected[i]:
+                    path_stats["mismatches"] += 1
+                    mismatches.append((seed, path, cuts[i], expected[i], results[j]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every fast cut-length path against the reference calculator")
+    parser.add_argument("--catalogues", type=int, default=20, help="Random catalogues to generate")
+    parser.add_argument("--cuts", type=int, default=2000, help="Random cuts per catalogue")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the first catalogue")
+    parser.add_argument("--workers", type=int, default=2, help="Processes for the multi-process path")
+    args = parser.parse_args()
+    if (DEFAULT_FORMATTER.grid, DEFAULT_FORMATTER.rounding, SHAVE_UNITS) != (16, TRUNCATE, UNITS_PER_INCH // 16):
+        sys.exit("The reference is the original 1/16\" truncating format with a 1/16\" shave; "
+                 "set LENGTH_GRID, LENGTH_ROUNDING and SHAVE back to those to run this check")
+
+    stats, mismatches = {}, []
+    for seed in range(args.seed, args.seed + args.catalogues):
+        check_catalogue(seed, args.cuts, args.workers, stats, mismatches)
+
+    print(f"{args.catalogues} catalogues x {args.cuts} cuts (seeds {args.seed}..{args.seed + args.catalogues - 1})")
+    print(f"{'path':<15}{'cuts':>9}{'mismatches':>12}{'path ms':>10}{'ref ms':>10}{'speedup':>9}")
+    for path in PATHS:
+        s = stats[path]
+        speedup = s["reference_time"] / s["time"] if s["time"] else float("inf")
+        print(f"{path:<15}{s['cuts']:>9}{s['mismatches']:>12}{s['time'] * 1000:>10.1f}"
+              f"{s['reference_time'] * 1000:>10.1f}{speedup:>8.1f}x")
+    for seed, path, cut, expected, got in mismatches[:10]:
+        print(f"\nMISMATCH seed={seed} path={path}\n  cut: {cut}\n  reference: {expected}\n  {path}: {got}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
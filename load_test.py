@@ -0,0 +1,235 @@
+"""
+Concurrent-session load test for streamlit_app.py.
+
+Runs N simulated sessions at once with Streamlit's headless AppTest, each doing a realistic
+script (open the app, calculate a standard cut, add cuts to a job, add and delete a fitting
+size in Manage Fittings). Reports per-interaction latency percentiles and process RSS for
+each N. All sessions share this process, as they would share one server process.
+
+The app runs from a temporary copy of the project, so Manage Fittings edits never touch
+the real workbook, journal or src/config.py.
+
+Usage:
+    python load_test.py --sessions 1,2,4,8 --cuts 5
+"""
+import argparse
+import json
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+import numpy as np
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+PROJECT_DIR = Path(__file__).parent
+COPY_IGNORE = shutil.ignore_patterns(".git", "__pycache__", "*.pyc", ".pytest_cache", "catalogue_journal*.jsonl")
+STANDARD_TYPE = "Tee (Socket x Socket x Socket)"
+EDIT_TYPE = "Union (Socket x Socket)"
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def allow_concurrent_app_tests():
+    """
+    Make AppTest behave like one server with many sessions.
+
+    AppTest installs a mock Runtime singleton for each run and clears it when the run ends,
+    which breaks any other session still running. Once one has been installed, keep handing
+    out the last one, the way a real server has a single Runtime for every session.
+    AppTest also compiles the script on every run (a server compiles it once, and parallel
+    compiles can crash the parser), so compiled scripts are shared.
+    """
+    last = []
+    compiled = {}
+    compile_lock = threading.Lock()
+    get_bytecode = ScriptCache.get_bytecode
+
+    def shared_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in compiled:
+                compiled[script_path] = get_bytecode(self, script_path)
+            return compiled[script_path]
+
+    def instance(cls):
+        runtime = cls._instance
+        if runtime is not None:
+            last[:] = [runtime]
+            return runtime
+        if last:
+            return last[0]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    def exists(cls):
+        return cls._instance is not None or bool(last)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+    ScriptCache.get_bytecode = shared_bytecode
+
+
+def copy_project(target: Path) -> Path:
+    """Copy the app and its data into target; returns the path of the copied streamlit_app.py."""
+    for name in ("src", "data", "images", ".streamlit"):
+        if (PROJECT_DIR / name).exists():
+            shutil.copytree(PROJECT_DIR / name, target / name, ignore=COPY_IGNORE)
+    shutil.copy(PROJECT_DIR / "streamlit_app.py", target / "streamlit_app.py")
+    return target / "streamlit_app.py"
+
+
+class Session:
+    """One simulated tablet: an AppTest plus the latencies of its interactions."""
+
+    def __init__(self, app_path: Path, session_id: int, timeout: float):
+        self.app_path = app_path
+        self.session_id = session_id
+        self.timeout = timeout
+        self.timings = []   # (interaction, seconds)
+        self.errors = []    # (interaction, message)
+        self.at = None
+
+    def step(self, interaction: str, action=None):
+        """Apply a widget action (if any), rerun the script and record how long the rerun took."""
+        start = time.perf_counter()
+        try:
+            if self.at is None:
+                self.at = AppTest.from_file(str(self.app_path), default_timeout=self.timeout)
+            if action is not None:
+                action(self.at)
+            self.at.run()
+            elapsed = time.perf_counter() - start
+            self.timings.append((interaction, elapsed))
+            for exception in self.at.exception:
+                self.errors.append((interaction, exception.value))
+            for error in self.at.error:
+                self.errors.append((interaction, error.value))
+        except Exception as e:
+            self.errors.append((interaction, f"{type(e).__name__}: {e}"))
+
+    def widget(self, kind: str, label: str):
+        return next(w for w in getattr(self.at, kind) if w.label == label)
+
+    def run_script(self, cuts: int):
+        rng = random.Random(self.session_id)
+        self.step("open app")
+
+        # Standard Cut tab
+        self.step("standard cut", lambda at: (
+            at.selectbox(key="std_type_a").set_value(STANDARD_TYPE),
+            at.number_input(key="std_c2c").set_value(rng.choice([12.0, 18.5, 24.25])),
+            at.button(key="std_calc").click()))
+
+        # Jobs tab: create a job and add cuts to it
+        job_name = f"load-test-{self.session_id}"
+        self.step("create job", lambda at: (
+            self.widget("text_input", "New Job Name").set_value(job_name),
+            at.button(key="create_job").click()))
+        for _ in range(cuts):
+            self.step("add cut to job", lambda at: (
+                at.number_input(key="job_std_c2c").set_value(round(rng.uniform(6, 60) * 16) / 16),
+                at.button(key="add_std_cut").click()))
+
+        # Manage Fittings: add a size, then delete it again
+        size = f"{self.session_id + 10}.{rng.randint(1, 9)}"
+        self.step("open add size", lambda at: at.radio(key="fitting_option").set_value("Add Size to Existing Type"))
+        self.step("add size", lambda at: (
+            at.selectbox(key="select_existing_type").set_value(EDIT_TYPE),
+            at.text_input(key="new_size_single").set_value(size),
+            at.number_input(key="new_offset_value").set_value(1.5),
+            at.button(key="add_single_size").click()))
+        self.step("delete size", lambda at: at.button(key=f"delete_size_{EDIT_TYPE}_{size}").click())
+
+
+def run_level(app_path: Path, sessions: int, cuts: int, timeout: float, first_id: int) -> dict:
+    """Run `sessions` simulated sessions concurrently and summarize their latencies."""
+    workers = [Session(app_path, first_id + i, timeout) for i in range(sessions)]
+    threads = [threading.Thread(target=worker.run_script, args=(cuts,)) for worker in workers]
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    by_interaction = {}
+    for worker in workers:
+        for interaction, seconds in worker.timings:
+            by_interaction.setdefault(interaction, []).append(seconds * 1000)
+    interactions = {}
+    for interaction, samples in by_interaction.items():
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        interactions[interaction] = {
+            "count": len(samples), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": max(samples),
+        }
+    errors = [(worker.session_id, interaction, message) for worker in workers for interaction, message in worker.errors]
+    return {
+        "sessions": sessions,
+        "wall_s": wall,
+        "rss_before_mb": rss_before,
+        "rss_after_mb": rss_mb(),
+        "interactions": interactions,
+        "errors": errors,
+    }
+
+
+def print_level(result: dict):
+    print(f"\n=== {result['sessions']} concurrent session(s): {result['wall_s']:.1f}s wall, "
+          f"RSS {result['rss_before_mb']:.0f} -> {result['rss_after_mb']:.0f} MB, "
+          f"{len(result['errors'])} error(s)")
+    print(f"{'interaction':<16}{'count':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for interaction, stats in result["interactions"].items():
+        print(f"{interaction:<16}{stats['count']:>6}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}"
+              f"{stats['p99_ms']:>10.0f}{stats['max_ms']:>10.0f}")
+    for session_id, interaction, message in result["errors"][:10]:
+        print(f"  session {session_id} / {interaction}: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the PVC Cut Calculator app")
+    parser.add_argument("--sessions", default="1,2,4,8", help="Comma-separated session counts to run in turn")
+    parser.add_argument("--cuts", type=int, default=5, help="Cuts each session adds to its job")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds allowed per rerun")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary project copy")
+    args = parser.parse_args()
+    levels = [int(n) for n in args.sessions.split(",") if n.strip()]
+
+    allow_concurrent_app_tests()
+    work_dir = Path(tempfile.mkdtemp(prefix="pvc-load-test-"))
+    app_path = copy_project(work_dir)
+    print(f"App copy: {work_dir}")
+    results = []
+    try:
+        next_id = 0
+        for sessions in levels:
+            result = run_level(app_path, sessions, args.cuts, args.timeout, next_id)
+            next_id += sessions
+            print_level(result)
+            results.append(result)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
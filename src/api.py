@@ -1,6 +1,22 @@
-﻿from .loader import DimensionLoader
-from .calculator import calculate_cut_length, lay_in_cut_length, bushing_cut_length
-from .models import Connection, CutRequest
+﻿import numpy as np
+from .loader import DimensionLoader
+from .calculator import (
+    calculate_cut_length, lay_in_cut_length, bushing_cut_length,
+    calculate_cut_units, lay_in_cut_units, bushing_cut_units,
+)
+from .config import INLINE_CONNECTOR_TYPES
+from .lengths import SHAVE_UNITS, UNITS_PER_INCH, to_units
+from .offset_matrix import format_cut_table
+from .models import Connection, CutRequest, CutBatch
+
+def resolve_offset(loader: DimensionLoader, conn_type: str, conn_size: str, use_g1: bool = False) -> float:
+    """Return the normal offset, or the G1 offset when requested and available."""
+    offset = loader.get_offset(conn_type, conn_size)
+    if use_g1:
+        g1_offset = loader.get_offset_g1(conn_type, conn_size)
+        if g1_offset is not None:
+            return g1_offset
+    return offset
 
 def get_cut_length(loader: DimensionLoader, type_a: str, size_a: str, type_b: str, size_b: str, c2c: float, use_g1_for_type_a: bool = False, use_g1_for_type_b: bool = False):
     """
@@ -16,20 +32,9 @@ def get_cut_length(loader: DimensionLoader, type_a: str, size_a: str, type_b: st
         use_g1_for_type_a: If True, use G1 offset for type_a instead of normal offset
         use_g1_for_type_b: If True, use G1 offset for type_b instead of normal offset
     """
-    # Get normal offsets
-    offset_a = loader.get_offset(type_a, size_a)
-    offset_b = loader.get_offset(type_b, size_b)
-    
-    # Override with G1 offsets if requested and available
-    if use_g1_for_type_a:
-        g1_offset_a = loader.get_offset_g1(type_a, size_a)
-        if g1_offset_a is not None:
-            offset_a = g1_offset_a
-    
-    if use_g1_for_type_b:
-        g1_offset_b = loader.get_offset_g1(type_b, size_b)
-        if g1_offset_b is not None:
-            offset_b = g1_offset_b
+    # Normal offsets, overridden with G1 offsets if requested and available
+    offset_a = resolve_offset(loader, type_a, size_a, use_g1_for_type_a)
+    offset_b = resolve_offset(loader, type_b, size_b, use_g1_for_type_b)
 
     conn_a = Connection(type_a, size_a, offset_a)
     conn_b = Connection(type_b, size_b, offset_b)
@@ -50,10 +55,7 @@ def get_lay_in_cuts(loader: DimensionLoader, type_a: str, size_a: str, type_lay_
     offset_lay_in = loader.get_offset(type_lay_in, size_lay_in)
     offset_b = loader.get_offset(type_b, size_b)
 
-    conn_a = Connection(type_a, size_a, offset_a)
-    conn_lay_in = Connection(type_lay_in, size_lay_in, offset_lay_in)
-    conn_b = Connection(type_b, size_b, offset_b)
-    request = CutRequest(conn_a, conn_b, c2c_overall)
+    request = CutRequest(Connection(type_a, size_a, offset_a), Connection(type_b, size_b, offset_b), c2c_overall)
 
     cut1, cut2 = lay_in_cut_length(c2c_overall, c2c_lay_in, offset_a, offset_lay_in, offset_b)
     return request, (cut1, cut2)
@@ -68,11 +70,137 @@ def get_bushing_cut(loader: DimensionLoader, type_a: str, size_a: str, type_bush
     offset_bushing = loader.get_offset(type_bushing, size_bushing)
     offset_b = loader.get_offset(type_b, size_b)
 
-    conn_a = Connection(type_a, size_a, offset_a)
-    conn_bushing = Connection(type_bushing, size_bushing, offset_bushing)
-    conn_b = Connection(type_b, size_b, offset_b)
-    request = CutRequest(conn_a, conn_b, c2c)
+    request = CutRequest(Connection(type_a, size_a, offset_a), Connection(type_b, size_b, offset_b), c2c)
 
     cut_length = bushing_cut_length(c2c, offset_a, offset_bushing, offset_b)
     return request, cut_length
 
+
+def add_cut_to_batch(loader: DimensionLoader, batch: CutBatch, type_a: str, size_a: str, type_b: str, size_b: str, c2c: float, use_g1_for_type_a: bool = False, use_g1_for_type_b: bool = False) -> int:
+    """
+    Resolve offsets for a two-fitting cut and append it to a CutBatch without
+    allocating Connection/CutRequest objects. Returns the new row index.
+    Use batch.cut_lengths() to compute every cut in the batch at once.
+    """
+    offset_a = resolve_offset(loader, type_a, size_a, use_g1_for_type_a)
+    offset_b = resolve_offset(loader, type_b, size_b, use_g1_for_type_b)
+    return batch.append(type_a, size_a, offset_a, type_b, size_b, offset_b, c2c)
+
+
+def get_cut_length_units(loader: DimensionLoader, type_a: str, size_a: str, type_b: str, size_b: str, c2c, use_g1_for_type_a: bool = False, use_g1_for_type_b: bool = False) -> int:
+    """
+    Fixed-point version of get_cut_length. Returns the cut length in integer 1/64ths.
+    c2c may be a number or a string such as '14-3/8'; it is rounded to the nearest 1/64.
+    Format the result with formatting.format_length_units.
+    """
+    # One lookup in the precomputed pair matrix instead of two offset lookups
+    offsets = loader.get_pair_offset_units(type_a, size_a, type_b, size_b, use_g1_for_type_a, use_g1_for_type_b)
+    return calculate_cut_units(to_units(c2c), offsets, 0)
+
+
+def get_lay_in_cut_units(loader: DimensionLoader, type_a: str, size_a: str, type_lay_in: str, size_lay_in: str,
+                         type_b: str, size_b: str, c2c_overall, c2c_lay_in) -> tuple:
+    """
+    Fixed-point version of get_lay_in_cuts. Returns (cut1, cut2) in integer 1/64ths.
+    """
+    offset_a = loader.get_offset_units(type_a, size_a)
+    offset_lay_in = loader.get_offset_units(type_lay_in, size_lay_in)
+    offset_b = loader.get_offset_units(type_b, size_b)
+    return lay_in_cut_units(to_units(c2c_overall), to_units(c2c_lay_in), offset_a, offset_lay_in, offset_b)
+
+
+def get_bushing_cut_units(loader: DimensionLoader, type_a: str, size_a: str, type_bushing: str, size_bushing: str,
+                          type_b: str, size_b: str, c2c) -> int:
+    """
+    Fixed-point version of get_bushing_cut. Returns the cut length in integer 1/64ths.
+    """
+    offset_a = loader.get_offset_units(type_a, size_a)
+    offset_bushing = loader.get_offset_units(type_bushing, size_bushing)
+    offset_b = loader.get_offset_units(type_b, size_b)
+    return bushing_cut_units(to_units(c2c), offset_a, offset_bushing, offset_b)
+
+
+def get_cut_table(loader: DimensionLoader, type_a: str, size_a: str, type_b: str, size_b: str, c2c_start, c2c_stop,
+                  step="1/16", shave: bool = False, use_g1_for_type_a: bool = False, use_g1_for_type_b: bool = False):
+    """
+    Returns a generator of printable lookup-sheet lines (C2C -> cut) for one fitting pair.
+    Raises ValueError if either fitting is not in the database.
+    """
+    index_a = loader.get_pair_matrix_index(type_a, size_a, use_g1_for_type_a)
+    index_b = loader.get_pair_matrix_index(type_b, size_b, use_g1_for_type_b)
+    if index_a is None or index_b is None:
+        missing = f"{type_a} ({size_a})" if index_a is None else f"{type_b} ({size_b})"
+        raise ValueError(f"No database offset for {missing}")
+    return format_cut_table(loader.pair_matrix, index_a, index_b, c2c_start, c2c_stop, step, shave)
+
+
+def _c2c_units_array(c2c_distances) -> np.ndarray:
+    # Numeric distances convert in one vectorized step; strings like '14-3/8' go through to_units
+    try:
+        inches = np.asarray(c2c_distances, dtype=np.float64)
+    except (ValueError, TypeError):
+        try:
+            return np.fromiter((to_units(c2c) for c2c in c2c_distances), dtype=np.int64)
+        except OverflowError as e:
+            raise ValueError(f"C2C distances must be finite: {e}") from None
+    # Non-finite (or int64-overflowing) distances would come out as garbage integers
+    finite = np.isfinite(inches) & (np.abs(inches) < 2.0 ** 62 / UNITS_PER_INCH)
+    if not finite.all():
+        raise ValueError(f"C2C distances must be finite, got {inches[~finite][0]}")
+    return np.floor(inches * UNITS_PER_INCH + 0.5).astype(np.int64)
+
+
+def get_run_cut_units(loader: DimensionLoader, fittings, c2c_distances, shave: bool = False) -> np.ndarray:
+    """
+    Returns every cut in a pipe run as an int64 array of 1/64ths.
+
+    Generalizes the standard and bushing calculations to an ordered chain of any length:
+    each cut is C2C - offset of the fitting on each end - offsets of any inline fittings
+    (INLINE_CONNECTOR_TYPES, e.g. bushings) seated between them.
+
+    Args:
+        loader: DimensionLoader instance
+        fittings: Ordered sequence of (type, size) or (type, size, use_g1) tuples.
+            The first and last fitting must not be inline.
+        c2c_distances: One center-to-center distance per cut, i.e. between consecutive
+            non-inline fittings. Numbers or strings such as '14-3/8'.
+        shave: If True, subtract the configured shave from every cut
+    """
+    # Resolve each distinct fitting once. Runs are short (a handful of fittings), so the chain
+    # is walked with plain ints; numpy's per-call overhead would cost more than the arithmetic
+    resolved = {}
+    ends, inline_sums, starts_inline = [], [], False
+    for fitting in fittings:
+        key = tuple(fitting)
+        units = resolved.get(key)
+        if units is None:
+            conn_type, conn_size = key[0], key[1]
+            use_g1 = bool(key[2]) if len(key) > 2 else False
+            units = resolved[key] = loader.get_offset_units(conn_type, conn_size, use_g1)
+        inline = key[0] in INLINE_CONNECTOR_TYPES
+        if not inline:
+            ends.append(units)
+            inline_sums.append(0)
+        elif inline_sums:
+            # Inline fittings belong to the cut that starts at the preceding non-inline fitting
+            inline_sums[-1] += units
+        else:
+            starts_inline = True
+
+    if len(fittings) < 2 or starts_inline or inline:
+        raise ValueError("A pipe run needs at least two fittings and must start and end on a non-inline fitting")
+
+    c2c = _c2c_units_array(c2c_distances).tolist()
+    if len(c2c) != len(ends) - 1:
+        raise ValueError(f"Expected {len(ends) - 1} C2C distances for this run, got {len(c2c)}")
+
+    shave_units = SHAVE_UNITS if shave else 0
+    return np.array([c2c[i] - ends[i] - ends[i + 1] - inline_sums[i] - shave_units for i in range(len(c2c))],
+                    dtype=np.int64)
+
+
+def get_run_cuts(loader: DimensionLoader, fittings, c2c_distances, shave: bool = False) -> list:
+    """
+    Returns every cut in a pipe run as floats in inches. See get_run_cut_units.
+    """
+    return (get_run_cut_units(loader, fittings, c2c_distances, shave) / UNITS_PER_INCH).tolist()
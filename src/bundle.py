@@ -0,0 +1,356 @@
+import hashlib
+import json
+import sys
+import time
+from .formatting import DEFAULT_FORMATTER
+from .lengths import SHAVE_INCHES, SHAVE_TEXT
+
+BUNDLE_FORMAT = 1
+BUSHING_TYPE = "Bushing (Spigot x Socket)"
+
+# The offline page warns once a bundle is older than this
+STALE_AFTER_DAYS = 7
+
+
+def bundle_data(loader) -> dict:
+    """
+    Compile the loader's offset catalogue into the data of an offline bundle.
+
+    Only sizes with a usable offset are included; a size the app would reject
+    (missing or invalid offset) is left out, so the offline page can't offer it.
+    'stamp' is a hash of the offsets and length settings: two bundles with the same
+    stamp compute identical cuts, and a bundle whose stamp differs from bundle_stamp()
+    of the running app is stale.
+    """
+    offsets = {conn_type: {size: [entry.offset, entry.g1_offset] for size, entry in sizes.items()}
+               for conn_type, sizes in loader.offset_index.items()}
+    # Offsets entered this session take precedence, as in DimensionLoader.get_offset
+    for (conn_type, size), entry in loader.session_offsets.items():
+        base = offsets.setdefault(conn_type, {}).get(size, [None, None])
+        offsets[conn_type][size] = [entry.offset, base[1] if entry.g1_offset is None else entry.g1_offset]
+    types = {}
+    for conn_type, sizes in offsets.items():
+        rows = [[size, offset, g1_offset] for size, (offset, g1_offset) in sizes.items() if offset is not None]
+        if rows:
+            types[conn_type] = rows
+    settings = {
+        "grid": DEFAULT_FORMATTER.grid,
+        "rounding": DEFAULT_FORMATTER.rounding,
+        "shave": SHAVE_INCHES,
+        "shave_text": SHAVE_TEXT,
+        "bushing_type": BUSHING_TYPE,
+    }
+    return {
+        "format": BUNDLE_FORMAT,
+        "stamp": _stamp(types, settings),
+        "catalogue_version": loader.catalogue_version,
+        "generated_at": time.time(),
+        "stale_after_days": STALE_AFTER_DAYS,
+        **settings,
+        "types": types,
+    }
+
+
+def _stamp(types: dict, settings: dict) -> str:
+    canonical = json.dumps({"types": types, **settings}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def bundle_stamp(loader) -> str:
+    """Stamp a bundle exported from this loader now would carry."""
+    return bundle_data(loader)["stamp"]
+
+
+def bundle_json(loader) -> str:
+    """The bundle as a JSON blob (for other offline clients)."""
+    return json.dumps(bundle_data(loader), separators=(",", ":"))
+
+
+def bundle_html(loader) -> str:
+    """
+    A single self-contained HTML page with the catalogue and the standard, lay-in and bushing
+    calculators, for use offline. The formulas, float arithmetic order, shave and length
+    formatting are the same as the app's, so the page prints the same lengths.
+    """
+    data = bundle_json(loader).replace("</", "<\\/")
+    return _PAGE.replace("__BUNDLE_DATA__", data).replace("__SCRIPT__", BUNDLE_SCRIPT)
+
+
+# Calculator and formatter. Kept free of DOM access so it can be checked outside a browser.
+BUNDLE_SCRIPT = r"""
+"use strict";
+const MAX_DENOMINATOR = 1000n;
+
+function gcd(a, b) {
+  a = a < 0n ? -a : a; b = b < 0n ? -b : b;
+  while (b) { [a, b] = [b, a % b]; }
+  return a;
+}
+
+function floorDiv(a, b) {
+  const q = a / b;
+  return (a % b !== 0n && (a < 0n) !== (b < 0n)) ? q - 1n : q;
+}
+
+// Exact value of a double as a reduced fraction [numerator, denominator] (like Fraction(float))
+function exactRatio(x) {
+  const view = new DataView(new ArrayBuffer(8));
+  view.setFloat64(0, x);
+  const hi = view.getUint32(0), lo = view.getUint32(4);
+  const exponent = (hi >>> 20) & 0x7ff;
+  let mantissa = (BigInt(hi & 0xfffff) << 32n) | BigInt(lo);
+  let shift;
+  if (exponent === 0) { shift = -1074; } else { mantissa |= 1n << 52n; shift = exponent - 1075; }
+  let n = (hi >>> 31) ? -mantissa : mantissa, d = 1n;
+  if (shift > 0) { n <<= BigInt(shift); } else { d <<= BigInt(-shift); }
+  const g = gcd(n, d) || 1n;
+  return [n / g, d / g];
+}
+
+// Fraction.limit_denominator(1000), same candidates and tie rule as Python
+function limitDenominator(x) {
+  const [n0, d0] = exactRatio(x);
+  if (d0 <= MAX_DENOMINATOR) return [n0, d0];
+  let p0 = 0n, q0 = 1n, p1 = 1n, q1 = 0n, n = n0, d = d0;
+  for (;;) {
+    const a = floorDiv(n, d);
+    const q2 = q0 + a * q1;
+    if (q2 > MAX_DENOMINATOR) break;
+    [p0, q0, p1, q1] = [p1, q1, p0 + a * p1, q2];
+    [n, d] = [d, n - a * d];
+  }
+  const k = floorDiv(MAX_DENOMINATOR - q0, q1);
+  const [bp, bq] = [p0 + k * p1, q0 + k * q1];
+  const abs = (v) => (v < 0n ? -v : v);
+  // |p1/q1 - x| <= |bp/bq - x|, cross-multiplied
+  return abs(p1 * d0 - n0 * q1) * bq <= abs(bp * d0 - n0 * bq) * q1 ? [p1, q1] : [bp, bq];
+}
+
+function gridSteps(value, bundle) {
+  const [p, q] = limitDenominator(value);
+  const scale = BigInt(bundle.grid === "mm" ? 254 : bundle.grid);
+  const n = p * scale;
+  switch (bundle.rounding) {
+    case "truncate": return n / q;
+    case "floor": return floorDiv(n, q);
+    case "ceiling": return -floorDiv(-n, q);
+    default: return floorDiv(2n * n + q, 2n * q);
+  }
+}
+
+function formatLength(value, bundle) {
+  const steps = gridSteps(value, bundle);
+  if (bundle.grid === "mm") {
+    const a = steps < 0n ? -steps : steps;
+    return (steps < 0n ? "-" : "") + (a / 10n) + "." + (a % 10n);
+  }
+  const grid = BigInt(bundle.grid);
+  const whole = floorDiv(steps, grid), remainder = steps - whole * grid;
+  if (remainder === 0n) return String(whole);
+  const g = gcd(remainder, grid);
+  return whole + " " + (remainder / g) + "/" + (grid / g);
+}
+
+function parseLength(text) {
+  const s = String(text).trim();
+  let m = s.match(/^(-?)(\d+)[\s-]+(\d+)\s*\/\s*(\d+)$/);
+  if (m) { const v = Number(m[2]) + Number(m[3]) / Number(m[4]); return m[1] ? -v : v; }
+  m = s.match(/^(-?\d+)\s*\/\s*(\d+)$/);
+  if (m) return Number(m[1]) / Number(m[2]);
+  if (/^-?(\d+\.?\d*|\.\d+)$/.test(s)) return Number(s);
+  throw new Error("Cannot read length '" + text + "'");
+}
+
+function lookup(bundle, type, size) {
+  const rows = bundle.types[type];
+  if (!rows) throw new Error("No offsets for connector type '" + type + "'");
+  const row = rows.find((r) => r[0] === size);
+  if (!row) throw new Error("No matching size '" + size + "' for connector '" + type + "'");
+  return row;
+}
+
+function offsetOf(bundle, type, size, useG1) {
+  const row = lookup(bundle, type, size);
+  return useG1 && row[2] !== null ? row[2] : row[1];
+}
+
+// Each returns the cut lengths in inches, shave applied, in the app's float order
+function standardCut(bundle, a, b, c2c, shave) {
+  const offsetA = offsetOf(bundle, a.type, a.size, a.g1);
+  const offsetB = offsetOf(bundle, b.type, b.size, b.g1);
+  let cut = c2c - offsetA - offsetB;
+  if (shave) cut -= bundle.shave;
+  return [cut];
+}
+
+function layInCuts(bundle, a, layIn, b, c2cOverall, c2cLayIn, shave) {
+  const offsetA = offsetOf(bundle, a.type, a.size, false);
+  const offsetLayIn = offsetOf(bundle, layIn.type, layIn.size, false);
+  const offsetB = offsetOf(bundle, b.type, b.size, false);
+  // Same argument order as api.get_lay_in_cuts passes to calculator.lay_in_cut_length
+  let cut1 = c2cOverall - c2cLayIn - offsetLayIn;
+  let cut2 = c2cLayIn - offsetA - offsetB;
+  if (shave) { cut1 -= bundle.shave; cut2 -= bundle.shave; }
+  return [cut1, cut2];
+}
+
+function bushingCut(bundle, a, bushingSize, b, c2c, shave) {
+  const offsetA = offsetOf(bundle, a.type, a.size, false);
+  const offsetBushing = offsetOf(bundle, bundle.bushing_type, bushingSize, false);
+  const offsetB = offsetOf(bundle, b.type, b.size, false);
+  let cut = c2c - offsetA - offsetBushing - offsetB;
+  if (shave) cut -= bundle.shave;
+  return [cut];
+}
+"""
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>PVC Cut Calculator (offline)</title>
+<style>
+  body { font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; margin: 0; padding: 12px; max-width: 720px; }
+  h1 { font-size: 1.3em; margin: 0 0 4px; }
+  .stamp { color: #666; font-size: 0.85em; }
+  .stale { background: #fff3cd; border: 1px solid #e0c060; padding: 8px; margin: 8px 0; border-radius: 4px; }
+  nav button { font-size: 1em; padding: 8px 12px; margin: 8px 4px 8px 0; }
+  nav button.active { background: #1f6feb; color: white; border-color: #1f6feb; }
+  fieldset { border: 1px solid #ccc; border-radius: 4px; margin: 8px 0; }
+  label { display: block; margin: 6px 0; }
+  select, input[type=text] { font-size: 1em; padding: 6px; width: 100%; box-sizing: border-box; }
+  .result { font-size: 1.6em; font-weight: bold; margin: 12px 0; }
+  .error { color: #b00020; }
+  [hidden] { display: none; }
+</style>
+</head>
+<body>
+<h1>PVC Cut Calculator</h1>
+<div class="stamp" id="stamp"></div>
+<div class="stale" id="stale" hidden></div>
+<nav>
+  <button data-mode="standard" class="active">Standard</button>
+  <button data-mode="layin">Lay-in</button>
+  <button data-mode="bushing">Bushing</button>
+</nav>
+<fieldset><legend>Fitting A</legend>
+  <label>Type <select id="a-type"></select></label>
+  <label>Size <select id="a-size"></select></label>
+  <label class="g1"><input type="checkbox" id="a-g1"> Use G1 offset</label>
+</fieldset>
+<fieldset data-only="layin" hidden><legend>Lay-in fitting</legend>
+  <label>Type <select id="l-type"></select></label>
+  <label>Size <select id="l-size"></select></label>
+</fieldset>
+<fieldset data-only="bushing" hidden><legend>Bushing</legend>
+  <label>Size <select id="bushing-size"></select></label>
+</fieldset>
+<fieldset><legend>Fitting B</legend>
+  <label>Type <select id="b-type"></select></label>
+  <label>Size <select id="b-size"></select></label>
+  <label class="g1"><input type="checkbox" id="b-g1"> Use G1 offset</label>
+</fieldset>
+<label><span id="c2c-label">Center-to-Center (inches)</span> <input type="text" id="c2c" inputmode="decimal" placeholder="e.g. 14.375 or 14-3/8"></label>
+<label data-only="layin" hidden>C2C: Fitting A to Lay-in (inches) <input type="text" id="c2c-layin" inputmode="decimal"></label>
+<label><input type="checkbox" id="shave"> <span id="shave-label"></span></label>
+<div class="result" id="result"></div>
+<script type="application/json" id="bundle">__BUNDLE_DATA__</script>
+<script>__SCRIPT__</script>
+<script>
+"use strict";
+const bundle = JSON.parse(document.getElementById("bundle").textContent);
+const $ = (id) => document.getElementById(id);
+let mode = "standard";
+
+const generated = new Date(bundle.generated_at * 1000);
+$("stamp").textContent = "Catalogue " + bundle.stamp + " (v" + bundle.catalogue_version + "), exported " + generated.toLocaleString();
+const ageDays = (Date.now() - generated.getTime()) / 86400000;
+if (ageDays > bundle.stale_after_days) {
+  $("stale").hidden = false;
+  $("stale").textContent = "This bundle is " + Math.floor(ageDays) + " days old. Download a new one from Manage Fittings when you have signal; offsets may have changed.";
+}
+$("shave-label").textContent = "Include Shave (-" + bundle.shave_text + "\\")";
+
+const types = Object.keys(bundle.types);
+function fill(select, values) {
+  const previous = select.value;
+  select.innerHTML = "";
+  for (const v of values) { const o = document.createElement("option"); o.value = o.textContent = v; select.appendChild(o); }
+  if (values.includes(previous)) select.value = previous;
+}
+function sizesOf(type) { return (bundle.types[type] || []).map((r) => r[0]); }
+function hasG1(type, size) { const r = (bundle.types[type] || []).find((x) => x[0] === size); return !!r && r[2] !== null; }
+function pair(prefix) {
+  fill($(prefix + "-type"), types);
+  const update = () => {
+    fill($(prefix + "-size"), sizesOf($(prefix + "-type").value));
+    const g1 = $(prefix + "-g1");
+    if (g1) { g1.disabled = !hasG1($(prefix + "-type").value, $(prefix + "-size").value); if (g1.disabled) g1.checked = false; }
+  };
+  $(prefix + "-type").addEventListener("change", () => { update(); calculate(); });
+  $(prefix + "-size").addEventListener("change", () => { update(); calculate(); });
+  update();
+}
+pair("a"); pair("l"); pair("b");
+fill($("bushing-size"), sizesOf(bundle.bushing_type));
+
+function fitting(prefix) {
+  const g1 = $(prefix + "-g1");
+  return { type: $(prefix + "-type").value, size: $(prefix + "-size").value, g1: !!(g1 && g1.checked) };
+}
+
+function calculate() {
+  const out = $("result");
+  out.classList.remove("error");
+  if (!$("c2c").value.trim()) { out.textContent = ""; return; }
+  try {
+    const shave = $("shave").checked;
+    const c2c = parseLength($("c2c").value);
+    let cuts;
+    if (mode === "standard") {
+      cuts = standardCut(bundle, fitting("a"), fitting("b"), c2c, shave);
+    } else if (mode === "layin") {
+      cuts = layInCuts(bundle, fitting("a"), fitting("l"), fitting("b"), c2c, parseLength($("c2c-layin").value), shave);
+    } else {
+      cuts = bushingCut(bundle, fitting("a"), $("bushing-size").value, fitting("b"), c2c, shave);
+    }
+    const unit = bundle.grid === "mm" ? " mm" : "\\"";
+    out.innerHTML = cuts.map((cut, i) =>
+      (cuts.length > 1 ? "Cut " + (i + 1) + ": " : "") + formatLength(cut, bundle) + unit +
+      " <small>(" + cut.toFixed(4) + "\\")</small>").join("<br>");
+  } catch (e) {
+    out.classList.add("error");
+    out.textContent = e.message;
+  }
+}
+
+for (const button of document.querySelectorAll("nav button")) {
+  button.addEventListener("click", () => {
+    mode = button.dataset.mode;
+    for (const b of document.querySelectorAll("nav button")) b.classList.toggle("active", b === button);
+    for (const el of document.querySelectorAll("[data-only]")) el.hidden = el.dataset.only !== mode;
+    for (const el of document.querySelectorAll(".g1")) el.hidden = mode !== "standard";
+    $("c2c-label").textContent = mode === "layin" ? "Overall C2C (inches)" : "Center-to-Center (inches)";
+    calculate();
+  });
+}
+for (const id of ["c2c", "c2c-layin", "shave", "a-g1", "b-g1", "bushing-size"]) {
+  $(id).addEventListener("input", calculate);
+  $(id).addEventListener("change", calculate);
+}
+</script>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    # python -m src.bundle [output.html|output.json]: export the current catalogue
+    from .catalogue_watcher import CatalogueWatcher
+    from .config import EXCEL_PATH, JOURNAL_PATH
+    output = sys.argv[1] if len(sys.argv) > 1 else "pvc_cut_calculator.html"
+    current = CatalogueWatcher(EXCEL_PATH, journal_path=JOURNAL_PATH).current()
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(bundle_json(current) if output.endswith(".json") else bundle_html(current))
+    print(f"Wrote {output} (catalogue {bundle_stamp(current)})")
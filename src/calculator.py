@@ -34,4 +34,28 @@ def bushing_cut_length(c2c: float, offset_a: float, offset_b: float, bushing: fl
         c2c_f = float(c2c)
         return c2c_f - float(offset_a) - float(offset_b) - bushing 
     except Exception as e:
-        raise ValueError(f"Invalid numeric input to calculator: {e}")
\ No newline at end of file
+        raise ValueError(f"Invalid numeric input to calculator: {e}")
+
+def calculate_cut_units(c2c: int, offset_a: int, offset_b: int) -> int:
+    """
+    Fixed-point version of calculate_cut_length; all values are integer 1/64ths.
+    formula: final cut = C2C - offsetA - offsetB
+    """
+    return c2c - offset_a - offset_b
+
+
+def lay_in_cut_units(c2c_overall: int, c2c_lay_in: int, offset_a: int, offset_b: int, lay_in_offset: int) -> tuple:
+    """
+    Fixed-point version of lay_in_cut_length; all values are integer 1/64ths.
+    formula: Cut 1 = C2C_overall - C2C_lay_in - offsetB
+    formula: Cut 2 = C2C_lay_in - lay_in_offset - offsetA
+    """
+    return c2c_overall - c2c_lay_in - offset_b, c2c_lay_in - offset_a - lay_in_offset
+
+
+def bushing_cut_units(c2c: int, offset_a: int, offset_b: int, bushing: int) -> int:
+    """
+    Fixed-point version of bushing_cut_length; all values are integer 1/64ths.
+    formula: final cut = C2C - offsetA - offsetB - bushing
+    """
+    return c2c - offset_a - offset_b - bushing
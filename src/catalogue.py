@@ -0,0 +1,276 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+import pandas as pd
+from .lengths import to_units
+
+
+def _type_digest(conn_type: str, sizes) -> bytes:
+    # Content digest of one type's entries; size order does not matter to lookups
+    digest = hashlib.blake2b(repr(conn_type).encode("utf-8"), digest_size=8)
+    for size in sorted(sizes):
+        entry = sizes[size]
+        digest.update(repr((size, entry.offset, entry.g1_offset, entry.offset_units, entry.g1_units,
+                            entry.invalid_offset)).encode("utf-8"))
+    return digest.digest()
+
+
+def normalize_size(val) -> str:
+    # Normalize size values to match user input.
+    # Can be numeric (1.5, 2, etc.) or text format (1.5x1.5x0.5, 2x2x1, etc.)
+    if isinstance(val, str):
+        return _normalize_size_text(val)
+    if pd.isna(val):
+        return ""
+    return _normalize_size_text(str(val))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_size_text(text: str) -> str:
+    # Every lookup normalizes the size it is given, and the same few sizes come up again and again
+    val_str = text.strip()
+
+    # For text formats like "1.5x1.5x0.5", return as-is
+    if 'x' in val_str.lower():
+        return val_str.lower()
+
+    # For numeric values, convert with no trailing .0 when integer-like
+    try:
+        v = float(val_str)
+        if v.is_integer():
+            return str(int(v))
+        return str(v)
+    except ValueError:
+        return val_str.lower()
+
+
+@dataclass(frozen=True)
+class OffsetEntry:
+    """
+    Offsets for one (type, size) in a catalogue snapshot.
+    offset/g1_offset are inches, *_units are 1/64ths; invalid_offset holds the raw
+    cell when the offset could not be parsed (lookups report it as an error).
+    """
+    __slots__ = ("offset", "g1_offset", "offset_units", "g1_units", "invalid_offset")
+
+    offset: float
+    g1_offset: float
+    offset_units: int
+    g1_units: int
+    invalid_offset: str
+
+
+class CatalogueSnapshot:
+    """
+    One immutable version of the offset catalogue: {conn_type: {normalized_size: OffsetEntry}}.
+
+    Both levels are read-only mappings, so a snapshot can be read from any thread without
+    locks. Edits never change a snapshot; they build a new one that reuses every per-type
+    mapping that did not change.
+
+    The version is a hash of the offsets, so every process (app, daemon, CLI) gives the same
+    catalogue the same number, and cuts can be traced to it across restarts. Each type's digest
+    is computed once and shared with the snapshots built from this one.
+    """
+    __slots__ = ("version", "offsets", "source", "_digests", "created_at")
+
+    def __init__(self, offsets: dict, source: str, digests: dict = None):
+        # digests: {conn_type: digest} of types whose mapping is shared with the snapshot they came from
+        digests = digests or {}
+        self._digests = {conn_type: digests.get(conn_type) or _type_digest(conn_type, sizes)
+                         for conn_type, sizes in offsets.items()}
+        version = hashlib.blake2b(digest_size=4)
+        for conn_type in sorted(self._digests):
+            version.update(self._digests[conn_type])
+        self.version = int.from_bytes(version.digest(), "big") or 1
+        self.offsets = MappingProxyType(offsets)
+        self.source = source
+        self.created_at = time.time()
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "created_at"):
+            raise AttributeError("CatalogueSnapshot is immutable")
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def build(cls, offset_index: dict, source: str = "workbook", previous=None):
+        """
+        Freeze a {conn_type: {size: OffsetEntry}} dict into a new snapshot.
+        Types whose entries equal those in `previous` share its mapping object; if nothing
+        changed at all, `previous` itself is returned.
+        """
+        offsets, digests = {}, {}
+        for conn_type, sizes in offset_index.items():
+            old = previous.offsets.get(conn_type) if previous is not None else None
+            if old is not None and old == sizes:
+                offsets[conn_type], digests[conn_type] = old, previous._digests[conn_type]
+            else:
+                offsets[conn_type] = MappingProxyType(dict(sizes))
+        if previous is not None and offsets.keys() == previous.offsets.keys() and all(
+                offsets[conn_type] is previous.offsets[conn_type] for conn_type in offsets):
+            # Nothing changed (e.g. a compaction rewrote the workbook): keep the snapshot
+            return previous
+        return cls(offsets, source, digests)
+
+    def with_sizes(self, conn_type: str, changes: dict, source: str):
+        """
+        New snapshot with sizes of one type added, replaced (OffsetEntry) or removed (None).
+        Only that type's mapping is copied; every other type is shared with this snapshot.
+        """
+        return self.with_changes({conn_type: changes}, source)
+
+    def with_changes(self, changes: dict, source: str):
+        """
+        New snapshot with {conn_type: {size: OffsetEntry or None}} applied to several types
+        at once (one version for a whole import). Untouched types are shared.
+        """
+        offsets = dict(self.offsets)
+        for conn_type, type_changes in changes.items():
+            sizes = dict(offsets.get(conn_type, {}))
+            for size, entry in type_changes.items():
+                if entry is None:
+                    sizes.pop(size, None)
+                else:
+                    sizes[size] = entry
+            offsets[conn_type] = MappingProxyType(sizes)
+        digests = {conn_type: d for conn_type, d in self._digests.items() if conn_type not in changes}
+        return CatalogueSnapshot(offsets, source, digests)
+
+    def without_type(self, conn_type: str, source: str):
+        """New snapshot with a connector type removed."""
+        offsets = {t: sizes for t, sizes in self.offsets.items() if t != conn_type}
+        return CatalogueSnapshot(offsets, source, self._digests)
+
+    def entry(self, conn_type: str, size: str):
+        """OffsetEntry for a normalized size, or None."""
+        return self.offsets.get(conn_type, {}).get(size)
+
+    def digest(self, conn_type: str) -> bytes:
+        """Content digest of one type's entries (what the version is hashed from)."""
+        return self._digests[conn_type]
+
+    def __repr__(self):
+        return f"CatalogueSnapshot(version={self.version}, types={len(self.offsets)}, source={self.source!r})"
+
+
+class CatalogueHistory:
+    """Append-only record of published catalogue versions (version, source, time) for tracing cuts."""
+
+    def __init__(self, limit: int = 200):
+        self.limit = limit
+        self._entries = []
+        self._lock = threading.Lock()
+
+    def record(self, snapshot: CatalogueSnapshot):
+        with self._lock:
+            self._entries.append((snapshot.version, snapshot.source, snapshot.created_at))
+            del self._entries[:-self.limit]
+
+    def entries(self) -> list:
+        with self._lock:
+            return list(self._entries)
+
+
+class SharedCatalogue:
+    """
+    Connector types and sizes every session starts from (the dropdown lists in config.py).
+    Read-only and shared by all sessions of a process; edits go to each session's CatalogueOverlay.
+    """
+    __slots__ = ("types", "sizes")
+
+    def __init__(self, types, sizes: dict):
+        self.types = tuple(types)
+        self.sizes = MappingProxyType({conn_type: tuple(s) for conn_type, s in sizes.items()})
+
+
+class CatalogueOverlay:
+    """
+    One session's edits on top of a SharedCatalogue.
+
+    Only the differences are stored (types and sizes added or removed, offsets entered this
+    session), so an untouched session costs a few empty containers and reads straight from
+    the shared lists. Offsets are keyed by (conn_type, size) tuples.
+    """
+
+    def __init__(self, base: SharedCatalogue):
+        self.base = base
+        self.added_types = []       # types added this session, in order
+        self.removed_types = set()  # shared types removed this session
+        self.added_sizes = {}       # {conn_type: [size, ...]} appended after the shared sizes
+        self.hidden_sizes = {}      # {conn_type: {size, ...}} shared sizes removed this session
+        self.offsets = {}           # {(conn_type, size): OffsetEntry} entered this session
+        self._types = None
+
+    def types(self):
+        """Connector types for dropdowns: shared types not removed, then added ones."""
+        if not self.added_types and not self.removed_types:
+            return self.base.types
+        if self._types is None:
+            self._types = [t for t in self.base.types if t not in self.removed_types] + self.added_types
+        return self._types
+
+    def sizes(self, conn_type: str):
+        """Sizes of a type for dropdowns (empty for unknown or removed types)."""
+        if conn_type in self.removed_types and conn_type not in self.added_types:
+            return ()
+        shared = self.base.sizes.get(conn_type, ())
+        hidden = self.hidden_sizes.get(conn_type)
+        added = self.added_sizes.get(conn_type)
+        if not hidden and not added:
+            return shared
+        return [s for s in shared if not hidden or s not in hidden] + (added or [])
+
+    def add_type(self, conn_type: str, sizes: list):
+        """Add a type with its sizes (a re-added type starts from these sizes only)."""
+        self.remove_type(conn_type)
+        self.added_types.append(conn_type)
+        self.added_sizes[conn_type] = list(sizes)
+        if conn_type in self.base.sizes:
+            self.hidden_sizes[conn_type] = set(self.base.sizes[conn_type])
+        self._types = None
+
+    def remove_type(self, conn_type: str):
+        if conn_type in self.added_types:
+            self.added_types.remove(conn_type)
+        if conn_type in self.base.types:
+            self.removed_types.add(conn_type)
+        self.added_sizes.pop(conn_type, None)
+        self.hidden_sizes.pop(conn_type, None)
+        for key in [key for key in self.offsets if key[0] == conn_type]:
+            del self.offsets[key]
+        self._types = None
+
+    def add_sizes(self, conn_type: str, sizes: list):
+        current = set(self.sizes(conn_type))
+        added = self.added_sizes.setdefault(conn_type, [])
+        added += [s for s in sizes if s not in current]
+
+    def remove_sizes(self, conn_type: str, sizes: list):
+        removed = set(sizes)
+        if conn_type in self.added_sizes:
+            self.added_sizes[conn_type] = [s for s in self.added_sizes[conn_type] if s not in removed]
+            if not self.added_sizes[conn_type] and conn_type not in self.added_types:
+                del self.added_sizes[conn_type]
+        shared = removed.intersection(self.base.sizes.get(conn_type, ()))
+        if shared:
+            self.hidden_sizes.setdefault(conn_type, set()).update(shared)
+        for size in sizes:
+            self.offsets.pop((conn_type, size), None)
+
+    def set_offset(self, conn_type: str, size: str, offset: float, g1_offset: float = None):
+        """Record an offset entered this session (g1_offset of 0/None means no G1 offset)."""
+        g1_offset = g1_offset if g1_offset and g1_offset > 0 else None
+        self.offsets[(conn_type, size)] = OffsetEntry(
+            offset, g1_offset, to_units(offset), None if g1_offset is None else to_units(g1_offset), None)
+
+    def diff_key(self) -> tuple:
+        """Hashable summary of the edits; sessions with the same edits share cached indexes."""
+        return (
+            tuple(self.added_types),
+            tuple(sorted(self.removed_types)),
+            tuple((t, tuple(s)) for t, s in self.added_sizes.items()),
+            tuple((t, tuple(sorted(s))) for t, s in self.hidden_sizes.items()),
+        )
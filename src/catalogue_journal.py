@@ -0,0 +1,364 @@
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+import pandas as pd
+from .catalogue import normalize_size
+from .config import OFFSET_COLUMN, OFFSET_COLUMN_G1, SHEET_NAME
+from .validation import find_part_size_columns, normalize_size_column
+
+try:
+    import fcntl
+except ImportError:  # Windows: journal writes are only serialized within one process
+    fcntl = None
+
+# Journal operations
+ADD_TYPE = "add_type"
+DELETE_TYPE = "delete_type"
+ADD_SIZE = "add_size"
+DELETE_SIZE = "delete_size"
+UPDATE_OFFSET = "update_offset"
+OPERATIONS = (ADD_TYPE, DELETE_TYPE, ADD_SIZE, DELETE_SIZE, UPDATE_OFFSET)
+
+# Threads of one process share a lock per journal path; processes (app, daemon, CLI) also
+# take an OS lock on a side file, which stays put when compaction rotates the journal
+_locks = {}
+_locks_guard = threading.Lock()
+
+# Bytes read from the end of a file per step when looking for its last entry
+_TAIL_CHUNK = 64 * 1024
+
+
+def _lock_for(path: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class CatalogueJournal:
+    """
+    Append-only JSON-lines log of catalogue edits, replayed on top of the workbook.
+
+    Each line is one entry: {'seq', 'op', 'type', 'sizes', 'user', 'at'} plus, for deletes
+    and updates, 'previous' (the sizes as they were) so the entry can be undone. 'sizes'
+    is a list of {'size', 'offset', 'g1_offset'} dicts (just {'size'} for deletes).
+    Every operation is idempotent (adds replace an existing size), so replaying a journal
+    that was already folded into the workbook is harmless.
+
+    compact() folds the journal into the workbook and moves its entries to the archive file,
+    which keeps the full audit trail.
+
+    Appends, seq numbering and compaction hold an exclusive lock (fcntl.flock on
+    `<journal>.lock`) across processes, and the next seq is read from the files under it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.archive_path = os.path.splitext(path)[0] + ".archive.jsonl"
+        self.lock_path = path + ".lock"
+        self._lock = _lock_for(path)
+
+    @contextmanager
+    def _locked(self):
+        # Thread lock first, then the OS lock, held until the block ends
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.lock_path)), exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read(self, path: str) -> list:
+        entries = []
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # A torn last line from an interrupted append is skipped
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def entries(self) -> list:
+        """Entries not yet compacted into the workbook, oldest first."""
+        return self._read(self.path)
+
+    def history(self) -> list:
+        """Every entry ever written (archived and pending), oldest first."""
+        return self._read(self.archive_path) + self.entries()
+
+    def stamp(self):
+        """(mtime_ns, size) of the journal file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _last_seq(self) -> int:
+        # Called with the lock held: seq of the last entry in the journal, or in the archive
+        # when the journal is empty (just compacted). Only the end of the file is read.
+        for path in (self.path, self.archive_path):
+            entry = _last_entry(path)
+            if entry is not None:
+                return entry["seq"]
+        return 0
+
+    def append(self, op: str, conn_type: str, sizes: list = None, user: str = None,
+               previous: list = None, undoes: int = None) -> dict:
+        """
+        Record one edit. Returns the written entry.
+
+        Args:
+            op: One of OPERATIONS
+            conn_type: Connector type the edit applies to
+            sizes: {'size', 'offset', 'g1_offset'} dicts (only 'size' is needed for deletes)
+            user: Who made the change
+            previous: Sizes as they were before the edit, for undo
+            undoes: seq of the entry this one reverts
+        """
+        entry = new_entry(op, conn_type, sizes, user, previous)
+        if undoes is not None:
+            entry["undoes"] = undoes
+        return self._write([entry])[0]
+
+    def append_many(self, edits: list, user: str = None) -> list:
+        """
+        Record several edits with one write (e.g. a bulk import). Returns the written entries.
+
+        Args:
+            edits: {'op', 'type', 'sizes', optional 'previous'} dicts, applied in order
+            user: Who made the changes
+        """
+        entries = [new_entry(edit["op"], edit["type"], edit.get("sizes"), user, edit.get("previous"))
+                   for edit in edits]
+        return self._write(entries) if entries else []
+
+    def append_entries(self, entries: list) -> list:
+        """Write entries built with new_entry (e.g. queued by CatalogueWriter) in one write. Returns them numbered."""
+        return self._write(entries) if entries else []
+
+    def _write(self, entries: list) -> list:
+        # Number the entries and append them in a single write, so they land together
+        with self._locked():
+            first = self._last_seq() + 1
+            entries = [{"seq": seq, **entry} for seq, entry in enumerate(entries, first)]
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+                f.flush()
+                os.fsync(f.fileno())
+        return entries
+
+    def undo(self, seq: int, user: str = None) -> list:
+        """
+        Append the inverse of a pending entry. Returns the new entries: one, or two for an
+        add_size that both added sizes and replaced existing ones (a delete_size and an
+        update_offset restoring its 'previous').
+        Raises ValueError if the entry is unknown, already compacted or cannot be inverted.
+        """
+        entry = next((e for e in self.entries() if e["seq"] == seq), None)
+        if entry is None:
+            raise ValueError(f"Journal entry {seq} not found (it may already be compacted)")
+        previous = entry.get("previous")
+        op, conn_type = entry["op"], entry["type"]
+        if op == ADD_TYPE:
+            return [self.append(DELETE_TYPE, conn_type, user=user, previous=entry["sizes"], undoes=seq)]
+        if op == ADD_SIZE:
+            replaced = {normalize_size(size_data["size"]) for size_data in previous or []}
+            added = [size_data for size_data in entry["sizes"] if normalize_size(size_data["size"]) not in replaced]
+            inverse = []
+            if added:
+                inverse.append(new_entry(DELETE_SIZE, conn_type, added, user, added))
+            if previous:
+                restored = [size_data for size_data in entry["sizes"] if normalize_size(size_data["size"]) in replaced]
+                inverse.append(new_entry(UPDATE_OFFSET, conn_type, previous, user, restored))
+            for undo_entry in inverse:
+                undo_entry["undoes"] = seq
+            return self._write(inverse)
+        if previous is None:
+            raise ValueError(f"Journal entry {seq} ({op}) has no previous values to restore")
+        if op == DELETE_TYPE:
+            return [self.append(ADD_TYPE, conn_type, previous, user=user, undoes=seq)]
+        if op == DELETE_SIZE:
+            return [self.append(ADD_SIZE, conn_type, previous, user=user, undoes=seq)]
+        return [self.append(UPDATE_OFFSET, conn_type, previous, user=user, previous=entry["sizes"], undoes=seq)]
+
+    def added_types(self) -> list:
+        """
+        Connector types added through the journal (pending or compacted) and not deleted again.
+        These are not in the running SUPPORTED_CONNECTOR_TYPES until the app restarts.
+        """
+        types = {}
+        for entry in self.history():
+            if entry["op"] == ADD_TYPE:
+                types[entry["type"]] = True
+            elif entry["op"] == DELETE_TYPE:
+                types.pop(entry["type"], None)
+        return list(types)
+
+    def compact(self, excel_path: str) -> int:
+        """
+        Fold pending entries into the workbook's Database sheet, archive them and start an empty
+        journal. Other sheets in the workbook are kept. Returns the number of entries folded.
+
+        The workbook is written to a copy next to it and renamed over the original, and the
+        journal is replaced by renaming an empty file over it, so a crash or a full disk leaves
+        the old workbook and journal in place and readers never see half-written files.
+        """
+        with self._locked():
+            entries = self.entries()
+            if not entries:
+                return 0
+            df = pd.read_excel(excel_path, sheet_name=SHEET_NAME)
+            # Same column names as the loader, which trims them
+            df.columns = [str(c).strip() for c in df.columns]
+            part_col, size_col = find_part_size_columns(df.columns)
+            df = replay(df, entries, part_col, size_col)
+            _rewrite_sheet(excel_path, df)
+            # Workbook first: if we stop here the entries are simply replayed again
+            with open(self.archive_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+                f.flush()
+                os.fsync(f.fileno())
+            empty_path = f"{self.path}.{os.getpid()}.tmp"
+            open(empty_path, "w").close()
+            os.replace(empty_path, self.path)
+        return len(entries)
+
+
+def _rewrite_sheet(excel_path: str, df: pd.DataFrame):
+    # Replace the Database sheet in a copy of the workbook (other sheets are kept), then rename it over
+    root, ext = os.path.splitext(excel_path)
+    temp_path = f"{root}.{os.getpid()}.tmp{ext}"
+    try:
+        shutil.copyfile(excel_path, temp_path)
+        with pd.ExcelWriter(temp_path, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
+            df.to_excel(writer, sheet_name=SHEET_NAME, index=False)
+        with open(temp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, excel_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _last_entry(path: str):
+    # Last complete entry of a JSON-lines file, reading backwards from the end; None if there is none
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        chunk = _TAIL_CHUNK
+        while True:
+            start = max(0, end - chunk)
+            f.seek(start)
+            lines = f.read(end - start).split(b"\n")
+            # The first line may be cut off by the chunk start, unless the chunk starts the file
+            complete = lines if start == 0 else lines[1:]
+            for line in reversed(complete):
+                if line.strip():
+                    try:
+                        return json.loads(line)
+                    except ValueError:
+                        # A torn last line from an interrupted append is skipped
+                        continue
+            if start == 0:
+                return None
+            chunk *= 2
+
+
+def new_entry(op: str, conn_type: str, sizes, user, previous) -> dict:
+    """A journal entry without its seq (assigned when it is written). Raises ValueError for unknown ops."""
+    if op not in OPERATIONS:
+        raise ValueError(f"Unknown journal operation '{op}'. Expected one of {OPERATIONS}")
+    entry = {
+        "op": op,
+        "type": conn_type,
+        "sizes": [_clean_size(size_data) for size_data in sizes or []],
+        "user": user or "anonymous",
+        "at": time.time(),
+    }
+    if previous is not None:
+        entry["previous"] = [_clean_size(size_data) for size_data in previous]
+    return entry
+
+
+def _clean_size(size_data) -> dict:
+    # Journal sizes are plain JSON: size as text, offsets as float or None
+    if not isinstance(size_data, dict):
+        return {"size": str(size_data)}
+    cleaned = {"size": str(size_data["size"])}
+    for key in ("offset", "g1_offset"):
+        if key in size_data:
+            value = size_data[key]
+            cleaned[key] = float(value) if value is not None and value > 0 else None
+    return cleaned
+
+
+def replay(df: pd.DataFrame, entries: list, part_col: str, size_col: str) -> pd.DataFrame:
+    """
+    Apply journal entries to a Database sheet DataFrame and return the new DataFrame.
+    Sizes match on the loader's normalized form ('2.0' matches '2').
+    """
+    if not entries:
+        return df
+    df = df.copy()
+    has_g1 = OFFSET_COLUMN_G1 in df.columns
+
+    def matches(conn_type, sizes=None):
+        mask = df[part_col].astype(str).str.strip() == conn_type
+        if sizes is not None:
+            wanted = normalize_size_column(pd.Series([s["size"] for s in sizes], dtype=object))
+            mask &= normalize_size_column(df[size_col]).isin(wanted)
+        return mask
+
+    for entry in entries:
+        op, conn_type, sizes = entry["op"], entry["type"], entry.get("sizes", [])
+        if op == DELETE_TYPE:
+            df = df[~matches(conn_type)]
+        elif op == DELETE_SIZE:
+            df = df[~matches(conn_type, sizes)]
+        elif op == UPDATE_OFFSET:
+            # Every size of the entry in one pass (an import can update thousands)
+            mask = matches(conn_type, sizes)
+            if mask.any():
+                wanted = normalize_size_column(pd.Series([s["size"] for s in sizes], dtype=object))
+                by_size = dict(zip(wanted, sizes))
+                updates = normalize_size_column(df.loc[mask, size_col]).map(by_size)
+                df.loc[mask, OFFSET_COLUMN] = updates.map(lambda s: s.get("offset")).astype(float)
+                if has_g1:
+                    df.loc[mask, OFFSET_COLUMN_G1] = updates.map(lambda s: s.get("g1_offset")).astype(float)
+        elif op in (ADD_TYPE, ADD_SIZE):
+            df = df[~matches(conn_type, sizes)]
+            rows = [{part_col: conn_type, size_col: size_data["size"], OFFSET_COLUMN: size_data.get("offset"),
+                     **({OFFSET_COLUMN_G1: size_data.get("g1_offset")} if has_g1 else {})}
+                    for size_data in sizes]
+            df = pd.concat([df, pd.DataFrame(rows, columns=df.columns)], ignore_index=True)
+    return df.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    import sys
+    from .config import EXCEL_PATH, JOURNAL_PATH
+
+    journal = CatalogueJournal(JOURNAL_PATH)
+    if sys.argv[1:] == ["compact"]:
+        print(f"Folded {journal.compact(EXCEL_PATH)} journal entries into the workbook.")
+    else:
+        for entry in journal.history():
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["at"]))
+            sizes = ", ".join(s["size"] for s in entry["sizes"])
+            print(f"{entry['seq']:>5}  {when}  {entry['user']:<12} {entry['op']:<14} {entry['type']}  {sizes}")
@@ -0,0 +1,225 @@
+import os
+import threading
+import time
+from .catalogue import CatalogueHistory
+from .catalogue_journal import DELETE_SIZE, DELETE_TYPE, CatalogueJournal
+from .loader import DimensionLoader
+from .offset_table import open_offset_table, write_offset_table
+
+
+class CatalogueWatcher:
+    """
+    Keeps a DimensionLoader in sync with the workbook on disk.
+
+    A daemon thread polls the workbook's modification time and size. When they change
+    (and have stayed unchanged for one poll, so half-written saves are skipped) a new
+    loader is built in the background and swapped in with a single reference assignment.
+    Readers call current() and keep using the loader they got, so in-flight lookups finish
+    against a consistent snapshot and never wait on a reload.
+
+    Every loader answers from an immutable CatalogueSnapshot. Reloads and edits (publish_sizes,
+    remove_type) build a new snapshot version that shares the unchanged connector types;
+    writers are serialized by a lock, readers never take it.
+
+    With a journal_path the loader replays the edit journal on top of the workbook, the
+    journal file is watched too, and every compact_interval seconds pending journal entries
+    are folded into the workbook.
+
+    With a table_path every full load also writes the compiled offsets to a memory-mapped
+    offset table. A watcher that starts while that table matches the workbook (and journal)
+    serves lookups from the mapped file and only parses the workbook when it changes (or for
+    the validation report), so new server processes are ready without waiting for the xlsx
+    and share the table's pages instead of each holding a copy of the catalogue.
+
+    Edits are published to memory before they reach the journal (CatalogueWriter queues the
+    write). `pending_entries`, if set, returns the journal entries still queued; every reload
+    re-applies them, so a reload in between does not drop an edit sessions already see.
+    """
+
+    def __init__(self, excel_path: str, interval: float = 2.0, loader_factory=DimensionLoader,
+                 journal_path: str = None, compact_interval: float = None, table_path: str = None,
+                 pending_entries=None):
+        self.excel_path = excel_path
+        self.pending_entries = pending_entries
+        self.interval = interval
+        self.loader_factory = loader_factory
+        self.journal = CatalogueJournal(journal_path) if journal_path else None
+        self.compact_interval = compact_interval
+        self.table_path = table_path
+        self.loaded_at = time.time()
+        self.last_error = None
+        self.history = CatalogueHistory()
+        self._write_lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._loader = self._load_from_table()
+        if self._loader is None:
+            self._loader = self._load()
+            self._write_table(self._stamp)
+        self.history.record(self._loader.snapshot)
+        self._last_compaction = time.time()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load(self, previous_snapshot=None) -> DimensionLoader:
+        if self.journal is None:
+            return self.loader_factory(self.excel_path, previous_snapshot=previous_snapshot)
+        return self.loader_factory(self.excel_path, previous_snapshot=previous_snapshot,
+                                   journal_path=self.journal.path)
+
+    def _with_pending(self, loader: DimensionLoader) -> DimensionLoader:
+        # Re-apply edits still queued for the journal. The journal was read first, so an entry
+        # written in between is missed here, but its write changes the stamp and reloads again.
+        entries = self.pending_entries() if self.pending_entries is not None else []
+        if not entries:
+            return loader
+        snapshot = loader.snapshot
+        for entry in entries:
+            if entry["op"] == DELETE_TYPE:
+                snapshot = snapshot.without_type(entry["type"], "queued edits")
+            elif entry["op"] == DELETE_SIZE:
+                changes = loader.size_changes([size_data["size"] for size_data in entry["sizes"]], remove=True)
+                snapshot = snapshot.with_sizes(entry["type"], changes, "queued edits")
+            else:
+                sizes = [size_data for size_data in entry["sizes"] if size_data.get("offset") is not None]
+                snapshot = snapshot.with_sizes(entry["type"], loader.size_changes(sizes), "queued edits")
+        return loader.with_snapshot(snapshot)
+
+    def _load_from_table(self):
+        # Loader from an offset table written for the current workbook stamp, or None
+        from_offset_table = getattr(self.loader_factory, "from_offset_table", None)
+        if self.table_path is None or self._stamp is None or from_offset_table is None:
+            return None
+        table = open_offset_table(self.table_path, self._stamp)
+        if table is None:
+            return None
+        try:
+            # The loader reads the mapped table, so it is not closed here
+            return from_offset_table(table, excel_path=self.excel_path,
+                                     journal_path=self.journal.path if self.journal is not None else None)
+        except Exception:
+            table.close()
+            raise
+
+    def _write_table(self, stamp):
+        if self.table_path is None:
+            return
+        try:
+            write_offset_table(self._loader.snapshot, self.table_path, stamp)
+        except OSError as e:
+            self.last_error = f"Offset table not written: {type(e).__name__}: {e}"
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.excel_path)
+        except OSError:
+            return None
+        workbook = (stat.st_mtime_ns, stat.st_size)
+        return workbook if self.journal is None else (workbook, self.journal.stamp())
+
+    def current(self) -> DimensionLoader:
+        """The latest catalogue version (loaded from the workbook or edited)."""
+        return self._loader
+
+    @property
+    def version(self) -> int:
+        return self._loader.catalogue_version
+
+    def _swap(self, new_loader: DimensionLoader):
+        changed = new_loader.snapshot is not self._loader.snapshot
+        self._loader = new_loader
+        if changed:
+            self.history.record(new_loader.snapshot)
+
+    def publish_sizes(self, conn_type: str, changes: dict, source: str) -> DimensionLoader:
+        """
+        Publish a new catalogue version with sizes of one type added/replaced (OffsetEntry)
+        or removed (None). Sessions see it on their next rerun, without waiting for the
+        workbook reload. Returns the new loader.
+        """
+        with self._write_lock:
+            loader = self._loader
+            new_loader = loader.with_snapshot(loader.snapshot.with_sizes(conn_type, changes, source))
+            self._swap(new_loader)
+        return new_loader
+
+    def publish_changes(self, changes: dict, source: str) -> DimensionLoader:
+        """Like publish_sizes for {conn_type: {size: OffsetEntry or None}} over many types, as one version."""
+        with self._write_lock:
+            loader = self._loader
+            new_loader = loader.with_snapshot(loader.snapshot.with_changes(changes, source))
+            self._swap(new_loader)
+        return new_loader
+
+    def remove_type(self, conn_type: str, source: str) -> DimensionLoader:
+        """Publish a new catalogue version without a connector type."""
+        with self._write_lock:
+            loader = self._loader
+            new_loader = loader.with_snapshot(loader.snapshot.without_type(conn_type, source))
+            self._swap(new_loader)
+        return new_loader
+
+    def start(self):
+        """Start polling in a daemon thread (no-op if already running)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="catalogue-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def reload(self) -> bool:
+        """
+        Rebuild the loader from the workbook now and swap it in.
+        Returns False (and keeps serving the old loader) if the workbook cannot be loaded.
+        """
+        stamp = self._file_stamp()
+        with self._write_lock:
+            try:
+                new_loader = self._with_pending(self._load(self._loader.snapshot))
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            self._swap(new_loader)
+        self._stamp = stamp
+        self.loaded_at = time.time()
+        self.last_error = None
+        self._write_table(stamp)
+        return True
+
+    def compact(self, raise_errors: bool = False) -> int:
+        """
+        Fold pending journal entries into the workbook now. Returns the number folded.
+        A failure is kept in last_error, and re-raised with raise_errors (e.g. for CatalogueWriter).
+        """
+        self._last_compaction = time.time()
+        if self.journal is None:
+            return 0
+        try:
+            return self.journal.compact(self.excel_path)
+        except Exception as e:
+            self.last_error = f"Journal compaction failed: {type(e).__name__}: {e}"
+            if raise_errors:
+                raise
+            return 0
+
+    def _watch(self):
+        pending = None
+        while not self._stop.wait(self.interval):
+            if self.compact_interval and time.time() - self._last_compaction >= self.compact_interval:
+                self.compact()
+            stamp = self._file_stamp()
+            if stamp is None or stamp == self._stamp:
+                pending = None
+                continue
+            # Wait until the file has stopped changing before reading it
+            if stamp != pending:
+                pending = stamp
+                continue
+            if not self.reload():
+                # Don't retry a broken workbook until it changes again
+                self._stamp = stamp
+            pending = None
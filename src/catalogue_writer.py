@@ -0,0 +1,240 @@
+import atexit
+import functools
+import threading
+import time
+from .catalogue_journal import new_entry
+from .config_editor import add_to_config, remove_from_config, rewrite_config
+
+
+class CatalogueWriter:
+    """
+    Write-behind queue for catalogue edits, shared by every session.
+
+    The app applies an edit to the in-memory catalogue (CatalogueWatcher.publish_sizes, the
+    session overlay) and hands the durable part to the writer, which returns at once. A
+    background thread waits until edits have stopped arriving for `delay` seconds (at most
+    `max_delay` after the first), then writes everything queued so far together: one journal
+    append with all entries and one config.py rewrite with all config edits.
+
+    A write that fails is kept at the front of the queue and retried every `retry_interval`
+    seconds, so nothing is lost; status() reports what is pending, the last save and the last
+    error. flush() waits until everything queued so far is written (undo calls it first so the
+    journal is in order). Pending edits are flushed when the process exits.
+
+    A compaction (request_compaction) runs once the queue is written. It is not part of what
+    flush() waits for, and it is tried once: a failure is reported in status() and the
+    journal simply stays uncompacted until the next request.
+    """
+
+    def __init__(self, journal, config_path: str = None, delay: float = 0.25, max_delay: float = 2.0,
+                 retry_interval: float = 5.0):
+        self.journal = journal
+        self.config_path = config_path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.retry_interval = retry_interval
+        self._lock = threading.Condition()
+        self._entries = []          # journal entries waiting to be written
+        self._config_edits = []     # config.py text edits waiting to be written
+        self._compact = None        # callable run once the queue is written (request_compaction)
+        self._compaction_error = None
+        self._flush_requested = False
+        self._write_guard = threading.Lock()
+        self._first_queued = None
+        self._last_queued = None
+        self._submitted = 0         # edits submitted / written so far, for flush()
+        self._written = 0
+        self._saved_entries = 0
+        self._last_saved_at = None
+        self._last_error = None
+        self._failures = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def append(self, op: str, conn_type: str, sizes: list = None, user: str = None, previous: list = None) -> dict:
+        """Queue one journal entry (same arguments as CatalogueJournal.append). Returns the queued entry."""
+        return self.submit([{"op": op, "type": conn_type, "sizes": sizes, "previous": previous}], user)[0]
+
+    def append_many(self, edits: list, user: str = None) -> list:
+        """Queue several journal entries (same arguments as CatalogueJournal.append_many)."""
+        return self.submit(edits, user)
+
+    def add_to_config(self, sizes_by_type: dict, images: dict = None):
+        """Queue adding connector types/sizes (and image filenames) to config.py."""
+        self.submit(config_edits=[functools.partial(add_to_config, sizes_by_type=sizes_by_type, images=images)])
+
+    def remove_from_config(self, connector_type: str, size: str = None):
+        """Queue removing a connector type, or one of its sizes, from config.py."""
+        self.submit(config_edits=[functools.partial(remove_from_config, connector_type=connector_type, size=size)])
+
+    def submit(self, edits: list = (), user: str = None, config_edits: list = ()) -> list:
+        """
+        Queue journal edits ({'op', 'type', 'sizes', optional 'previous'} dicts) and config.py
+        text edits for the next write. Edits are validated now; returns the queued journal entries
+        (their 'seq' is assigned when they are written).
+        """
+        entries = [new_entry(edit["op"], edit["type"], edit.get("sizes"), user, edit.get("previous"))
+                   for edit in edits]
+        config_edits = list(config_edits) if self.config_path else []
+        if not entries and not config_edits:
+            return entries
+        with self._lock:
+            self._entries.extend(entries)
+            self._config_edits.extend(config_edits)
+            now = time.time()
+            self._first_queued = self._first_queued or now
+            self._last_queued = now
+            self._submitted += 1
+            self._lock.notify_all()
+        return entries
+
+    def request_compaction(self, compact):
+        """
+        Run `compact` (e.g. fold the journal into the workbook) once in the background after
+        the queued writes. A failure is reported in status()['compaction_error'], not retried.
+        """
+        with self._lock:
+            self._compact = compact
+            self._compaction_error = None
+            self._lock.notify_all()
+
+    def queued_entries(self) -> list:
+        """Journal entries queued but not written yet, oldest first (CatalogueWatcher re-applies them on reload)."""
+        with self._lock:
+            return list(self._entries)
+
+    def status(self) -> dict:
+        """Snapshot for display: pending counts, entries saved, last save time and last error."""
+        with self._lock:
+            return {
+                'pending_entries': len(self._entries),
+                'pending_config_edits': len(self._config_edits),
+                'compaction_pending': self._compact is not None,
+                'compaction_error': self._compaction_error,
+                'saved_entries': self._saved_entries,
+                'last_saved_at': self._last_saved_at,
+                'last_error': self._last_error,
+                'failures': self._failures,
+            }
+
+    @property
+    def pending(self) -> bool:
+        with self._lock:
+            return self._written < self._submitted
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Write everything queued so far now and wait for it. Returns False if it could not be
+        written (see status()['last_error']) or the timeout passed; the edits stay queued.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._lock:
+            target = self._submitted
+            if self._thread is None or not self._thread.is_alive():
+                # No background thread: write in the caller's thread
+                self._lock.release()
+                try:
+                    self._write_pending()
+                finally:
+                    self._lock.acquire()
+                return self._written >= target
+            failures = self._failures
+            self._flush_requested = True
+            self._lock.notify_all()
+            while self._written < target and self._failures == failures:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._lock.wait(remaining)
+            return self._written >= target
+
+    def start(self):
+        """Start the writer thread (no-op if already running)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="catalogue-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """Write what is still queued, then stop the thread."""
+        self._stop.set()
+        with self._lock:
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.pending:
+            self._write_pending()
+
+    def _due(self) -> float:
+        # Seconds until the queued edits should be written (called with the lock held)
+        if self._written >= self._submitted:
+            return None if self._compact is None else 0
+        if self._flush_requested:
+            return 0
+        if self._last_error is not None:
+            return self._last_queued + self.retry_interval - time.time()
+        quiet = self._last_queued + self.delay
+        return min(quiet, self._first_queued + self.max_delay) - time.time()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                due = self._due()
+                if due is None or due > 0:
+                    self._lock.wait(due)
+                    continue
+            self._write_pending()
+
+    def _write_pending(self):
+        with self._write_guard:
+            self._write_batch()
+
+    def _write_batch(self):
+        with self._lock:
+            entries, config_edits, compact = list(self._entries), list(self._config_edits), self._compact
+            target = self._submitted
+            self._flush_requested = False
+        try:
+            # Journal first: it is the record of the change; config.py only lists types and sizes
+            if entries:
+                self.journal.append_entries(entries)
+                with self._lock:
+                    del self._entries[:len(entries)]
+                    self._saved_entries += len(entries)
+            if config_edits:
+                rewrite_config(self.config_path, config_edits)
+                with self._lock:
+                    del self._config_edits[:len(config_edits)]
+        except Exception as e:
+            with self._lock:
+                self._last_error = f"{type(e).__name__}: {e}"
+                self._last_queued = time.time()
+                self._failures += 1
+                self._lock.notify_all()
+            return
+        with self._lock:
+            self._written = max(self._written, target)
+            if entries or config_edits:
+                self._last_saved_at = time.time()
+            self._last_error = None
+            # Edits queued during this write are due relative to the first of them
+            self._first_queued = self._last_queued if self._written < self._submitted else None
+            self._lock.notify_all()
+        if compact is not None:
+            self._run_compaction(compact)
+
+    def _run_compaction(self, compact):
+        # One attempt; the edits it folds are already safe in the journal either way
+        try:
+            compact()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            error = None
+        with self._lock:
+            if self._compact is compact:
+                self._compact = None
+                self._compaction_error = error
+            self._lock.notify_all()
@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import socket
+import sys
+from .config import DAEMON_SOCKET_PATH
+
+# Only the standard library and config are imported here, so a client talking to the daemon
+# starts without pandas or the workbook. The in-process fallback imports them when first used.
+
+
+class DaemonClient:
+    """
+    Connection to the calculation daemon (python -m src.daemon).
+
+    Keep one client open for many requests: each request is a single line written to and read
+    from an already open Unix socket, well under a millisecond against a warm daemon.
+    """
+
+    def __init__(self, socket_path: str = DAEMON_SOCKET_PATH, timeout: float = 10.0):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.settimeout(timeout)
+            self._socket.connect(socket_path)
+        except OSError:
+            self._socket.close()
+            raise
+        self._reader = self._socket.makefile("rb")
+
+    def request(self, request: dict) -> dict:
+        """Send one request and return the daemon's reply (see src.daemon for the protocol)."""
+        self._socket.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Calculation daemon closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LocalCalculator:
+    """Answers requests in this process, with the same replies as the daemon."""
+
+    def __init__(self):
+        from .catalogue_watcher import CatalogueWatcher
+        from .config import EXCEL_PATH, JOURNAL_PATH, OFFSET_TABLE_PATH
+        from .daemon import handle_request
+        # Not started: one load (from the offset table when it is current), no polling thread
+        self._watcher = CatalogueWatcher(EXCEL_PATH, journal_path=JOURNAL_PATH, table_path=OFFSET_TABLE_PATH)
+        self._handle = handle_request
+
+    def request(self, request: dict) -> dict:
+        return self._handle(self._watcher.current(), request)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def connect(socket_path: str = DAEMON_SOCKET_PATH, fallback: bool = True):
+    """
+    Client for the running daemon, or (with fallback) a LocalCalculator when none is running.
+    Both have request(dict) -> dict and close().
+    """
+    try:
+        return DaemonClient(socket_path)
+    except OSError:
+        if not fallback:
+            raise
+        return LocalCalculator()
+
+
+def _print_reply(reply: dict):
+    if not reply["ok"]:
+        print(f"Error: {reply['error']}", file=sys.stderr)
+    elif "cuts" in reply:
+        for i, (cut, text) in enumerate(zip(reply["cuts"], reply["text"]), 1):
+            label = f"Cut {i} = " if len(reply["cuts"]) > 1 else "Final Cut Length = "
+            print(f"{label}{text} {reply['unit']} ({cut:.4f})")
+    elif "offset" in reply:
+        print(reply["offset"])
+    else:
+        print(json.dumps(reply))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.client",
+        description="Calculate cuts through the calculation daemon, or in this process when it isn't running.")
+    parser.add_argument("--socket", default=DAEMON_SOCKET_PATH, help="Daemon socket path")
+    parser.add_argument("--no-fallback", action="store_true", help="Fail instead of calculating in-process")
+    parser.add_argument("--shave", action="store_true", help="Take the shave off each cut")
+    commands = parser.add_subparsers(dest="op", required=True)
+    standard = commands.add_parser("standard", help="TYPE_A SIZE_A TYPE_B SIZE_B C2C")
+    for name in ("type_a", "size_a", "type_b", "size_b", "c2c"):
+        standard.add_argument(name)
+    standard.add_argument("--g1-a", action="store_true", help="Use the G1 offset for fitting A")
+    standard.add_argument("--g1-b", action="store_true", help="Use the G1 offset for fitting B")
+    lay_in = commands.add_parser("lay_in", help="TYPE_A SIZE_A TYPE_LAY_IN SIZE_LAY_IN TYPE_B SIZE_B C2C_OVERALL C2C_LAY_IN")
+    for name in ("type_a", "size_a", "type_lay_in", "size_lay_in", "type_b", "size_b", "c2c_overall", "c2c_lay_in"):
+        lay_in.add_argument(name)
+    bushing = commands.add_parser("bushing", help="TYPE_A SIZE_A SIZE_BUSHING TYPE_B SIZE_B C2C")
+    for name in ("type_a", "size_a", "size_bushing", "type_b", "size_b", "c2c"):
+        bushing.add_argument(name)
+    commands.add_parser("batch", help="Read JSON requests from stdin, one per line; write JSON replies")
+    commands.add_parser("ping", help="Show whether the daemon is running and its catalogue version")
+    args = parser.parse_args(argv)
+    args.socket = os.path.abspath(args.socket)
+
+    try:
+        calculator = connect(args.socket, fallback=not args.no_fallback)
+    except OSError as e:
+        print(f"Calculation daemon not reachable at {args.socket}: {e}", file=sys.stderr)
+        return 1
+    with calculator:
+        if args.op == "batch":
+            # Many requests over one connection: the fast path for scripts
+            failed = False
+            for line in sys.stdin:
+                if line.strip():
+                    try:
+                        reply = calculator.request(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        reply = {"ok": False, "error": f"Bad JSON: {e}"}
+                    failed |= not reply["ok"]
+                    print(json.dumps(reply), flush=True)
+            return 1 if failed else 0
+        request = {key: value for key, value in vars(args).items() if key not in ("socket", "no_fallback")}
+        reply = calculator.request(request)
+        if args.op == "ping":
+            where = "daemon" if isinstance(calculator, DaemonClient) else "in-process (no daemon running)"
+            print(f"{where}: catalogue v{reply.get('catalogue_version')}")
+            return 0
+        _print_reply(reply)
+        return 0 if reply["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
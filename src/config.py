@@ -5,6 +5,25 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Path to the Excel file in your project/data folder (adjust filename if needed)
 EXCEL_PATH = os.path.join(BASE_DIR, "..", "data", "PVC Cut Database .xlsx")
 
+# Append-only log of Manage Fittings edits, replayed on top of the workbook until compacted
+JOURNAL_PATH = os.path.join(BASE_DIR, "..", "data", "catalogue_journal.jsonl")
+# Seconds between folds of the journal back into the workbook
+JOURNAL_COMPACT_INTERVAL = 600
+# Cut length display: inch grid (8, 16, 32 or 64) or "mm" (0.1 mm), and how lengths between
+# grid steps are rounded: "truncate" (toward zero), "nearest", "floor" or "ceiling"
+LENGTH_GRID = 16
+LENGTH_ROUNDING = "truncate"
+# Taken off each cut when "Include Shave" is ticked, in inches
+SHAVE = "1/16"
+
+# Compiled offset index shared by every server process (memory-mapped, rebuilt after each workbook load)
+OFFSET_TABLE_PATH = os.path.join(BASE_DIR, "..", "data", "offset_table.bin")
+
+# Unix socket of the calculation daemon (python -m src.daemon), used by python -m src.client
+DAEMON_SOCKET_PATH = os.path.join(BASE_DIR, "..", "data", "calc_daemon.sock")
+# Command history of the interactive calculator (python -m src.main --repl)
+REPL_HISTORY_PATH = os.path.expanduser("~/.pvc_cut_calculator_history")
+
 # Exact connector types for dropdown menu - these will be matched exactly in the database
 SUPPORTED_CONNECTOR_TYPES = [
     "Tee (Socket x Socket x Socket)",
@@ -40,6 +59,12 @@ CONNECTOR_SIZES = {
     "Union (Socket x Socket)": ["1.5", "2", "2.5", "3", "4"],
 }
 
+# Connector types that seat inside the next fitting's socket with no pipe of their own.
+# In a pipe run their offset is subtracted from the cut they sit on.
+INLINE_CONNECTOR_TYPES = [
+    "Bushing (Spigot x Socket)",
+]
+
 # Offset columns - all connectors use "Offset" as primary, "Offset (G1)" as secondary
 OFFSET_COLUMN = "Offset"
 OFFSET_COLUMN_G1 = "Offset (G1)"
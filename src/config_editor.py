@@ -0,0 +1,82 @@
+import os
+import re
+
+# Text edits of src/config.py for catalogue changes. Each takes and returns the file's text,
+# so a burst of edits can be applied to one read and written back once (see CatalogueWriter).
+
+
+def _size_list(content: str, connector_type: str):
+    # Match of the type's CONNECTOR_SIZES list (it may span several lines), or None
+    return re.search(f'"{re.escape(connector_type)}": \\[(.*?)\\]', content, re.DOTALL)
+
+
+def _parse_sizes(text: str) -> list:
+    return [item.strip().strip('"').strip("'") for item in text.split(',') if item.strip()]
+
+
+def add_to_config(content: str, sizes_by_type: dict, images: dict = None) -> str:
+    """
+    Add connector types and sizes to config.py text.
+
+    Args:
+        content: Text of config.py
+        sizes_by_type: {connector type: [size, ...]}; existing types get the sizes they lack,
+            new types are appended to SUPPORTED_CONNECTOR_TYPES and CONNECTOR_SIZES
+        images: Optional {connector type: image filename} for CONNECTOR_IMAGE_MAP
+
+    Returns:
+        str: The edited text
+    """
+    for connector_type, sizes in sizes_by_type.items():
+        match = _size_list(content, connector_type)
+        if match:
+            existing_sizes = _parse_sizes(match.group(1))
+            existing_sizes += [size for size in sizes if size not in existing_sizes]
+            content = content[:match.start()] + f'"{connector_type}": {existing_sizes}' + content[match.end():]
+            continue
+        supported_end = content.index("\n]", content.index("SUPPORTED_CONNECTOR_TYPES = ["))
+        content = content[:supported_end] + f'\n    "{connector_type}",' + content[supported_end:]
+        sizes_end = content.index("\n}", content.index("CONNECTOR_SIZES = {"))
+        content = content[:sizes_end] + f'\n    "{connector_type}": {list(sizes)},' + content[sizes_end:]
+
+    for connector_type, image_filename in (images or {}).items():
+        image_entry = re.search(f'\n    "{re.escape(connector_type)}": "[^"]*",', content)
+        if image_entry:
+            content = content[:image_entry.start()] + content[image_entry.end():]
+        images_end = content.index("\n}", content.index("CONNECTOR_IMAGE_MAP = {"))
+        content = content[:images_end] + f'\n    "{connector_type}": "{image_filename}",' + content[images_end:]
+    return content
+
+
+def remove_from_config(content: str, connector_type: str, size: str = None) -> str:
+    """
+    Remove one size of a connector type, or the whole type (its entry in every config list),
+    from config.py text. Removing something that is not there leaves the text unchanged.
+    """
+    if size is not None:
+        match = _size_list(content, connector_type)
+        if match:
+            sizes = [s for s in _parse_sizes(match.group(1)) if s != size]
+            content = content[:match.start()] + f'"{connector_type}": {sizes}' + content[match.end():]
+        return content
+    escaped = re.escape(connector_type)
+    content = content.replace(f'    "{connector_type}",\n', '')
+    content = re.sub(f'    "{escaped}": \\[.*?\\],\n', '', content, flags=re.DOTALL)
+    return re.sub(f'    "{escaped}": "[^"]*",\n', '', content)
+
+
+def rewrite_config(path: str, edits: list):
+    """
+    Apply text edits (callables taking and returning the text) to a config file and write it
+    once, through a temporary file so a failed write leaves the old file in place.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    for edit in edits:
+        content = edit(content)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
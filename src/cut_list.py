@@ -0,0 +1,161 @@
+import io
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from .api import resolve_offset
+from .formatting import DEFAULT_FORMATTER
+from .lengths import SHAVE_INCHES, parse_length
+
+BUSHING_TYPE = "Bushing (Spigot x Socket)"
+
+# Accepted header spellings (lowercased) for each cut-list column
+COLUMN_ALIASES = {
+    'cut_type': {"cut type", "type", "cut"},
+    'type_a': {"type a", "connection type a", "fitting a", "connection a"},
+    'size_a': {"size a", "connection size a"},
+    'type_b': {"type b", "connection type b", "fitting b", "connection b"},
+    'size_b': {"size b", "connection size b"},
+    'size_bushing': {"bushing size", "size bushing", "bushing"},
+    'c2c': {"c2c", "center-to-center", "center to center", "c2c (inches)"},
+    'use_g1_a': {"g1 a", "vertical stab a", "use g1 a"},
+    'use_g1_b': {"g1 b", "vertical stab b", "use g1 b"},
+    'shave': {"shave", "include shave"},
+    'notes': {"notes", "note"},
+}
+REQUIRED_COLUMNS = ['type_a', 'size_a', 'type_b', 'size_b', 'c2c']
+
+_TRUE_VALUES = {"y", "yes", "true", "1", "x"}
+
+
+def read_cut_list(data, filename: str) -> pd.DataFrame:
+    """
+    Read an uploaded cut list (CSV or XLSX) into a DataFrame with canonical column names.
+    Raises ValueError for unsupported files or missing required columns.
+    """
+    suffix = Path(filename).suffix.lower()
+    raw = data.getvalue() if hasattr(data, 'getvalue') else data
+    if suffix == ".csv":
+        df = pd.read_csv(io.BytesIO(raw), dtype=str, keep_default_na=False)
+    elif suffix in (".xlsx", ".xls"):
+        df = pd.read_excel(io.BytesIO(raw), dtype=str).fillna("")
+    else:
+        raise ValueError(f"Unsupported cut list file '{filename}'. Use .csv or .xlsx")
+
+    renames = {}
+    for col in df.columns:
+        key = str(col).strip().lower()
+        for canonical, aliases in COLUMN_ALIASES.items():
+            if key in aliases or key == canonical:
+                renames[col] = canonical
+    df = df.rename(columns=renames)
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Cut list is missing columns: {missing}. Found: {list(df.columns)}")
+    for col in COLUMN_ALIASES:
+        if col not in df.columns:
+            df[col] = ""
+    return df
+
+
+def _flag(series: pd.Series) -> pd.Series:
+    return series.astype(str).str.strip().str.lower().isin(_TRUE_VALUES)
+
+
+def compute_cut_list(loader, df: pd.DataFrame):
+    """
+    Validate and compute every row of a cut list in one pass.
+
+    Offsets are resolved once per distinct (type, size, stab) and joined onto the rows;
+    the cut arithmetic runs on whole columns. Rows that fail validation are reported,
+    not computed.
+
+    Returns:
+        (cuts, errors): cuts is a list of Jobs tab cut dicts (without 'number'),
+        errors is a list of (row number, message) with 1-based spreadsheet row numbers.
+    """
+    df = df.reset_index(drop=True)
+    for col in ('cut_type', 'type_a', 'size_a', 'type_b', 'size_b', 'size_bushing', 'notes'):
+        df[col] = df[col].astype(str).str.strip()
+    cut_type = df['cut_type'].str.capitalize().replace("", "Standard")
+    is_bushing = cut_type == "Bushing"
+    use_g1_a = _flag(df['use_g1_a']) & ~is_bushing
+    use_g1_b = _flag(df['use_g1_b']) & ~is_bushing
+    shave = _flag(df['shave'])
+
+    row_errors = pd.Series("", index=df.index)
+
+    def add_error(mask, message):
+        mask = mask & (row_errors == "")
+        row_errors[mask] = message if isinstance(message, str) else message[mask]
+
+    add_error(~cut_type.isin(["Standard", "Bushing"]), "Cut type must be Standard or Bushing")
+    for col in REQUIRED_COLUMNS:
+        add_error(df[col] == "", f"Missing {col.replace('_', ' ')}")
+    add_error(is_bushing & (df['size_bushing'] == ""), "Missing bushing size")
+
+    # C2C: plain numbers in one vectorized step, '14-3/8' style strings individually (exactly,
+    # not rounded to 1/64, so a C2C gives the same cut however the cell was typed)
+    c2c = pd.to_numeric(df['c2c'], errors='coerce').astype("float64")
+    text_c2c = c2c.isna() & (df['c2c'] != "")
+    for row in df.index[text_c2c]:
+        try:
+            c2c[row] = float(parse_length(df.at[row, 'c2c']))
+        except (ValueError, OverflowError):
+            pass
+    add_error(c2c.isna(), "C2C is not a number")
+    add_error(~np.isfinite(c2c), "C2C must be a finite number")
+    add_error(c2c < 0, "C2C must not be negative")
+
+    # Resolve each distinct fitting once
+    def resolve(types, sizes, g1, rows):
+        # Columns as lists first: iterating string columns value by value is slow
+        keys = pd.Series(list(zip(types[rows].tolist(), sizes[rows].tolist(), g1[rows].tolist())),
+                         index=df.index[rows], dtype=object)
+        offsets, failures = {}, {}
+        for key in keys.unique():
+            try:
+                offsets[key] = resolve_offset(loader, *key)
+            except ValueError as e:
+                failures[key] = str(e)
+        failed = keys.isin(list(failures)).reindex(df.index, fill_value=False)
+        add_error(failed, keys.map(failures).reindex(df.index).fillna(""))
+        return keys.map(offsets).reindex(df.index).astype("float64")
+
+    every_row = pd.Series(True, index=df.index)
+    offset_a = resolve(df['type_a'], df['size_a'], use_g1_a, every_row)
+    offset_b = resolve(df['type_b'], df['size_b'], use_g1_b, every_row)
+    bushing = resolve(pd.Series(BUSHING_TYPE, index=df.index), df['size_bushing'], ~every_row, is_bushing).fillna(0.0)
+
+    valid = row_errors == ""
+    errors = [(int(row) + 2, row_errors[row]) for row in df.index[~valid]]
+
+    # Same float arithmetic and order as get_cut_length/get_bushing_cut plus the shave,
+    # then the whole column formatted at once
+    lengths = c2c[valid] - offset_a[valid]
+    lengths = lengths.where(~is_bushing[valid], lengths - bushing[valid])
+    lengths = lengths - offset_b[valid]
+    lengths = lengths.where(~shave[valid], lengths - SHAVE_INCHES)
+    fractions = DEFAULT_FORMATTER.format_many(lengths.to_numpy())
+
+    rows = df[valid]
+    cuts = []
+    columns = [cut_type[valid], rows['type_a'], rows['size_a'], rows['type_b'], rows['size_b'], rows['size_bushing'],
+               c2c[valid], lengths, fractions, shave[valid], rows['notes']]
+    for row_type, type_a, size_a, type_b, size_b, size_bushing, row_c2c, length, fraction, row_shave, notes in zip(
+            *(column.tolist() for column in columns)):
+        cut_data = {
+            'type': row_type,
+            'connection_a': f"{type_a} ({size_a}\")",
+            'connection_b': f"{type_b} ({size_b}\")",
+            'c2c': float(row_c2c),
+            'length_decimal': float(length),
+            'length_fraction': fraction,
+            'shave': bool(row_shave),
+            'notes': notes,
+            'catalogue_version': loader.catalogue_version,
+        }
+        if row_type == "Bushing":
+            cut_data['connection_bushing'] = f"Bushing ({size_bushing}\")"
+        cuts.append(cut_data)
+    return cuts, errors
@@ -0,0 +1,178 @@
+import json
+import math
+import os
+import signal
+import socket
+import socketserver
+import sys
+from .api import get_cut_length, get_lay_in_cuts, get_bushing_cut, resolve_offset
+from .catalogue_watcher import CatalogueWatcher
+from .config import EXCEL_PATH, JOURNAL_PATH, OFFSET_TABLE_PATH, DAEMON_SOCKET_PATH
+from .formatting import DEFAULT_FORMATTER
+from .job_queue import BUSHING_TYPE
+from .lengths import SHAVE_INCHES, parse_length
+
+# Requests are one JSON object per line; each gets one JSON line back:
+#   {"op": "standard", "type_a": ..., "size_a": ..., "type_b": ..., "size_b": ..., "c2c": "14-3/8",
+#    "g1_a": false, "g1_b": false, "shave": true}
+#   {"op": "lay_in", ..., "type_lay_in": ..., "size_lay_in": ..., "c2c_overall": ..., "c2c_lay_in": ...}
+#   {"op": "bushing", ..., "size_bushing": ..., "c2c": ...}
+#   {"op": "offset", "type": ..., "size": ..., "g1": false}
+#   {"op": "catalogue"}                    -> "types": {type: [sizes]}
+#   {"op": "ping"}
+# Replies are {"ok": true, "cuts": [inches], "text": [formatted], "unit": ..., "catalogue_version": n}
+# or {"ok": false, "error": message}.
+
+
+def _length(value) -> float:
+    # Numbers as given; decimal strings ('14.375', '1e2') as floats, which round exactly like
+    # the Fraction would; fractions such as '14-3/8' through parse_length
+    try:
+        length = float(value) if not isinstance(value, bool) else float(parse_length(value))
+    except OverflowError:
+        length = math.inf
+    except (TypeError, ValueError):
+        length = float(parse_length(value))
+    if not math.isfinite(length):
+        raise ValueError(f"Length must be a finite number, got {value!r}")
+    return length
+
+
+def _cuts(loader, request: dict) -> list:
+    op = request.get("op", "standard")
+    if op == "standard":
+        _, cut = get_cut_length(loader, request["type_a"], request["size_a"], request["type_b"], request["size_b"],
+                                _length(request["c2c"]), bool(request.get("g1_a")), bool(request.get("g1_b")))
+        return [cut]
+    if op == "lay_in":
+        _, cuts = get_lay_in_cuts(loader, request["type_a"], request["size_a"],
+                                  request["type_lay_in"], request["size_lay_in"], request["type_b"], request["size_b"],
+                                  _length(request["c2c_overall"]), _length(request["c2c_lay_in"]))
+        return list(cuts)
+    if op == "bushing":
+        _, cut = get_bushing_cut(loader, request["type_a"], request["size_a"],
+                                 request.get("type_bushing", BUSHING_TYPE), request["size_bushing"],
+                                 request["type_b"], request["size_b"], _length(request["c2c"]))
+        return [cut]
+    raise ValueError(f"Unknown op: {op!r}. Use standard, lay_in, bushing, offset, catalogue or ping")
+
+
+def handle_request(loader, request: dict) -> dict:
+    """
+    Answer one calculation request against a loader.
+
+    Used by the daemon for every socket request and by the client when no daemon is running,
+    so both give the same replies. Lengths are computed and formatted exactly like the app:
+    the same api functions, the shave taken off afterwards, the configured length formatter.
+
+    Args:
+        loader: DimensionLoader (or anything with the same lookups)
+        request: Request dict (see the protocol comment at the top of this module)
+
+    Returns:
+        dict: Reply with "ok" True and the results, or "ok" False and an "error" message
+    """
+    try:
+        op = request.get("op", "standard")
+        reply = {"ok": True, "catalogue_version": loader.catalogue_version}
+        if op == "ping":
+            reply["pid"] = os.getpid()
+            return reply
+        if op == "catalogue":
+            reply["types"] = {conn_type: list(sizes) for conn_type, sizes in loader.offset_index.items()}
+            return reply
+        if op == "offset":
+            reply["offset"] = resolve_offset(loader, request["type"], request["size"], bool(request.get("g1")))
+            return reply
+        cuts = _cuts(loader, request)
+        if request.get("shave"):
+            cuts = [cut - SHAVE_INCHES for cut in cuts]
+        reply.update(cuts=cuts, text=[DEFAULT_FORMATTER.format(cut) for cut in cuts], unit=DEFAULT_FORMATTER.unit)
+        return reply
+    except KeyError as e:
+        return {"ok": False, "error": f"Missing field {e.args[0]!r} in request"}
+    except (ValueError, TypeError, AttributeError, ArithmeticError) as e:
+        return {"ok": False, "error": str(e)}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # One connection can carry any number of requests, answered in order
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                reply = {"ok": False, "error": f"Bad JSON: {e}"}
+            else:
+                if isinstance(request, dict):
+                    reply = handle_request(self.server.watcher.current(), request)
+                else:
+                    reply = {"ok": False, "error": "Request must be a JSON object"}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class CalculationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Answers calculation requests over a Unix domain socket from a warm catalogue.
+
+    The catalogue is loaded once (from the offset table when it is current) and kept in sync
+    with the workbook and journal by a CatalogueWatcher, so each request is only a lookup and
+    a subtraction. Each connection gets its own thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, watcher: CatalogueWatcher):
+        self.watcher = watcher
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        # Only this user may connect
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str):
+    # A socket file left by a daemon that died is removed; a live daemon is an error
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise ValueError(f"A calculation daemon is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+
+def serve(socket_path: str = DAEMON_SOCKET_PATH):
+    """Run the calculation daemon until interrupted."""
+    socket_path = os.path.abspath(socket_path)
+    watcher = CatalogueWatcher(EXCEL_PATH, journal_path=JOURNAL_PATH, table_path=OFFSET_TABLE_PATH).start()
+    # Exit cleanly on SIGTERM too, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with CalculationServer(socket_path, watcher) as server:
+        print(f"Calculation daemon listening on {socket_path} (catalogue v{watcher.version})", flush=True)
+        try:
+            server.serve_forever()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+        finally:
+            watcher.stop()
+
+
+if __name__ == "__main__":
+    # python -m src.daemon [socket path]
+    try:
+        serve(sys.argv[1] if len(sys.argv) > 1 else DAEMON_SOCKET_PATH)
+    except (ValueError, OSError) as e:
+        sys.exit(f"Calculation daemon not started: {e}")
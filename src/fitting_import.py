@@ -0,0 +1,213 @@
+import io
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from .catalogue import OffsetEntry
+from .catalogue_journal import ADD_SIZE, ADD_TYPE, UPDATE_OFFSET
+from .lengths import to_units
+from .search import normalize_size_query
+from .validation import OUTLIER_RATIO, SIZE_PATTERN, normalize_size_column, parse_offset_column
+
+# Accepted header spellings (lowercased) for each import column
+COLUMN_ALIASES = {
+    'part': {"part", "type", "connector type", "fitting", "part name"},
+    'size': {"size", "size (inches)", "size(inches)", "size_inches"},
+    'offset': {"offset", "offset (inches)"},
+    'g1_offset': {"offset (g1)", "g1 offset", "g1", "offset g1"},
+}
+REQUIRED_COLUMNS = ['part', 'size', 'offset']
+
+# What an import row does to the catalogue
+NEW_TYPE = "new type"
+NEW_SIZE = "new size"
+UPDATE = "update"
+UNCHANGED = "unchanged"
+
+PLAN_COLUMNS = ["row", "part", "size", "offset", "g1_offset", "action", "previous_offset", "previous_g1", "warning"]
+ERROR_COLUMNS = ["row", "part", "size", "message"]
+
+
+def read_fitting_import(data, filename: str) -> pd.DataFrame:
+    """
+    Read a fitting import (CSV or XLSX of Part/Size/Offset/Offset (G1) rows) with canonical
+    column names ('part', 'size', 'offset', 'g1_offset'); every cell is text.
+    Raises ValueError for unsupported files or missing required columns.
+    """
+    suffix = Path(filename).suffix.lower()
+    raw = data.getvalue() if hasattr(data, 'getvalue') else data
+    if suffix == ".csv":
+        df = pd.read_csv(io.BytesIO(raw), dtype=str, keep_default_na=False)
+    elif suffix in (".xlsx", ".xls"):
+        df = pd.read_excel(io.BytesIO(raw), dtype=str).fillna("")
+    else:
+        raise ValueError(f"Unsupported fitting import file '{filename}'. Use .csv or .xlsx")
+
+    renames = {}
+    for col in df.columns:
+        key = " ".join(str(col).split()).lower()
+        for canonical, aliases in COLUMN_ALIASES.items():
+            if key in aliases or key == canonical:
+                renames[col] = canonical
+    df = df.rename(columns=renames)
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Fitting import is missing columns: {missing}. Found: {list(df.columns)}")
+    if 'g1_offset' not in df.columns:
+        df['g1_offset'] = ""
+    return df[list(COLUMN_ALIASES)]
+
+
+class FittingImport:
+    """
+    A validated fitting import diffed against a catalogue snapshot.
+
+    rows: one row per valid import row (PLAN_COLUMNS), with its action: NEW_TYPE, NEW_SIZE,
+    UPDATE (offset or G1 differs) or UNCHANGED. errors: rows that can't be imported and why.
+    Nothing is written until the plan is applied; journal_edits() and snapshot_changes()
+    describe the whole import as one journal write and one catalogue version.
+    """
+
+    def __init__(self, rows: pd.DataFrame, errors: pd.DataFrame):
+        self.rows = rows
+        self.errors = errors
+
+    @property
+    def changes(self) -> pd.DataFrame:
+        """Rows that change the catalogue."""
+        return self.rows[self.rows['action'] != UNCHANGED]
+
+    def summary(self) -> dict:
+        """Number of rows per action, plus 'errors'."""
+        counts = self.rows['action'].value_counts()
+        summary = {action: int(counts.get(action, 0)) for action in (NEW_TYPE, NEW_SIZE, UPDATE, UNCHANGED)}
+        summary['errors'] = len(self.errors)
+        return summary
+
+    def journal_edits(self) -> list:
+        """
+        Edits for CatalogueJournal.append_many: per connector type, one add_type (new types),
+        one add_size (new sizes) and one update_offset (changed sizes, with the previous values).
+        """
+        edits = []
+        op_for = {NEW_TYPE: ADD_TYPE, NEW_SIZE: ADD_SIZE, UPDATE: UPDATE_OFFSET}
+        changes = self.changes
+        for (conn_type, action), group in changes.groupby(['part', 'action'], sort=False):
+            edit = {"op": op_for[action], "type": conn_type, "sizes": _size_dicts(group, 'offset', 'g1_offset')}
+            if action == UPDATE:
+                edit["previous"] = _size_dicts(group, 'previous_offset', 'previous_g1')
+            edits.append(edit)
+        return edits
+
+    def snapshot_changes(self) -> dict:
+        """{conn_type: {size: OffsetEntry}} for CatalogueWatcher.publish_changes."""
+        changes = {}
+        for conn_type, size, offset, g1_offset in zip(self.changes['part'], self.changes['size'],
+                                                      self.changes['offset'], self.changes['g1_offset']):
+            g1_offset = None if pd.isna(g1_offset) else float(g1_offset)
+            changes.setdefault(conn_type, {})[size] = OffsetEntry(
+                float(offset), g1_offset, to_units(float(offset)), None if g1_offset is None else to_units(g1_offset), None)
+        return changes
+
+    def sizes_by_type(self, actions=(NEW_TYPE, NEW_SIZE)) -> dict:
+        """{conn_type: [size, ...]} of the rows with these actions, in import order."""
+        rows = self.rows[self.rows['action'].isin(actions)]
+        return {conn_type: list(group['size']) for conn_type, group in rows.groupby('part', sort=False)}
+
+
+def _size_dicts(group: pd.DataFrame, offset_col: str, g1_col: str) -> list:
+    return [{'size': size, 'offset': None if pd.isna(offset) else float(offset),
+             'g1_offset': None if pd.isna(g1_offset) else float(g1_offset)}
+            for size, offset, g1_offset in zip(group['size'], group[offset_col], group[g1_col])]
+
+
+def plan_fitting_import(df: pd.DataFrame, snapshot) -> FittingImport:
+    """
+    Validate and normalize an import in whole-column steps and diff it against a snapshot.
+
+    Sizes are normalized like the loader's ('2.0' -> '2', '2X2X1' -> '2x2x1', '1-1/2' -> '1.5'); offsets may be
+    decimals or fractions ('15/32'). A G1 offset of 0 means none; a blank G1 offset (or no G1
+    column) keeps the size's current G1 offset, and means none for new sizes. Rows with a
+    missing part or size, a malformed size, a missing, unparseable, non-finite or non-positive
+    offset, a bad G1 offset, or the same part and size as another import row are errors. Offsets
+    larger than the nominal size suggests are imported with a warning.
+
+    Args:
+        df: Import rows from read_fitting_import
+        snapshot: CatalogueSnapshot to diff against
+
+    Returns:
+        FittingImport: the plan (not applied)
+    """
+    df = df.reset_index(drop=True)
+    part = df['part'].astype(str).str.strip()
+    # Fractional sizes ('1-1/2', '3/4') become the catalogue's decimal form first
+    size = normalize_size_column(df['size'].astype(str).map(normalize_size_query))
+    offset, bad_offset = parse_offset_column(df['offset'].astype(str).str.strip())
+    g1_text = df['g1_offset'].astype(str).str.strip()
+    g1, bad_g1 = parse_offset_column(g1_text)
+    g1 = g1.where(g1 != 0)
+
+    row_errors = pd.Series("", index=df.index)
+
+    def add_error(mask, message):
+        mask = mask & (row_errors == "")
+        row_errors[mask] = message
+
+    blank = (part == "") & (size == "") & (df['offset'].astype(str).str.strip() == "")
+    add_error(~blank & (part == ""), "Missing part")
+    add_error(~blank & (size == ""), "Missing size")
+    add_error((size != "") & ~size.str.match(SIZE_PATTERN), "Size does not look like '2', '1.5' or '2x2x1'")
+    add_error(bad_offset, "Offset is not a number or fraction")
+    add_error(~blank & offset.isna(), "Missing offset")
+    add_error(offset.notna() & ~np.isfinite(offset), "Offset must be a finite number")
+    add_error(offset <= 0, "Offset must be greater than zero")
+    add_error(bad_g1, "Offset (G1) is not a number or fraction")
+    add_error(g1.notna() & ~np.isfinite(g1), "Offset (G1) must be a finite number")
+    add_error(g1 < 0, "Offset (G1) must not be negative")
+    keys = pd.Series(list(zip(part, size)), index=df.index)
+    add_error(~blank & keys.duplicated(keep=False), "Same part and size appear more than once in the import")
+
+    valid = ~blank & (row_errors == "")
+    error_rows = ~blank & ~valid
+    errors = pd.DataFrame({"row": df.index[error_rows] + 2, "part": part[error_rows].values,
+                           "size": size[error_rows].values, "message": row_errors[error_rows].values},
+                          columns=ERROR_COLUMNS)
+
+    rows = pd.DataFrame({"row": df.index[valid] + 2, "part": part[valid].values, "size": size[valid].values,
+                         "offset": offset[valid].values.astype(float), "g1_offset": g1[valid].values.astype(float),
+                         "g1_given": (g1_text[valid] != "").values})
+
+    # Current entries of the touched types, joined on (part, size)
+    current = pd.DataFrame(
+        [(conn_type, s, entry.offset, entry.g1_offset)
+         for conn_type in rows['part'].unique() for s, entry in snapshot.offsets.get(conn_type, {}).items()],
+        columns=["part", "size", "previous_offset", "previous_g1"])
+    current['exists'] = True
+    rows = rows.merge(current, on=["part", "size"], how="left")
+    rows[['previous_offset', 'previous_g1']] = rows[['previous_offset', 'previous_g1']].astype(float)
+    exists = rows['exists'].eq(True)
+    # A blank G1 cell (or no G1 column) keeps the current G1 offset; only an explicit 0 clears it
+    rows['g1_offset'] = rows['g1_offset'].where(rows['g1_given'], rows['previous_g1'])
+    known_type = rows['part'].isin(list(snapshot.offsets))
+    same_offset = rows['offset'] == rows['previous_offset']
+    same_g1 = (rows['g1_offset'] == rows['previous_g1']) | (rows['g1_offset'].isna() & rows['previous_g1'].isna())
+    rows['action'] = np.select([~known_type, ~exists, same_offset & same_g1], [NEW_TYPE, NEW_SIZE, UNCHANGED], UPDATE)
+
+    dimensions = rows['size'].str.split("x", expand=True).apply(pd.to_numeric, errors="coerce")
+    largest = dimensions.max(axis=1)
+    rows['warning'] = np.where(np.fmax(rows['offset'], rows['g1_offset']) > largest * OUTLIER_RATIO,
+                               f"Offset is more than {OUTLIER_RATIO}x the largest nominal size", "")
+    return FittingImport(rows[PLAN_COLUMNS], errors)
+
+
+def apply_fitting_import(plan: FittingImport, journal, watcher=None, user: str = None) -> list:
+    """
+    Apply a plan: every change in one journal write and, with a watcher, one new catalogue
+    version for all sessions. Unchanged rows are skipped. `journal` is a CatalogueJournal, or a
+    CatalogueWriter to queue the write. Returns the journal entries written (or queued).
+    """
+    entries = journal.append_many(plan.journal_edits(), user=user)
+    if watcher is not None and entries:
+        watcher.publish_changes(plan.snapshot_changes(), f"Imported {len(plan.changes)} fittings")
+    return entries
@@ -0,0 +1,192 @@
+from fractions import Fraction
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from .config import LENGTH_GRID, LENGTH_ROUNDING
+from .lengths import UNITS_PER_INCH
+
+# Display grids: inch fractions with these denominators, or millimetres to 0.1 mm
+INCH_GRIDS = (8, 16, 32, 64)
+MM = "mm"
+
+# Rounding policies for lengths between two grid steps
+TRUNCATE = "truncate"   # toward zero (what the app has always done)
+NEAREST = "nearest"     # halves round up
+FLOOR = "floor"
+CEILING = "ceiling"
+ROUNDING_POLICIES = (TRUNCATE, NEAREST, FLOOR, CEILING)
+
+# Tenths of a millimetre per inch
+_MM_TENTHS_PER_INCH = 254
+
+# Float lengths off the 1/64 grid are read as the closest fraction with this denominator or
+# less, as the app always has. n/1000 is always a candidate, so that moves a value by at most
+# 1/2000"; the vectorized path hands values within 1/1000" of a rounding boundary to the
+# exact scalar path. Lengths on the 1/64 grid are exact and use integer math only.
+_MAX_DENOMINATOR = 1000
+_BOUNDARY_MARGIN = 1 / _MAX_DENOMINATOR
+
+# Reduced fraction strings for every step of every inch grid: _FRACTIONS[16][10] == "5/8"
+_FRACTIONS = {grid: [""] + [str(Fraction(n, grid)) for n in range(1, grid)] for grid in INCH_GRIDS}
+
+
+def _round_ratio(numerator: int, denominator: int, rounding: str) -> int:
+    # numerator / denominator (denominator > 0) rounded to an integer, integer math only
+    if rounding == TRUNCATE:
+        return numerator // denominator if numerator >= 0 else -(-numerator // denominator)
+    if rounding == FLOOR:
+        return numerator // denominator
+    if rounding == CEILING:
+        return -(-numerator // denominator)
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def _round(value: Fraction, rounding: str) -> int:
+    if rounding == TRUNCATE:
+        return int(value)
+    if rounding == FLOOR:
+        return value.__floor__()
+    if rounding == CEILING:
+        return value.__ceil__()
+    return (value + Fraction(1, 2)).__floor__()
+
+
+def _round_array(scaled: np.ndarray, rounding: str) -> np.ndarray:
+    if rounding == TRUNCATE:
+        return np.trunc(scaled)
+    if rounding == FLOOR:
+        return np.floor(scaled)
+    if rounding == CEILING:
+        return np.ceil(scaled)
+    return np.floor(scaled + 0.5)
+
+
+class LengthFormatter:
+    """
+    Formats cut lengths on an inch grid (1/8 .. 1/64) or in millimetres.
+
+    Lengths are rounded to whole grid steps with the rounding policy, then rendered from
+    precomputed tables of reduced fraction strings, so no Fraction or gcd work is done per
+    value. format_many formats a whole column at once: steps are computed with numpy and
+    each distinct length is rendered once.
+
+    With grid=16 and rounding=TRUNCATE the output is the app's original 1/16" text: the
+    length read as the closest fraction with denominator up to 1000, truncated to 16ths.
+    """
+
+    def __init__(self, grid=16, rounding: str = TRUNCATE):
+        if grid != MM and grid not in INCH_GRIDS:
+            raise ValueError(f"Unsupported length grid: {grid!r}. Use one of {list(INCH_GRIDS)} or '{MM}'")
+        if rounding not in ROUNDING_POLICIES:
+            raise ValueError(f"Unsupported rounding policy: {rounding!r}. Use one of {list(ROUNDING_POLICIES)}")
+        self.grid = grid
+        self.rounding = rounding
+        # Grid steps per inch
+        self.scale = _MM_TENTHS_PER_INCH if grid == MM else grid
+        self._steps = lru_cache(maxsize=4096)(self._steps_exact)
+
+    @property
+    def label(self) -> str:
+        """Short name of the grid for headings, e.g. '1/16ths' or 'mm'."""
+        return MM if self.grid == MM else f"1/{self.grid}ths"
+
+    @property
+    def unit(self) -> str:
+        """Unit to print after a formatted length."""
+        return MM if self.grid == MM else "inches"
+
+    def _steps_exact(self, value: float) -> int:
+        # Grid steps for a float length. Multiplying by 64 is exact, so a whole result means
+        # the length is on the 1/64 grid (every calculated cut is) and integer math suffices
+        units = value * UNITS_PER_INCH
+        if units.is_integer():
+            return self.units_to_steps(int(units))
+        return _round(Fraction(value).limit_denominator(_MAX_DENOMINATOR) * self.scale, self.rounding)
+
+    def units_to_steps(self, units: int) -> int:
+        """Grid steps for an exact length in 1/64ths (integer math only)."""
+        return _round_ratio(units * self.scale, UNITS_PER_INCH, self.rounding)
+
+    def render(self, steps: int) -> str:
+        """Text for a whole number of grid steps."""
+        if self.grid == MM:
+            sign = "-" if steps < 0 else ""
+            whole, tenths = divmod(abs(steps), 10)
+            return f"{sign}{whole}.{tenths}"
+        whole, remainder = divmod(steps, self.grid)
+        if remainder == 0:
+            return str(whole)
+        return f"{whole} {_FRACTIONS[self.grid][remainder]}"
+
+    def format(self, value: float) -> str:
+        """
+        Format one length in inches.
+        Example (1/16ths, truncate): 2.3125 returns "2 5/16"; 2.5 returns "2 1/2"
+        """
+        return self.render(self._steps(float(value)))
+
+    def format_units(self, units: int) -> str:
+        """Format one length given in 1/64ths."""
+        return self.render(self.units_to_steps(int(units)))
+
+    def steps_many(self, values) -> np.ndarray:
+        """Grid steps for an array of lengths in inches (int64; non-finite values give 0)."""
+        values = np.asarray(values, dtype=float)
+        finite = np.isfinite(values)
+        scaled = np.where(finite, values, 0.0) * self.scale
+        steps = _round_array(scaled, self.rounding)
+        # Values close to a rounding boundary (but not on it) take the exact path
+        per_step = 2 if self.rounding == NEAREST else 1
+        boundaries = scaled * per_step
+        distance = np.abs(boundaries - np.round(boundaries))
+        near = distance < _BOUNDARY_MARGIN * self.scale * per_step
+        if self.grid != MM:
+            # Multiplying by a power of two is exact, so values on the grid need no check
+            near &= distance > 0
+        near &= finite
+        if near.any():
+            steps[near] = [self._steps(v) for v in values[near].tolist()]
+        return steps.astype(np.int64)
+
+    def format_steps_many(self, steps) -> np.ndarray:
+        """Render an array of grid steps; each distinct value is rendered once."""
+        codes, uniques = pd.factorize(np.asarray(steps, dtype=np.int64))
+        rendered = np.array([self.render(s) for s in uniques.tolist()] + [""], dtype=object)
+        return rendered[codes]
+
+    def format_many(self, values) -> np.ndarray:
+        """
+        Format an array of lengths in inches; returns an object array of strings.
+        NaN and infinite values format as "".
+        """
+        values = np.asarray(values, dtype=float)
+        text = self.format_steps_many(self.steps_many(values))
+        text[~np.isfinite(values)] = ""
+        return text
+
+    def format_units_many(self, units) -> np.ndarray:
+        """Format an array of lengths in 1/64ths."""
+        scaled = np.asarray(units, dtype=np.int64) * self.scale
+        if self.rounding == TRUNCATE:
+            steps = np.where(scaled >= 0, scaled // UNITS_PER_INCH, -(-scaled // UNITS_PER_INCH))
+        elif self.rounding == FLOOR:
+            steps = scaled // UNITS_PER_INCH
+        elif self.rounding == CEILING:
+            steps = -(-scaled // UNITS_PER_INCH)
+        else:
+            steps = (2 * scaled + UNITS_PER_INCH) // (2 * UNITS_PER_INCH)
+        return self.format_steps_many(steps)
+
+
+# Formatter for the configured grid and rounding policy, used for every displayed length
+DEFAULT_FORMATTER = LengthFormatter(LENGTH_GRID, LENGTH_ROUNDING)
+
+
+def format_length(value: float) -> str:
+    """Format a length in inches with the configured grid and rounding."""
+    return DEFAULT_FORMATTER.format(value)
+
+
+def format_length_units(units: int) -> str:
+    """Format a length in 1/64ths with the configured grid and rounding."""
+    return DEFAULT_FORMATTER.format_units(units)
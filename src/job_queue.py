@@ -0,0 +1,160 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .api import get_cut_length, get_bushing_cut
+from .formatting import format_length
+from .lengths import SHAVE_INCHES
+
+BUSHING_TYPE = "Bushing (Spigot x Socket)"
+
+# Progress is published to the page after every chunk of this many cuts
+CHUNK_SIZE = 100
+
+
+def compute_cut_data(loader, spec: dict) -> dict:
+    """
+    Compute one cut from a cut spec and return it in the Jobs tab cut dict format (without 'number').
+    The dict records the catalogue version the offsets came from.
+
+    Spec keys: 'type' ('Standard' or 'Bushing'), 'type_a', 'size_a', 'type_b', 'size_b', 'c2c',
+    optional 'size_bushing' (Bushing), 'use_g1_a', 'use_g1_b', 'shave' and 'notes'.
+    Raises ValueError for unknown fittings or bad values.
+    """
+    cut_type = spec.get('type', 'Standard')
+    type_a, size_a = spec['type_a'], str(spec['size_a'])
+    type_b, size_b = spec['type_b'], str(spec['size_b'])
+    c2c = float(spec['c2c'])
+    shave = bool(spec.get('shave', False))
+
+    if cut_type == 'Standard':
+        _, cut_length = get_cut_length(loader, type_a, size_a, type_b, size_b, c2c,
+                                       use_g1_for_type_a=bool(spec.get('use_g1_a', False)),
+                                       use_g1_for_type_b=bool(spec.get('use_g1_b', False)))
+    elif cut_type == 'Bushing':
+        size_bushing = str(spec['size_bushing'])
+        _, cut_length = get_bushing_cut(loader, type_a, size_a, BUSHING_TYPE, size_bushing, type_b, size_b, c2c)
+    else:
+        raise ValueError(f"Unsupported cut type '{cut_type}'")
+
+    if shave:
+        cut_length -= SHAVE_INCHES
+
+    cut_data = {
+        'type': cut_type,
+        'connection_a': f"{type_a} ({size_a}\")",
+        'connection_b': f"{type_b} ({size_b}\")",
+        'c2c': c2c,
+        'length_decimal': cut_length,
+        'length_fraction': format_length(cut_length),
+        'shave': shave,
+        'notes': spec.get('notes', '') or '',
+        'catalogue_version': loader.catalogue_version,
+    }
+    if cut_type == 'Bushing':
+        cut_data['connection_bushing'] = f"Bushing ({size_bushing}\")"
+    return cut_data
+
+
+class BulkCutJob:
+    """
+    Progress and partial results of one bulk cut-list submission.
+    Written by a worker thread, read by page reruns; all access goes through the lock.
+    """
+
+    def __init__(self, job_id: int, job_name: str, specs: list):
+        self.job_id = job_id
+        self.job_name = job_name
+        self.specs = specs
+        self.total = len(specs)
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._results = []      # (row index, cut dict)
+        self._errors = []       # (row index, message)
+        self._taken = 0         # results already handed to the page
+
+    def _publish(self, results: list, errors: list):
+        with self._lock:
+            self._results.extend(results)
+            self._errors.extend(errors)
+
+    def _set_status(self, status: str):
+        with self._lock:
+            self.status = status
+            if status in ("done", "failed"):
+                self.finished_at = time.time()
+
+    def progress(self) -> dict:
+        """Snapshot of counts and status for display."""
+        with self._lock:
+            done = len(self._results) + len(self._errors)
+            return {
+                'status': self.status,
+                'done': done,
+                'total': self.total,
+                'fraction': done / self.total if self.total else 1.0,
+                'computed': len(self._results),
+                'errors': list(self._errors),
+            }
+
+    def take_results(self) -> list:
+        """Return cut dicts computed since the last call, in submission order within each chunk."""
+        with self._lock:
+            new = self._results[self._taken:]
+            self._taken = len(self._results)
+        return [cut for _, cut in new]
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return self.status in ("done", "failed")
+
+
+class CutJobQueue:
+    """
+    Thread pool shared by all sessions that computes bulk cut lists in the background.
+    Jobs keep running across reruns and tab switches; pages poll BulkCutJob.progress().
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cut-jobs")
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, loader, job_name: str, specs: list) -> BulkCutJob:
+        """Queue a list of cut specs (see compute_cut_data) for the named job."""
+        job = BulkCutJob(next(self._ids), job_name, list(specs))
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, loader, job)
+        return job
+
+    def get(self, job_id: int):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def forget(self, job_id: int):
+        """Drop a finished job once its results have been collected."""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _run(self, loader, job: BulkCutJob):
+        job._set_status("running")
+        try:
+            for start in range(0, job.total, CHUNK_SIZE):
+                results, errors = [], []
+                for row in range(start, min(start + CHUNK_SIZE, job.total)):
+                    try:
+                        results.append((row, compute_cut_data(loader, job.specs[row])))
+                    except KeyError as e:
+                        errors.append((row, f"Missing value {e}"))
+                    except (ValueError, TypeError) as e:
+                        errors.append((row, str(e)))
+                job._publish(results, errors)
+        except Exception:
+            job._set_status("failed")
+            raise
+        job._set_status("done")
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+# Columns of a Jobs tab cut ('number' is assigned by the job)
+CUT_COLUMNS = ['number', 'type', 'connection_a', 'connection_bushing', 'connection_b', 'c2c',
+               'length_decimal', 'length_fraction', 'shave', 'notes', 'catalogue_version']
+
+# Deleted rows are compacted away once there are at least this many and more than live rows
+COMPACT_MIN_DELETED = 64
+
+
+class CutJob:
+    """
+    The cuts of one job, stored column-wise.
+
+    Each cut gets a number when it is added that is never reused, so it is a stable id for
+    widget keys, labels and barcodes. Deleting a cut only marks its row (a dict lookup and a
+    flag); the marked rows are dropped in one pass once they outnumber the live ones, or on
+    compact(). Totals and exports read whole columns of the live rows.
+    """
+
+    def __init__(self, created_at: str = ''):
+        self.created_at = created_at
+        self.columns = {col: [] for col in CUT_COLUMNS}
+        self._deleted = bytearray()  # 1 for a deleted row, parallel to the columns
+        self._positions = {}         # cut number -> row
+        self._next_number = 1
+        self._live = 0
+
+    def __len__(self):
+        return self._live
+
+    def __bool__(self):
+        return self._live > 0
+
+    def add(self, cut: dict) -> int:
+        """Add one cut dict (see compute_cut_data) and return its number."""
+        return self.extend([cut])[0]
+
+    def extend(self, cuts: list) -> list:
+        """Add cut dicts in order and return their numbers."""
+        numbers = list(range(self._next_number, self._next_number + len(cuts)))
+        start = len(self._deleted)
+        for col, values in self.columns.items():
+            if col == 'number':
+                values.extend(numbers)
+            else:
+                values.extend(cut.get(col) for cut in cuts)
+        self._deleted.extend(bytes(len(cuts)))
+        self._positions.update(zip(numbers, range(start, start + len(cuts))))
+        self._next_number += len(cuts)
+        self._live += len(cuts)
+        return numbers
+
+    def delete(self, number: int) -> bool:
+        """Delete a cut by number. Returns False if there is no such cut."""
+        row = self._positions.pop(number, None)
+        if row is None:
+            return False
+        self._deleted[row] = 1
+        self._live -= 1
+        deleted = len(self._deleted) - self._live
+        if deleted >= COMPACT_MIN_DELETED and deleted > self._live:
+            self.compact()
+        return True
+
+    def compact(self):
+        """Drop deleted rows from the columns (cut numbers are kept)."""
+        if self._live == len(self._deleted):
+            return
+        keep = np.flatnonzero(np.frombuffer(bytes(self._deleted), dtype=np.uint8) == 0)
+        for col, values in self.columns.items():
+            self.columns[col] = [values[row] for row in keep]
+        self._deleted = bytearray(len(keep))
+        self._positions = dict(zip(self.columns['number'], range(len(keep))))
+
+    def _live_rows(self) -> np.ndarray:
+        return np.flatnonzero(np.frombuffer(bytes(self._deleted), dtype=np.uint8) == 0)
+
+    def cut(self, number: int) -> dict:
+        """One cut as a dict, or None."""
+        row = self._positions.get(number)
+        return None if row is None else {col: values[row] for col, values in self.columns.items()}
+
+    def cuts(self, start: int = 0, stop: int = None):
+        """Yield live cuts as dicts in the order they were added, from the start-th to before the stop-th."""
+        rows = self._live_rows()[start:stop]
+        columns = list(self.columns.items())
+        for row in rows:
+            yield {col: values[row] for col, values in columns}
+
+    def __iter__(self):
+        return self.cuts()
+
+    def to_frame(self) -> pd.DataFrame:
+        """Live cuts as a DataFrame with CUT_COLUMNS."""
+        df = pd.DataFrame(self.columns, columns=CUT_COLUMNS)
+        if self._live != len(self._deleted):
+            df = df.iloc[self._live_rows()].reset_index(drop=True)
+        # Versions stay integers when some cuts have none
+        df['catalogue_version'] = pd.to_numeric(df['catalogue_version']).astype("Int64")
+        return df
+
+    def totals(self) -> dict:
+        """Number of cuts, total pipe length and C2C (inches), shaved cuts and cuts per type."""
+        rows = self._live_rows()
+        lengths = np.asarray(self.columns['length_decimal'], dtype=float)[rows]
+        c2c = np.asarray(self.columns['c2c'], dtype=float)[rows]
+        shave = np.asarray(self.columns['shave'], dtype=bool)[rows]
+        types, counts = np.unique(np.asarray(self.columns['type'], dtype=object)[rows].astype(str), return_counts=True)
+        return {
+            'cuts': int(len(rows)),
+            'total_length': float(lengths.sum()),
+            'total_c2c': float(c2c.sum()),
+            'shaved': int(shave.sum()),
+            'by_type': dict(zip(types.tolist(), counts.tolist())),
+        }
+
+    def checklist_text(self, job_name: str) -> str:
+        """The printable TXT checklist of the live cuts."""
+        text = f"PVC CUT CALCULATOR - JOB CHECKLIST\nJob: {job_name}\n{'=' * 60}\n\n"
+        df = self.to_frame()
+        if df.empty:
+            return text
+        bushing = df['connection_bushing'].fillna("").astype(str)
+        route = df['connection_a'] + np.where(bushing != "", " → " + bushing, "") + " → " + df['connection_b']
+        notes = df['notes'].fillna("").astype(str)
+        version = df['catalogue_version']
+        has_version = version.fillna(0) != 0
+        blocks = ("[ ] CUT " + df['number'].astype(str) + "\n"
+                  + "    Type: " + df['type'] + " Cut\n"
+                  + "    " + route + "\n"
+                  + "    C2C: " + df['c2c'].astype(float).astype(str) + "\"\n"
+                  + "    Length: " + df['length_fraction'] + " ("
+                  + df['length_decimal'].astype(float).map("{:.4f}".format) + "\")\n"
+                  + np.where(df['shave'].astype(bool), "    ✓ Shave applied\n", "")
+                  + np.where(notes != "", "    Note: " + notes + "\n", "")
+                  + np.where(has_version, "    Catalogue: v" + version.astype(str) + "\n", "")
+                  + "\n")
+        return text + "".join(blocks)
@@ -0,0 +1,78 @@
+from fractions import Fraction
+import math
+import re
+from .config import SHAVE
+
+# All fixed-point lengths are integer counts of 1/64 inch
+UNITS_PER_INCH = 64
+
+# Whole number, optional "-" or " " separator, then a fraction: "14-3/8", "14 3/8"
+_MIXED_NUMBER = re.compile(r"^\s*(-?)(\d+)[\s-]+(\d+)\s*/\s*(\d+)\s*$")
+
+
+def parse_length(value) -> Fraction:
+    """
+    Parse a length into an exact Fraction of inches.
+    Accepts ints, floats, Fractions and strings such as '15/32', '1.5' or '14-3/8'.
+    Raises ValueError if the value cannot be parsed.
+    """
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, (int, float)):
+        return Fraction(value)
+    text = str(value).strip()
+    match = _MIXED_NUMBER.match(text)
+    try:
+        if match:
+            sign, whole, num, denom = match.groups()
+            frac = int(whole) + Fraction(int(num), int(denom))
+            return -frac if sign else frac
+        return Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Cannot convert '{value}' to a length")
+
+
+def to_units(value) -> int:
+    """
+    Convert a length to integer 1/64ths, rounding to the nearest 1/64 (halves round up).
+    Example: to_units('15/32') returns 30; to_units(2.3125) returns 148
+    """
+    if isinstance(value, float):
+        # Multiplying by 64 and taking off the floor are exact in binary floating point,
+        # so this rounds exactly like the Fraction below without building one
+        scaled = value * UNITS_PER_INCH
+        whole = math.floor(scaled)
+        return whole + (scaled - whole >= 0.5)
+    if isinstance(value, int):
+        return value * UNITS_PER_INCH
+    scaled = parse_length(value) * UNITS_PER_INCH
+    return (scaled + Fraction(1, 2)).__floor__()
+
+
+# The configured shave in 1/64ths, in inches, and as text for labels ("1/16")
+SHAVE_UNITS = to_units(SHAVE)
+SHAVE_INCHES = SHAVE_UNITS / UNITS_PER_INCH
+SHAVE_TEXT = str(Fraction(SHAVE_UNITS, UNITS_PER_INCH))
+
+
+def units_to_inches(units: int) -> float:
+    """Convert 1/64ths back to decimal inches (exact in binary floating point)."""
+    return units / UNITS_PER_INCH
+
+
+def units_to_fraction_16ths(units: int) -> str:
+    """
+    Format 1/64ths as a whole number plus a reduced fraction of 16ths.
+    Same text as LengthFormatter(16, TRUNCATE).format, using only integer math.
+    Example: 148 returns "2 5/16"; 160 returns "2 1/2"
+    """
+    # Truncate toward zero to 16ths, like int() on the Fraction in the float path
+    sixteenths = units // 4 if units >= 0 else -(-units // 4)
+    whole, remainder = divmod(sixteenths, 16)
+    if remainder == 0:
+        return str(whole)
+    return f"{whole} {_SIXTEENTHS[remainder]}"
+
+
+# Reduced fraction strings for 1/16 .. 15/16
+_SIXTEENTHS = [""] + [str(Fraction(n, 16)) for n in range(1, 16)]
@@ -1,16 +1,83 @@
+import copy
 import pandas as pd
+from .catalogue import CatalogueSnapshot, OffsetEntry, normalize_size
+from .catalogue_journal import CatalogueJournal, replay
 from .config import OFFSET_COLUMN, SHEET_NAME, OFFSET_COLUMN_G1, SUPPORTED_CONNECTOR_TYPES
 from fractions import Fraction
+from .lengths import to_units
+from .offset_matrix import PairOffsetMatrix
+from .offset_table import MappedOffsetTable
+from .validation import ISSUE_COLUMNS, find_part_size_columns, get_validation_report
+
+def _offset_changes(old: CatalogueSnapshot, new: CatalogueSnapshot) -> dict:
+    # {(conn_type, size): (offset_units, g1_units)} for PairOffsetMatrix.update_many; (None, None)
+    # for removed sizes. Types a snapshot edit left alone share their mapping and are skipped.
+    changes = {}
+    for conn_type in old.offsets.keys() | new.offsets.keys():
+        old_sizes, new_sizes = old.offsets.get(conn_type, {}), new.offsets.get(conn_type, {})
+        if old_sizes is new_sizes:
+            continue
+        for size in old_sizes.keys() | new_sizes.keys():
+            entry, old_entry = new_sizes.get(size), old_sizes.get(size)
+            if entry is not old_entry and entry != old_entry:
+                changes[(conn_type, size)] = (None, None) if entry is None else (entry.offset_units, entry.g1_units)
+    return changes
+
 
 class DimensionLoader:
-    def __init__(self, excel_path: str, session_offsets: dict = None):
+    def __init__(self, excel_path: str, session_offsets: dict = None, previous_snapshot: CatalogueSnapshot = None,
+                 journal_path: str = None):
         # read only the Database sheet, ignore others
-        self.df = pd.read_excel(excel_path, sheet_name=SHEET_NAME)
+        self._load(pd.read_excel(excel_path, sheet_name=SHEET_NAME), excel_path, previous_snapshot, journal_path)
+        # Offsets entered this session, {(conn_type, size): OffsetEntry} (CatalogueOverlay.offsets)
+        self.session_offsets = session_offsets or {}
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, session_offsets: dict = None, previous_snapshot: CatalogueSnapshot = None):
+        """Loader for a Database sheet that is already in memory (no workbook file or journal)."""
+        loader = cls.__new__(cls)
+        loader._load(df.copy(), None, previous_snapshot, None)
+        loader.session_offsets = session_offsets or {}
+        return loader
+
+    @classmethod
+    def from_offset_table(cls, table: MappedOffsetTable, session_offsets: dict = None, excel_path: str = None,
+                          journal_path: str = None):
+        """
+        Loader that answers from a memory-mapped offset table without reading the workbook.
+        Lookups match a workbook loader and read the mapped file (the table stays open while
+        the loader uses it). The DataFrame stays empty; the validation report is built from
+        `excel_path` (and `journal_path`) the first time it is asked for.
+        """
+        loader = cls.__new__(cls)
+        loader.df = pd.DataFrame(columns=["Part", "Size", OFFSET_COLUMN, OFFSET_COLUMN_G1])
+        loader.part_col, loader.size_col = "Part", "Size"
+        loader.connector_types = list(SUPPORTED_CONNECTOR_TYPES)
+        loader.connector_types += [t for t in table.connector_types if t not in loader.connector_types]
+        loader.connector_map = {conn_type: [] for conn_type in loader.connector_types}
+        loader.snapshot = table.to_snapshot()
+        loader.pair_matrix = PairOffsetMatrix.from_units(table.units())
+        loader._validation = {"source": (excel_path, journal_path)}
+        loader.session_offsets = session_offsets or {}
+        return loader
+
+    def _load(self, df: pd.DataFrame, excel_path, previous_snapshot, journal_path):
+        self.df = df
         self._normalize_columns()
         self._validate_columns()
+        # Edits not yet compacted into the workbook are replayed on top of it
+        self.connector_types = list(SUPPORTED_CONNECTOR_TYPES)
+        if journal_path:
+            journal = CatalogueJournal(journal_path)
+            entries = journal.entries()
+            self.df = replay(self.df, entries, self.part_col, self.size_col)
+            self.connector_types += [t for t in journal.added_types() if t not in self.connector_types]
         self._load_connector_map()
-        # Store session offsets for newly added connectors (from session state)
-        self.session_offsets = session_offsets or {}
+        self._build_offset_index(previous_snapshot)
+        self.pair_matrix = PairOffsetMatrix.from_offset_index(self.offset_index)
+        # Whole-sheet lint results, computed once per workbook (and journal) version
+        self._validation = {"report": get_validation_report(excel_path, self.df, self.part_col, self.size_col,
+                                                            journal_path, self.connector_types)}
 
     def _normalize_columns(self):
         # Normalize column names: trim + collapse whitespace
@@ -18,21 +85,8 @@ class DimensionLoader:
 
     def _validate_columns(self):
         # We expect at least a Part (connection type) column and a Size column plus the offset columns
-        col_candidates = set(name.lower() for name in self.df.columns)
-        # Accept multiple possible names for the 'part' and 'size' columns
-        part_names = {"part", "part name", "part_type", "connection_type"}
-        size_names = {"size", "size (inches)", "size(inches)", "size_inches", "size (in.)", "size_in"}
-        found_part = next((c for c in self.df.columns if c.strip().lower() in part_names), None)
-        found_size = next((c for c in self.df.columns if c.strip().lower() in size_names), None)
-
-        if found_part is None or found_size is None:
-            raise ValueError(
-                "Database sheet must contain a 'Part' column and a 'Size' column (e.g. 'Size (inches)')."
-            )
-
         # store canonical column names for later use
-        self.part_col = found_part
-        self.size_col = found_size
+        self.part_col, self.size_col = find_part_size_columns(self.df.columns)
 
         # Validate that offset columns exist in the sheet
         if OFFSET_COLUMN not in self.df.columns:
@@ -43,34 +97,121 @@ class DimensionLoader:
         Build a mapping of exact connector type names to database rows.
         Creates a dict: {"Tee (SocketxSocketxSocket)": [row_data, ...], ...}
         """
+        # One pass over the sheet: group row positions by part once instead of scanning per type
+        parts = self.df[self.part_col].astype(str).str.strip()
+        positions = parts.groupby(parts, sort=False).indices
         self.connector_map = {}
-        for conn_type in SUPPORTED_CONNECTOR_TYPES:
-            matching_rows = []
-            for idx, row in self.df.iterrows():
-                part_val = str(row[self.part_col]).strip()
-                if part_val == conn_type:
-                    matching_rows.append(row)
-            self.connector_map[conn_type] = matching_rows
+        for conn_type in self.connector_types:
+            rows = self.df.iloc[positions[conn_type]] if conn_type in positions else self.df.iloc[:0]
+            self.connector_map[conn_type] = [row for _, row in rows.iterrows()]
 
-    def _normalize_size_value(self, val):
-        # Normalize size values to match user input.
-        # Can be numeric (1.5, 2, etc.) or text format (1.5x1.5x0.5, 2x2x1, etc.)
-        if pd.isna(val):
-            return ""
-        val_str = str(val).strip()
-        
-        # For text formats like "1.5x1.5x0.5", return as-is
-        if 'x' in val_str.lower():
-            return val_str.lower()
-        
-        # For numeric values, convert with no trailing .0 when integer-like
+    def _build_offset_index(self, previous_snapshot=None):
+        """
+        Parse every offset once into an immutable catalogue snapshot.
+        Creates {conn_type: {normalized_size: OffsetEntry}} with inches and 1/64ths.
+        Mirrors the row-scan rules of the original lookups: the offset comes from the
+        first size match with a value, the G1 offset from the first size match.
+        Types unchanged since `previous_snapshot` share its entries.
+        """
+        has_g1 = OFFSET_COLUMN_G1 in self.df.columns
+        offset_index = {}
+        for conn_type, rows in self.connector_map.items():
+            sizes = {}
+            for row in rows:
+                size = self._normalize_size_value(row[self.size_col])
+                entry = sizes.get(size)
+                if entry is not None and (entry.offset is not None or entry.invalid_offset is not None):
+                    continue
+                offset = invalid = None
+                raw = row.get(OFFSET_COLUMN)
+                try:
+                    offset = self._parse_offset_value(raw)
+                except ValueError:
+                    invalid = str(raw)
+                if entry is None:
+                    g1_offset = None
+                    if has_g1:
+                        try:
+                            g1_offset = self._parse_offset_value(row.get(OFFSET_COLUMN_G1))
+                        except ValueError:
+                            g1_offset = None
+                    g1_units = self._parse_offset_units(row.get(OFFSET_COLUMN_G1)) if g1_offset is not None else None
+                else:
+                    g1_offset, g1_units = entry.g1_offset, entry.g1_units
+                offset_units = self._parse_offset_units(raw) if offset is not None else None
+                sizes[size] = OffsetEntry(offset, g1_offset, offset_units, g1_units, invalid)
+            offset_index[conn_type] = sizes
+        self.snapshot = CatalogueSnapshot.build(offset_index, "workbook", previous_snapshot)
+
+    @property
+    def validation_report(self) -> pd.DataFrame:
+        """Whole-sheet lint results (see validation.validate_catalogue)."""
+        report = self._validation.get("report")
+        if report is None:
+            # Loader from an offset table: parse the workbook once, for it and its copies
+            excel_path, journal_path = self._validation["source"]
+            report = (pd.DataFrame(columns=ISSUE_COLUMNS) if excel_path is None
+                      else DimensionLoader(excel_path, journal_path=journal_path).validation_report)
+            self._validation["report"] = report
+        return report
+
+    @property
+    def offset_index(self):
+        """Read-only {conn_type: {normalized_size: OffsetEntry}} of the pinned snapshot."""
+        return self.snapshot.offsets
+
+    @property
+    def catalogue_version(self) -> int:
+        """Version of the catalogue snapshot this loader answers from."""
+        return self.snapshot.version
+
+    def with_snapshot(self, snapshot: CatalogueSnapshot):
+        """
+        Copy of this loader that answers from another snapshot (copy-on-write edits).
+        The workbook DataFrame and validation report are shared, not copied.
+        """
+        new_loader = copy.copy(self)
+        new_loader.snapshot = snapshot
+        # Patch a copy of the current matrix for the sizes that changed instead of rebuilding it
+        new_loader.pair_matrix = self.pair_matrix.copy()
+        new_loader.pair_matrix.update_many(_offset_changes(self.snapshot, snapshot))
+        return new_loader
+
+    def size_changes(self, sizes_list: list, remove: bool = False) -> dict:
+        """
+        Changes for CatalogueSnapshot.with_sizes from sizes entered in Manage Fittings.
+
+        Args:
+            sizes_list: {'size', 'offset', 'g1_offset'} dicts, or plain sizes when removing
+            remove: If True, map every size to None (delete)
+
+        Returns:
+            dict: {normalized_size: OffsetEntry or None}
+        """
+        if remove:
+            return {self._normalize_size_value(size): None for size in sizes_list}
+        changes = {}
+        for size_data in sizes_list:
+            offset = float(size_data['offset'])
+            g1_offset = size_data.get('g1_offset')
+            if not g1_offset or g1_offset <= 0:
+                g1_offset = None
+            changes[self._normalize_size_value(size_data['size'])] = OffsetEntry(
+                offset, g1_offset, to_units(offset), None if g1_offset is None else to_units(g1_offset), None)
+        return changes
+
+    def _parse_offset_units(self, val):
+        # Parse an offset cell into 1/64ths, or None when missing or invalid
         try:
-            v = float(val_str)
-            if v.is_integer():
-                return str(int(v))
-            return str(v)
+            offset = self._parse_offset_value(val)
         except ValueError:
-            return val_str.lower()
+            return None
+        if offset is None:
+            return None
+        return to_units(val if isinstance(val, str) else offset)
+
+    def _normalize_size_value(self, val):
+        return normalize_size(val)
 
     def _parse_offset_value(self, val):
         """
@@ -90,6 +231,20 @@ class DimensionLoader:
             except (ValueError, ZeroDivisionError):
                 raise ValueError(f"Cannot convert '{val}' to numeric offset")
 
+    def _sizes_for(self, conn_type: str):
+        # Entries for a type in the pinned snapshot; raises the same errors as the original row scan
+        if conn_type not in SUPPORTED_CONNECTOR_TYPES and conn_type not in self.snapshot.offsets:
+            raise ValueError(
+                f"Unsupported connector type: '{conn_type}'. "
+                f"Supported types: {SUPPORTED_CONNECTOR_TYPES}"
+            )
+        sizes = self.snapshot.offsets.get(conn_type)
+        if not sizes:
+            raise ValueError(
+                f"No database entries found for connector type '{conn_type}'"
+            )
+        return sizes
+
     def get_offset(self, conn_type: str, conn_size: str) -> float:
         """
         Find matching offset for an exact connector type and size.
@@ -104,56 +259,25 @@ class DimensionLoader:
         Raises:
             ValueError: If connector type is not supported or no matching size found
         """
-        # First, check session offsets for newly added connectors
-        offset_key = f"{conn_type}|{conn_size}"
-        if offset_key in self.session_offsets:
-            offset_data = self.session_offsets[offset_key]
-            if offset_data and 'offset' in offset_data:
-                return offset_data['offset']
-        
-        # Validate connector type exists in our supported list OR in connector_map
-        if conn_type not in SUPPORTED_CONNECTOR_TYPES and conn_type not in self.connector_map:
-            raise ValueError(
-                f"Unsupported connector type: '{conn_type}'. "
-                f"Supported types: {SUPPORTED_CONNECTOR_TYPES}"
-            )
-
-        # Get the offset column for this connection type
-        offset_col = OFFSET_COLUMN
-
-        # Normalize the size input for comparison
-        normalized_input_size = self._normalize_size_value(conn_size)
-
-        # Get rows that match this exact connector type
-        matching_rows = self.connector_map.get(conn_type, [])
-        if not matching_rows:
-            raise ValueError(
-                f"No database entries found for connector type '{conn_type}'"
-            )
+        # First, check offsets entered this session (CatalogueOverlay.offsets)
+        session_entry = self.session_offsets.get((conn_type, conn_size))
+        if session_entry is not None:
+            return session_entry.offset
 
-        # Find exact size match within the matching rows
-        for row in matching_rows:
-            size_val_raw = row[self.size_col]
-            normalized_db_size = self._normalize_size_value(size_val_raw)
-
-            if normalized_db_size == normalized_input_size:
-                offset = row.get(offset_col)
-                if pd.notna(offset):
-                    try:
-                        return self._parse_offset_value(offset)
-                    except ValueError:
-                        raise ValueError(
-                            f"Invalid offset value '{offset}' for {conn_type} Size={row[self.size_col]}"
-                        )
+        sizes = self._sizes_for(conn_type)
+        entry = sizes.get(self._normalize_size_value(conn_size))
+        if entry is not None:
+            if entry.offset is not None:
+                return entry.offset
+            if entry.invalid_offset is not None:
+                raise ValueError(
+                    f"Invalid offset value '{entry.invalid_offset}' for {conn_type} Size={conn_size}"
+                )
 
         # No exact size match found
-        available_sizes = [
-            self._normalize_size_value(row[self.size_col]) 
-            for row in matching_rows
-        ]
         raise ValueError(
             f"No matching size '{conn_size}' for connector '{conn_type}'. "
-            f"Available sizes: {available_sizes}"
+            f"Available sizes: {list(sizes)}"
         )
 
     def get_offset_g1(self, conn_type: str, conn_size: str) -> float:
@@ -170,47 +294,55 @@ class DimensionLoader:
         Raises:
             ValueError: If connector type is not supported or no matching size found
         """
-        # First, check session offsets for newly added connectors
-        offset_key = f"{conn_type}|{conn_size}"
-        if offset_key in self.session_offsets:
-            offset_data = self.session_offsets[offset_key]
-            if offset_data and 'g1_offset' in offset_data:
-                g1_value = offset_data['g1_offset']
-                if g1_value and g1_value > 0:
-                    return g1_value
-        
-        # Validate connector type exists in our supported list OR in connector_map
-        if conn_type not in SUPPORTED_CONNECTOR_TYPES and conn_type not in self.connector_map:
-            raise ValueError(
-                f"Unsupported connector type: '{conn_type}'. "
-                f"Supported types: {SUPPORTED_CONNECTOR_TYPES}"
-            )
+        # First, check offsets entered this session (CatalogueOverlay.offsets)
+        session_entry = self.session_offsets.get((conn_type, conn_size))
+        if session_entry is not None and session_entry.g1_offset is not None:
+            return session_entry.g1_offset
 
-        # Normalize the size input for comparison
-        normalized_input_size = self._normalize_size_value(conn_size)
+        entry = self._sizes_for(conn_type).get(self._normalize_size_value(conn_size))
+        return entry.g1_offset if entry is not None else None
 
-        # Get rows that match this exact connector type
-        matching_rows = self.connector_map.get(conn_type, [])
-        if not matching_rows:
-            raise ValueError(
-                f"No database entries found for connector type '{conn_type}'"
-            )
+    def get_offset_units(self, conn_type: str, conn_size: str, use_g1: bool = False) -> int:
+        """
+        Offset for an exact connector type and size in integer 1/64ths.
+        Uses the units parsed at load time; falls back to the float lookups for
+        session offsets and for anything the snapshot cannot answer, so errors match get_offset.
 
-        # Find exact size match within the matching rows
-        for row in matching_rows:
-            size_val_raw = row[self.size_col]
-            normalized_db_size = self._normalize_size_value(size_val_raw)
+        Args:
+            conn_type: Exact connector type from SUPPORTED_CONNECTOR_TYPES or session
+            conn_size: Numeric or text size to match exactly
+            use_g1: If True, return the G1 offset when one is available
 
-            if normalized_db_size == normalized_input_size:
-                # Try to get G1 offset column if it exists
-                if OFFSET_COLUMN_G1 in self.df.columns:
-                    g1_offset = row.get(OFFSET_COLUMN_G1)
-                    if pd.notna(g1_offset):
-                        try:
-                            return self._parse_offset_value(g1_offset)
-                        except ValueError:
-                            return None
-                return None
+        Returns:
+            int: The offset in 1/64ths of an inch
+        """
+        if (conn_type, conn_size) not in self.session_offsets:
+            entry = self.snapshot.entry(conn_type, self._normalize_size_value(conn_size))
+            if entry is not None and entry.offset_units is not None:
+                if use_g1 and entry.g1_units is not None:
+                    return entry.g1_units
+                return entry.offset_units
 
-        # No exact size match found
-        return None
+        offset = self.get_offset(conn_type, conn_size)
+        if use_g1:
+            g1_offset = self.get_offset_g1(conn_type, conn_size)
+            if g1_offset is not None:
+                offset = g1_offset
+        return to_units(offset)
+
+    def get_pair_matrix_index(self, conn_type: str, conn_size: str, use_g1: bool = False):
+        """Row of a fitting in pair_matrix, or None if the fitting is not in the database."""
+        return self.pair_matrix.index_of(conn_type, self._normalize_size_value(conn_size), use_g1)
+
+    def get_pair_offset_units(self, type_a: str, size_a: str, type_b: str, size_b: str,
+                              use_g1_a: bool = False, use_g1_b: bool = False) -> int:
+        """
+        Sum of the offsets of two fittings in 1/64ths, read from the precomputed pair matrix.
+        Falls back to get_offset_units for session offsets and fittings missing from the matrix.
+        """
+        if (type_a, size_a) not in self.session_offsets and (type_b, size_b) not in self.session_offsets:
+            index_a = self.get_pair_matrix_index(type_a, size_a, use_g1_a)
+            index_b = self.get_pair_matrix_index(type_b, size_b, use_g1_b)
+            if index_a is not None and index_b is not None:
+                return self.pair_matrix.pair_sum(index_a, index_b)
+        return self.get_offset_units(type_a, size_a, use_g1_a) + self.get_offset_units(type_b, size_b, use_g1_b)
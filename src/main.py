@@ -1,7 +1,10 @@
+import argparse
 from .loader import DimensionLoader
 from .api import get_cut_length, get_lay_in_cuts, get_bushing_cut
 from .config import EXCEL_PATH, SUPPORTED_CONNECTOR_TYPES
-from fractions import Fraction
+from .formatting import DEFAULT_FORMATTER, format_length
+from .job_queue import BUSHING_TYPE
+from .lengths import SHAVE_INCHES
 
 def prompt_nonempty(prompt_text: str):
     while True:
@@ -27,37 +30,17 @@ def select_connector_type(prompt_text: str = "Select connector type") -> str:
     
     return SUPPORTED_CONNECTOR_TYPES[choice - 1]
 
-def reduce_fraction(numerator: int, denominator: int) -> tuple[int, int]:
-    """
-    Reduce a fraction to its simplest form using GCD.
-    Example: reduce_fraction(8, 16) returns (1, 2)
-    """
-    from math import gcd
-    common_divisor = gcd(numerator, denominator)
-    return (numerator // common_divisor, denominator // common_divisor)
-
-def decimal_to_fraction_16ths(decimal: float) -> str:
-    """
-    Convert a decimal to a fraction with denominator 16, reduced to simplest form.
-    Uses Fraction for precise arithmetic to avoid floating-point rounding errors.
-    Example: 2.3125 returns "2 5/16"; 2.5 returns "2 1/2" (not "2 8/16")
-    """
-    # Convert to Fraction for precise arithmetic
-    frac = Fraction(decimal).limit_denominator(1000)
-    
-    # Convert to 16ths
-    frac_16ths = frac * 16
-    whole = int(frac_16ths) // 16
-    remainder = int(frac_16ths) % 16
-    
-    if remainder == 0:
-        return str(whole)
-    else:
-        # Reduce the fraction to simplest form
-        num, denom = reduce_fraction(remainder, 16)
-        return f"{whole} {num}/{denom}"
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.main", description="PVC cut length calculator")
+    parser.add_argument("--repl", action="store_true",
+                        help="Interactive mode: one-line commands, many cuts per session")
+    parser.add_argument("--cut-list", metavar="PATH", help="With --repl, append every cut to this CSV")
+    args = parser.parse_args(argv)
+    if args.repl:
+        from .repl import CutRepl
+        CutRepl(cut_list_path=args.cut_list).run()
+        return
 
-def main():
     loader = DimensionLoader(EXCEL_PATH)
 
     print("\n=== PVC CUT LENGTH CALCULATOR ===\n")
@@ -66,7 +49,7 @@ def main():
     print("Select cut type:")
     print("  1) Standard (single cut)")
     print("  2) Lay-in (two cuts)")
-    print("  3) Bushing (subtract bushing thickness)")
+    print("  3) Bushing (subtract bushing offset)")
     calc_choice = None
     while calc_choice not in {"1", "2", "3"}:
         calc_choice = prompt_nonempty("Choose option (1/2/3): ")
@@ -92,11 +75,11 @@ def main():
         # Ask about shave
         shave_choice = prompt_nonempty("Include shave in calculation? (y/n): ").lower()
         if shave_choice == "y":
-            cut_length -= 1/16
+            cut_length -= SHAVE_INCHES
 
         print("\n--- RESULT ---")
         print(request)
-        print(f"\nFinal Cut Length = {decimal_to_fraction_16ths(cut_length)} inches\n")
+        print(f"\nFinal Cut Length = {format_length(cut_length)} {DEFAULT_FORMATTER.unit}\n")
 
     elif calc_choice == "2":
         # lay-in needs overall C2C and lay-in C2C plus lay-in offset
@@ -112,26 +95,22 @@ def main():
                 break
             except ValueError:
                 print("Please enter a numeric value for Lay-in Center-to-Center.")
-        while True:
-            try:
-                lay_in_offset = float(prompt_nonempty("Lay-in offset (inches): "))
-                break
-            except ValueError:
-                print("Please enter a numeric value for Lay-in offset.")
+        type_lay_in = select_connector_type("Lay-in Fitting Type")
+        size_lay_in = prompt_nonempty("Lay-in Fitting Size (inches): ")
 
-        request, (cut1, cut2) = get_lay_in_cuts(loader, type_a, size_a, type_b, size_b,
-                                                c2c_overall, c2c_lay_in, lay_in_offset)
+        request, (cut1, cut2) = get_lay_in_cuts(loader, type_a, size_a, type_lay_in, size_lay_in, type_b, size_b,
+                                                c2c_overall, c2c_lay_in)
 
         # Ask about shave
         shave_choice = prompt_nonempty("Include shave in calculation? (y/n): ").lower()
         if shave_choice == "y":
-            cut1 -= 1/16
-            cut2 -= 1/16
+            cut1 -= SHAVE_INCHES
+            cut2 -= SHAVE_INCHES
 
         print("\n--- RESULT (Lay-in) ---")
         print(request)
-        print(f"\nCut 1 = {decimal_to_fraction_16ths(cut1)} inches")
-        print(f"Cut 2 = {decimal_to_fraction_16ths(cut2)} inches\n")
+        print(f"\nCut 1 = {format_length(cut1)} {DEFAULT_FORMATTER.unit}")
+        print(f"Cut 2 = {format_length(cut2)} {DEFAULT_FORMATTER.unit}\n")
 
     else:
         # bushing calculation
@@ -141,23 +120,18 @@ def main():
                 break
             except ValueError:
                 print("Please enter a numeric value for Center-to-Center.")
-        while True:
-            try:
-                bushing = float(prompt_nonempty("Bushing thickness (inches): "))
-                break
-            except ValueError:
-                print("Please enter a numeric value for bushing thickness.")
+        size_bushing = prompt_nonempty("Bushing Size (e.g. 2x1): ")
 
-        request, cut_length = get_bushing_cut(loader, type_a, size_a, type_b, size_b, c2c, bushing)
+        request, cut_length = get_bushing_cut(loader, type_a, size_a, BUSHING_TYPE, size_bushing, type_b, size_b, c2c)
 
         # Ask about shave
         shave_choice = prompt_nonempty("Include shave in calculation? (y/n): ").lower()
         if shave_choice == "y":
-            cut_length -= 1/16
+            cut_length -= SHAVE_INCHES
 
         print("\n--- RESULT (Bushing) ---")
         print(request)
-        print(f"\nFinal Cut Length = {decimal_to_fraction_16ths(cut_length)} inches\n")
+        print(f"\nFinal Cut Length = {format_length(cut_length)} {DEFAULT_FORMATTER.unit}\n")
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,18 @@
+from array import array
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(frozen=True)
 class Connection:
+    __slots__ = ("connection_type", "size", "offset")
+
     connection_type: str
     size: str
     offset: float
 
-@dataclass
+@dataclass(frozen=True)
 class CutRequest:
+    __slots__ = ("connection_a", "connection_b", "center_to_center")
+
     connection_a: Connection
     connection_b: Connection
     center_to_center: float
@@ -20,3 +25,84 @@ class CutRequest:
             f"Size={self.connection_b.size}, Offset={self.connection_b.offset}\n"
             f"Center-to-Center: {self.center_to_center}"
         )
+
+
+class CutBatch:
+    """
+    Columnar container for many cut requests.
+
+    Connector types and sizes are interned into small integer codes and every
+    column is a typed array, so a row costs 32 bytes instead of three Python
+    objects. CutRequest views are only built when a caller indexes a row.
+    """
+    __slots__ = ("_strings", "_codes", "type_a", "size_a", "offset_a",
+                 "type_b", "size_b", "offset_b", "center_to_center")
+
+    def __init__(self):
+        # Interned type/size strings: code -> string and string -> code
+        self._strings = []
+        self._codes = {}
+        self.type_a = array("H")
+        self.size_a = array("H")
+        self.offset_a = array("d")
+        self.type_b = array("H")
+        self.size_b = array("H")
+        self.offset_b = array("d")
+        self.center_to_center = array("d")
+
+    def _intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._codes[value] = code
+        return code
+
+    def append(self, type_a: str, size_a: str, offset_a: float,
+               type_b: str, size_b: str, offset_b: float, c2c: float) -> int:
+        """
+        Add one cut to the batch and return its row index.
+        """
+        self.type_a.append(self._intern(type_a))
+        self.size_a.append(self._intern(str(size_a)))
+        self.offset_a.append(float(offset_a))
+        self.type_b.append(self._intern(type_b))
+        self.size_b.append(self._intern(str(size_b)))
+        self.offset_b.append(float(offset_b))
+        self.center_to_center.append(float(c2c))
+        return len(self.center_to_center) - 1
+
+    def add_request(self, request: CutRequest) -> int:
+        """Add an existing CutRequest to the batch and return its row index."""
+        a, b = request.connection_a, request.connection_b
+        return self.append(a.connection_type, a.size, a.offset,
+                           b.connection_type, b.size, b.offset,
+                           request.center_to_center)
+
+    def __len__(self):
+        return len(self.center_to_center)
+
+    def __getitem__(self, index: int) -> CutRequest:
+        # Lazy per-row view: only materialized when asked for
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CutBatch index out of range")
+        strings = self._strings
+        return CutRequest(
+            Connection(strings[self.type_a[index]], strings[self.size_a[index]], self.offset_a[index]),
+            Connection(strings[self.type_b[index]], strings[self.size_b[index]], self.offset_b[index]),
+            self.center_to_center[index],
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def cut_lengths(self) -> array:
+        """
+        formula: final cut = C2C - offsetA - offsetB, for every row
+        Returns a typed array of floats.
+        """
+        return array("d", (c2c - oa - ob for c2c, oa, ob
+                           in zip(self.center_to_center, self.offset_a, self.offset_b)))
@@ -0,0 +1,205 @@
+from array import array
+from collections import deque
+import math
+import numpy as np
+from .formatting import format_length_units
+from .lengths import SHAVE_UNITS, UNITS_PER_INCH, parse_length, to_units
+from .loader import DimensionLoader
+from .models import Connection
+
+# Problem labels reported for a pipe segment
+CUT_NEGATIVE = "negative"
+CUT_TOO_SHORT = "too short"
+
+
+class PipingNetwork:
+    """
+    A piping system as a graph: fittings are nodes, pipe segments are edges.
+
+    Everything is stored in flat typed arrays (interned type/size codes, float
+    coordinates, int32 edge endpoints) so networks with 100k fittings stay small.
+    Each edge has either an explicit C2C or takes the distance between the
+    coordinates of its two fittings.
+    """
+
+    def __init__(self):
+        self._strings = []
+        self._codes = {}
+        self.node_type = array("I")
+        self.node_size = array("I")
+        self.node_xyz = array("d")
+        self.edge_a = array("i")
+        self.edge_b = array("i")
+        self.edge_g1 = array("B")      # bit 0: G1 on end A, bit 1: G1 on end B
+        self.edge_c2c = array("q")     # 1/64ths, -1 when derived from coordinates
+
+    def _intern(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._codes[value] = code
+        return code
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_type)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_a)
+
+    def add_fitting(self, conn_type: str, size: str, position: tuple = None) -> int:
+        """
+        Add a fitting node and return its id.
+        position is an optional (x, y, z) in inches; missing coordinates are NaN.
+        """
+        x, y, z = position if position is not None else (math.nan, math.nan, math.nan)
+        self.node_type.append(self._intern(conn_type))
+        self.node_size.append(self._intern(str(size)))
+        self.node_xyz.extend((float(x), float(y), float(z)))
+        return self.node_count - 1
+
+    def add_pipe(self, node_a: int, node_b: int, c2c=None, use_g1_a: bool = False, use_g1_b: bool = False) -> int:
+        """
+        Add a pipe segment between two fittings and return its id.
+        Without c2c, the C2C is the distance between the two fittings' coordinates.
+        use_g1_a/use_g1_b select the G1 offset on that end (e.g. the vertical stab of a reducing tee).
+        Raises ValueError for unknown fittings and for a c2c that is not a finite length above zero.
+        """
+        for node in (node_a, node_b):
+            if not 0 <= node < self.node_count:
+                raise ValueError(f"Unknown fitting id {node}")
+        if node_a == node_b:
+            raise ValueError("A pipe segment must connect two different fittings")
+        c2c_units = -1
+        if c2c is not None:
+            # -1 marks a derived C2C, so an explicit one must be a real, positive length
+            if isinstance(c2c, float) and not math.isfinite(c2c):
+                raise ValueError(f"C2C must be a finite number, got {c2c}")
+            if parse_length(c2c) <= 0:
+                raise ValueError(f"C2C must be greater than zero, got {c2c}")
+            c2c_units = to_units(c2c)
+        self.edge_a.append(node_a)
+        self.edge_b.append(node_b)
+        self.edge_g1.append((1 if use_g1_a else 0) | (2 if use_g1_b else 0))
+        self.edge_c2c.append(c2c_units)
+        return self.edge_count - 1
+
+    def connection(self, loader: DimensionLoader, node: int, use_g1: bool = False) -> Connection:
+        """Connection model for one fitting, with its offset from the loader."""
+        conn_type = self._strings[self.node_type[node]]
+        size = self._strings[self.node_size[node]]
+        return Connection(conn_type, size, loader.get_offset_units(conn_type, size, use_g1) / UNITS_PER_INCH)
+
+    def adjacency(self):
+        """
+        Compressed sparse row adjacency: (indptr, neighbors, edge_ids) as numpy arrays.
+        The neighbors of node n are neighbors[indptr[n]:indptr[n + 1]].
+        """
+        a = np.frombuffer(self.edge_a, dtype=np.int32)
+        b = np.frombuffer(self.edge_b, dtype=np.int32)
+        sources = np.concatenate([a, b])
+        targets = np.concatenate([b, a])
+        edge_ids = np.concatenate([np.arange(len(a), dtype=np.int32)] * 2)
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(self.node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=self.node_count), out=indptr[1:])
+        return indptr, targets[order], edge_ids[order]
+
+    def components(self) -> np.ndarray:
+        """Connected component label for every fitting, found with one breadth-first traversal."""
+        indptr, neighbors, _ = self.adjacency()
+        indptr, neighbors = indptr.tolist(), neighbors.tolist()
+        labels = [-1] * self.node_count
+        label = 0
+        for start in range(self.node_count):
+            if labels[start] >= 0:
+                continue
+            labels[start] = label
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                for neighbor in neighbors[indptr[node]:indptr[node + 1]]:
+                    if labels[neighbor] < 0:
+                        labels[neighbor] = label
+                        queue.append(neighbor)
+            label += 1
+        return np.array(labels, dtype=np.int32)
+
+    def compute_cuts(self, loader: DimensionLoader, min_cut=0, shave: bool = False) -> "NetworkCuts":
+        """
+        Compute every cut in the system: C2C - offset at each end, minus the shave if requested.
+        Offsets are resolved once per distinct (type, size, stab) and applied to all edges at once.
+        Segments shorter than min_cut (or negative) are flagged.
+        """
+        node_type = np.frombuffer(self.node_type, dtype=np.uint32).astype(np.int64)
+        node_size = np.frombuffer(self.node_size, dtype=np.uint32).astype(np.int64)
+        g1_flags = np.frombuffer(self.edge_g1, dtype=np.uint8)
+        width = len(self._strings)
+
+        def end_offsets(nodes, g1_bit):
+            # Encode (type, size, stab) as one integer so distinct fittings resolve once
+            nodes = np.frombuffer(nodes, dtype=np.int32)
+            use_g1 = (g1_flags & g1_bit) > 0
+            keys = (node_type[nodes] * width + node_size[nodes]) * 2 + use_g1
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            offsets = np.fromiter(
+                (loader.get_offset_units(self._strings[key // 2 // width], self._strings[key // 2 % width], bool(key % 2))
+                 for key in unique_keys.tolist()),
+                dtype=np.int64, count=len(unique_keys))
+            return offsets[inverse.reshape(-1)]
+
+        c2c = np.frombuffer(self.edge_c2c, dtype=np.int64).copy()
+        derived = c2c < 0
+        if derived.any():
+            xyz = np.frombuffer(self.node_xyz, dtype=np.float64).reshape(-1, 3)
+            a = np.frombuffer(self.edge_a, dtype=np.int32)[derived]
+            b = np.frombuffer(self.edge_b, dtype=np.int32)[derived]
+            distance = np.linalg.norm(xyz[a] - xyz[b], axis=1)
+            if np.isnan(distance).any():
+                missing = np.flatnonzero(derived)[np.isnan(distance)][0]
+                raise ValueError(f"Pipe segment {missing} has no C2C and its fittings have no coordinates")
+            c2c[derived] = np.floor(distance * UNITS_PER_INCH + 0.5).astype(np.int64)
+
+        cuts = c2c - end_offsets(self.edge_a, 1) - end_offsets(self.edge_b, 2)
+        if shave:
+            cuts -= SHAVE_UNITS
+        return NetworkCuts(self, c2c, cuts, to_units(min_cut))
+
+
+class NetworkCuts:
+    """Cut lengths for every pipe segment of a PipingNetwork, in 1/64ths, plus problem flags."""
+
+    def __init__(self, network: PipingNetwork, c2c_units: np.ndarray, cut_units: np.ndarray, min_cut_units: int):
+        self.network = network
+        self.c2c_units = c2c_units
+        self.cut_units = cut_units
+        self.negative = cut_units < 0
+        self.too_short = ~self.negative & (cut_units < min_cut_units)
+
+    def __len__(self):
+        return len(self.cut_units)
+
+    def problems(self) -> list:
+        """List of (segment id, CUT_NEGATIVE or CUT_TOO_SHORT) for every flagged segment."""
+        flagged = []
+        for edge in np.flatnonzero(self.negative | self.too_short):
+            flagged.append((int(edge), CUT_NEGATIVE if self.negative[edge] else CUT_TOO_SHORT))
+        return flagged
+
+    def cut_list(self) -> list:
+        """Printable cut list: one dict per segment with both fittings and the formatted length."""
+        network = self.network
+        strings = network._strings
+        rows = []
+        for edge, (a, b) in enumerate(zip(network.edge_a, network.edge_b)):
+            rows.append({
+                'segment': edge,
+                'connection_a': f"{strings[network.node_type[a]]} ({strings[network.node_size[a]]}\")",
+                'connection_b': f"{strings[network.node_type[b]]} ({strings[network.node_size[b]]}\")",
+                'c2c': int(self.c2c_units[edge]) / UNITS_PER_INCH,
+                'length_decimal': int(self.cut_units[edge]) / UNITS_PER_INCH,
+                'length_fraction': format_length_units(int(self.cut_units[edge])),
+            })
+        return rows
@@ -0,0 +1,152 @@
+from array import array
+import numpy as np
+from .formatting import format_length_units
+from .lengths import SHAVE_TEXT, SHAVE_UNITS, to_units
+
+# Stab variants for a fitting key: normal offset, or G1 (vertical stab on Tee (Reducing))
+STAB_NORMAL = "normal"
+STAB_G1 = "g1"
+
+
+class PairOffsetMatrix:
+    """
+    Dense matrix of offset sums for every pair of (type, size, stab) fitting keys.
+
+    For any two fittings the cut is C2C minus one matrix entry, so a pair lookup is
+    a dict hit plus an array index. Values are integer 1/64ths in a flat int32 array
+    (row-major, N x N). Keys use the loader's normalized sizes.
+    """
+
+    def __init__(self, keys: list, offsets: list):
+        self.keys = list(keys)
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.offsets = array("i", offsets)
+        self._build()
+
+    @classmethod
+    def from_offset_index(cls, offset_index: dict):
+        """
+        Build the matrix from DimensionLoader.offset_index ({type: {size: OffsetEntry}}).
+        A G1 key is only added for sizes that have a G1 offset.
+        """
+        return cls.from_units((conn_type, size, entry.offset_units, entry.g1_units)
+                              for conn_type, sizes in offset_index.items() for size, entry in sizes.items())
+
+    @classmethod
+    def from_units(cls, rows):
+        """Build the matrix from (type, size, offset_units, g1_units) rows; None for a missing offset."""
+        keys, offsets = [], []
+        for conn_type, size, offset_units, g1_units in rows:
+            if offset_units is None:
+                continue
+            keys.append((conn_type, size, STAB_NORMAL))
+            offsets.append(offset_units)
+            if g1_units is not None:
+                keys.append((conn_type, size, STAB_G1))
+                offsets.append(g1_units)
+        return cls(keys, offsets)
+
+    def _build(self):
+        # Outer sum in numpy, copied into the flat int32 array the lookups index
+        offsets = np.frombuffer(self.offsets, dtype=np.int32)
+        self.sums = array("i")
+        self.sums.frombytes(np.add.outer(offsets, offsets).astype(np.int32).tobytes())
+
+    def __len__(self):
+        return len(self.keys)
+
+    def index_of(self, conn_type: str, size: str, use_g1: bool = False):
+        """
+        Row index for a fitting, or None if it is not in the matrix.
+        When G1 is requested but the size has no G1 offset, the normal row is used.
+        """
+        if use_g1:
+            position = self.positions.get((conn_type, size, STAB_G1))
+            if position is not None:
+                return position
+        return self.positions.get((conn_type, size, STAB_NORMAL))
+
+    def pair_sum(self, index_a: int, index_b: int) -> int:
+        """Offset A + offset B in 1/64ths for two row indexes."""
+        return self.sums[index_a * len(self.keys) + index_b]
+
+    def copy(self):
+        """Independent copy (keys, offsets and sums), e.g. to patch for a new catalogue version."""
+        matrix = PairOffsetMatrix.__new__(PairOffsetMatrix)
+        matrix.keys = list(self.keys)
+        matrix.positions = dict(self.positions)
+        matrix.offsets = self.offsets[:]
+        matrix.sums = self.sums[:]
+        return matrix
+
+    def update(self, conn_type: str, size: str, offset_units: int, g1_units: int = None):
+        """Change the offsets for one fitting size. See update_many."""
+        self.update_many({(conn_type, size): (offset_units, g1_units)})
+
+    def update_many(self, changes: dict):
+        """
+        Change the offsets of several fitting sizes in place.
+
+        Args:
+            changes: {(conn_type, size): (offset_units, g1_units)}. An offset of None removes
+                the size; a G1 offset of None removes its G1 key, as from_offset_index would.
+
+        Sizes that keep the same keys are patched by rewriting one row and one column per key
+        (O(N)); if keys are added or removed the matrix is rebuilt once.
+        """
+        wanted = {}
+        for (conn_type, size), (offset_units, g1_units) in changes.items():
+            wanted[(conn_type, size, STAB_NORMAL)] = offset_units
+            wanted[(conn_type, size, STAB_G1)] = None if offset_units is None else g1_units
+
+        if any((units is None) != (key not in self.positions) for key, units in wanted.items()):
+            kept = [key for key in self.keys if wanted.get(key, 0) is not None]
+            added = [key for key, units in wanted.items() if units is not None and key not in self.positions]
+            offsets = [wanted[key] if key in wanted else self.offsets[self.positions[key]] for key in kept]
+            self.keys = kept + added
+            self.positions = {key: i for i, key in enumerate(self.keys)}
+            self.offsets = array("i", offsets + [wanted[key] for key in added])
+            self._build()
+            return
+
+        patched = [self.positions[key] for key, units in wanted.items() if units is not None]
+        if not patched:
+            return
+        n = len(self.keys)
+        offsets = np.frombuffer(self.offsets, dtype=np.int32)
+        sums = np.frombuffer(self.sums, dtype=np.int32).reshape(n, n)
+        for key, units in wanted.items():
+            if units is not None:
+                offsets[self.positions[key]] = units
+        # Rows and columns after every offset is in, so pairs of patched keys are right too
+        for position in patched:
+            sums[position, :] = offsets + offsets[position]
+            sums[:, position] = sums[position, :]
+
+
+def iter_cut_table(matrix: PairOffsetMatrix, index_a: int, index_b: int, c2c_start, c2c_stop,
+                   step="1/16", shave: bool = False):
+    """
+    Yield (c2c_units, cut_units) for every C2C from c2c_start to c2c_stop inclusive.
+    Measurements may be numbers or strings like '14-3/8'; everything is in 1/64ths.
+    """
+    start, stop, step_units = to_units(c2c_start), to_units(c2c_stop), to_units(step)
+    if step_units <= 0:
+        raise ValueError("Cut table step must be at least 1/64 inch")
+    offsets = matrix.pair_sum(index_a, index_b) + (SHAVE_UNITS if shave else 0)
+    for c2c in range(start, stop + 1, step_units):
+        yield c2c, c2c - offsets
+
+
+def format_cut_table(matrix: PairOffsetMatrix, index_a: int, index_b: int, c2c_start, c2c_stop,
+                     step="1/16", shave: bool = False):
+    """
+    Yield printable lines of a lookup sheet for one fitting pair, header first.
+    """
+    (type_a, size_a, stab_a), (type_b, size_b, stab_b) = matrix.keys[index_a], matrix.keys[index_b]
+    yield f"A: {type_a} ({size_a}\"){' G1' if stab_a == STAB_G1 else ''}"
+    yield f"B: {type_b} ({size_b}\"){' G1' if stab_b == STAB_G1 else ''}"
+    yield f"Shave: yes (-{SHAVE_TEXT}\")" if shave else "Shave: no"
+    yield f"{'C2C':>12}  {'Cut':>12}"
+    for c2c, cut in iter_cut_table(matrix, index_a, index_b, c2c_start, c2c_stop, step, shave):
+        yield f"{format_length_units(c2c):>12}  {format_length_units(cut):>12}"
@@ -0,0 +1,346 @@
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from .catalogue import CatalogueSnapshot, OffsetEntry, normalize_size
+from .config import SUPPORTED_CONNECTOR_TYPES
+
+# File layout (little-endian, every section 8-byte aligned):
+#   header        magic, count, key bytes, footer bytes
+#   key_starts    uint32[count + 1]   start of each key in the key bytes
+#   key bytes     b"type\x1fsize" per fitting, sorted bytewise
+#   offset        float64[count]      inches, NaN when missing or invalid
+#   g1_offset     float64[count]      inches, NaN when missing
+#   offset_units  int32[count]        1/64ths, MISSING_UNITS when missing
+#   g1_units      int32[count]        1/64ths, MISSING_UNITS when missing
+#   footer        JSON: size order per type, invalid offset cells, type digests, source stamp, version
+MAGIC = b"PVCOFF01"
+HEADER = struct.Struct("<8sIII4x")
+KEY_SEPARATOR = "\x1f"
+MISSING_UNITS = -2 ** 31
+
+
+def _pad(length: int) -> int:
+    return -length % 8
+
+
+def _key(conn_type: str, size: str) -> bytes:
+    # \x1f sorts before every printable character, so all sizes of a type are contiguous
+    return f"{conn_type}{KEY_SEPARATOR}{size}".encode("utf-8")
+
+
+def write_offset_table(snapshot: CatalogueSnapshot, path: str, source_stamp=None) -> str:
+    """
+    Write a catalogue snapshot to a flat binary offset table.
+
+    The file is written next to `path` and renamed over it, so processes that have the old
+    table mapped keep reading the old file and new opens never see a half-written one.
+
+    Args:
+        snapshot: Catalogue snapshot to write
+        path: Destination file
+        source_stamp: JSON-serializable stamp of the workbook/journal the snapshot came from
+
+    Returns:
+        str: The path written
+    """
+    rows = sorted((_key(conn_type, size), entry)
+                  for conn_type, sizes in snapshot.offsets.items() for size, entry in sizes.items())
+    key_starts = array("I", [0])
+    for key, _ in rows:
+        key_starts.append(key_starts[-1] + len(key))
+    key_bytes = b"".join(key for key, _ in rows)
+    offsets = array("d", [math.nan if e.offset is None else e.offset for _, e in rows])
+    g1_offsets = array("d", [math.nan if e.g1_offset is None else e.g1_offset for _, e in rows])
+    offset_units = array("i", [MISSING_UNITS if e.offset_units is None else e.offset_units for _, e in rows])
+    g1_units = array("i", [MISSING_UNITS if e.g1_units is None else e.g1_units for _, e in rows])
+    footer = json.dumps({
+        "types": {conn_type: list(sizes) for conn_type, sizes in snapshot.offsets.items()},
+        "invalid": {str(i): e.invalid_offset for i, (_, e) in enumerate(rows) if e.invalid_offset is not None},
+        "digests": {conn_type: snapshot.digest(conn_type).hex() for conn_type in snapshot.offsets},
+        "source": source_stamp,
+        "version": snapshot.version,
+        "written_at": time.time(),
+    }).encode("utf-8")
+
+    sections = [key_starts, key_bytes, offsets, g1_offsets, offset_units, g1_units]
+    if sys.byteorder != "little":
+        for section in sections:
+            if isinstance(section, array):
+                section.byteswap()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(rows), len(key_bytes), len(footer)))
+        for section in sections:
+            data = bytes(section)
+            f.write(data)
+            f.write(b"\0" * _pad(len(data)))
+        f.write(footer)
+    os.replace(tmp_path, path)
+    return path
+
+
+class _SortedKeys:
+    """Sequence view of the key section, so bisect can search the mapped file directly."""
+
+    def __init__(self, buffer, key_starts, base: int):
+        self._buffer = buffer
+        self._starts = key_starts
+        self._base = base
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def __getitem__(self, i):
+        return self._buffer[self._base + self._starts[i]:self._base + self._starts[i + 1]]
+
+
+class _MappedSizes(Mapping):
+    """
+    One type's {normalized_size: OffsetEntry} in a CatalogueSnapshot, read from the mapped table.
+    Entries are decoded on first lookup and kept, so only the fittings in use are held per process.
+    """
+
+    __slots__ = ("_table", "_conn_type", "_sizes", "_entries")
+
+    def __init__(self, table, conn_type: str, sizes: list):
+        self._table = table
+        self._conn_type = conn_type
+        self._sizes = sizes
+        self._entries = {}
+
+    def get(self, size, default=None):
+        entry = self._entries.get(size)
+        if entry is None:
+            i = self._table._row(self._conn_type, size)
+            if i < 0:
+                return default
+            entry = self._entries[size] = self._table.entry(i)
+        return entry
+
+    def __getitem__(self, size):
+        entry = self.get(size)
+        if entry is None:
+            raise KeyError(size)
+        return entry
+
+    def __contains__(self, size):
+        return self.get(size) is not None
+
+    def __iter__(self):
+        return iter(self._sizes)
+
+    def __len__(self):
+        return len(self._sizes)
+
+
+class MappedOffsetTable:
+    """
+    Read-only, memory-mapped offset table written by write_offset_table.
+
+    Several server processes can map the same file: the OS shares its pages between them,
+    and opening it costs a header read instead of parsing the workbook. Lookups bisect the
+    sorted key section in place and read the offset arrays through memoryviews, so nothing
+    is copied per process except the small JSON footer.
+
+    Answers get_offset / get_offset_g1 / get_offset_units with the same results and errors
+    as DimensionLoader, for callers that only need lookups. to_snapshot gives a catalogue
+    snapshot that reads through the same mapping, so a DimensionLoader can serve from it too.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if sys.byteorder != "little":
+            raise ValueError("Offset tables can only be mapped on little-endian machines")
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            self._map(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _map(self, path: str):
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"Offset table is truncated: {path}")
+        magic, count, key_length, footer_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an offset table: {path}")
+        lengths = [4 * (count + 1), key_length, 8 * count, 8 * count, 4 * count, 4 * count]
+        expected = HEADER.size + sum(length + _pad(length) for length in lengths) + footer_length
+        if len(self._mmap) != expected:
+            raise ValueError(f"Offset table is truncated or corrupt ({len(self._mmap)} bytes, "
+                             f"header says {expected}): {path}")
+        self.count = count
+        view = memoryview(self._mmap)
+        self._views.append(view)
+        position = HEADER.size
+
+        def section(length, fmt=None):
+            nonlocal position
+            start = position
+            position += length + _pad(length)
+            data = view[start:start + length]
+            if fmt is not None:
+                data = data.cast(fmt)
+                self._views.append(data)
+            return data
+
+        self._key_starts = section(lengths[0], "I")
+        key_base = position
+        section(key_length)
+        self._offsets = section(lengths[2], "d")
+        self._g1_offsets = section(lengths[3], "d")
+        self._offset_units = section(lengths[4], "i")
+        self._g1_units = section(lengths[5], "i")
+        self._keys = _SortedKeys(self._mmap, self._key_starts, key_base)
+        footer = json.loads(bytes(view[position:position + footer_length]).decode("utf-8"))
+        self.sizes_by_type = footer["types"]
+        self.invalid_offsets = {int(i): raw for i, raw in footer["invalid"].items()}
+        self.digests = {conn_type: bytes.fromhex(d) for conn_type, d in footer.get("digests", {}).items()}
+        self.source_stamp = footer["source"]
+        self.written_version = footer["version"]
+        self.session_offsets = {}
+
+    def close(self):
+        # Only for a table no snapshot reads from any more
+        for data in reversed(self._views):
+            data.release()
+        self._views = []
+        self._mmap.close()
+
+    @property
+    def connector_types(self) -> list:
+        return list(self.sizes_by_type)
+
+    def matches(self, source_stamp) -> bool:
+        """True if the table was written from the workbook/journal with this stamp."""
+        return self.source_stamp is not None and self.source_stamp == json.loads(json.dumps(source_stamp))
+
+    def _row(self, conn_type: str, size) -> int:
+        # Row of a fitting (normalized size) in the arrays, or -1
+        key = _key(conn_type, size)
+        i = bisect_left(self._keys, key)
+        return i if i < self.count and self._keys[i] == key else -1
+
+    def _index(self, conn_type: str, conn_size) -> int:
+        return self._row(conn_type, normalize_size(conn_size))
+
+    def _require_type(self, conn_type: str):
+        # Same errors as DimensionLoader._sizes_for
+        if conn_type not in SUPPORTED_CONNECTOR_TYPES and conn_type not in self.sizes_by_type:
+            raise ValueError(
+                f"Unsupported connector type: '{conn_type}'. "
+                f"Supported types: {SUPPORTED_CONNECTOR_TYPES}"
+            )
+        if not self.sizes_by_type.get(conn_type):
+            raise ValueError(
+                f"No database entries found for connector type '{conn_type}'"
+            )
+
+    def entry(self, i: int) -> OffsetEntry:
+        """OffsetEntry for row i of the table."""
+        offset, g1_offset = self._offsets[i], self._g1_offsets[i]
+        offset_units, g1_units = self._offset_units[i], self._g1_units[i]
+        return OffsetEntry(
+            None if math.isnan(offset) else offset,
+            None if math.isnan(g1_offset) else g1_offset,
+            None if offset_units == MISSING_UNITS else offset_units,
+            None if g1_units == MISSING_UNITS else g1_units,
+            self.invalid_offsets.get(i),
+        )
+
+    def get_offset(self, conn_type: str, conn_size: str) -> float:
+        """Offset in inches; raises ValueError like DimensionLoader.get_offset."""
+        self._require_type(conn_type)
+        i = self._index(conn_type, conn_size)
+        if i >= 0:
+            offset = self._offsets[i]
+            if not math.isnan(offset):
+                return offset
+            if i in self.invalid_offsets:
+                raise ValueError(
+                    f"Invalid offset value '{self.invalid_offsets[i]}' for {conn_type} Size={conn_size}"
+                )
+        raise ValueError(
+            f"No matching size '{conn_size}' for connector '{conn_type}'. "
+            f"Available sizes: {self.sizes_by_type[conn_type]}"
+        )
+
+    def get_offset_g1(self, conn_type: str, conn_size: str) -> float:
+        """G1 offset in inches, or None if the fitting has none."""
+        self._require_type(conn_type)
+        i = self._index(conn_type, conn_size)
+        if i < 0 or math.isnan(self._g1_offsets[i]):
+            return None
+        return self._g1_offsets[i]
+
+    def get_offset_units(self, conn_type: str, conn_size: str, use_g1: bool = False) -> int:
+        """Offset in 1/64ths (the G1 offset when use_g1 and one exists)."""
+        i = self._index(conn_type, conn_size)
+        if i >= 0 and self._offset_units[i] != MISSING_UNITS:
+            if use_g1 and self._g1_units[i] != MISSING_UNITS:
+                return self._g1_units[i]
+            return self._offset_units[i]
+        # Raises the matching error
+        self.get_offset(conn_type, conn_size)
+        raise ValueError(f"No offset in 1/64ths for {conn_type} Size={conn_size}")
+
+    def get_pair_matrix_index(self, conn_type: str, conn_size: str, use_g1: bool = False):
+        # No pair matrix: get_pair_offset_units adds the two offsets directly
+        return None
+
+    def get_pair_offset_units(self, type_a: str, size_a: str, type_b: str, size_b: str,
+                              use_g1_a: bool = False, use_g1_b: bool = False) -> int:
+        """Sum of the offsets of two fittings in 1/64ths."""
+        return self.get_offset_units(type_a, size_a, use_g1_a) + self.get_offset_units(type_b, size_b, use_g1_b)
+
+    def units(self):
+        """(type, size, offset_units, g1_units) for every fitting, in size order, read without decoding entries."""
+        for conn_type, sizes in self.sizes_by_type.items():
+            for size in sizes:
+                i = self._row(conn_type, size)
+                offset_units, g1_units = self._offset_units[i], self._g1_units[i]
+                yield (conn_type, size, None if offset_units == MISSING_UNITS else offset_units,
+                       None if g1_units == MISSING_UNITS else g1_units)
+
+    def to_snapshot(self, source: str = "offset table") -> CatalogueSnapshot:
+        """
+        Catalogue snapshot of the table, in the original size order. Its entries are read from
+        the mapped file on lookup, not copied, so the table stays open while the snapshot (or
+        one sharing its types) is in use.
+        """
+        offsets = {conn_type: _MappedSizes(self, conn_type, sizes) for conn_type, sizes in self.sizes_by_type.items()}
+        return CatalogueSnapshot(offsets, source, self.digests)
+
+
+def open_offset_table(path: str, source_stamp=None):
+    """
+    Map the table at `path`, or return None if it is missing, unreadable, or (with a
+    source_stamp) was written from a different workbook/journal version.
+    """
+    try:
+        table = MappedOffsetTable(path)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError, struct.error):
+        # Missing, truncated or corrupt: callers fall back to the workbook
+        return None
+    if source_stamp is not None and not table.matches(source_stamp):
+        table.close()
+        return None
+    return table
+
+
+if __name__ == "__main__":
+    # python -m src.offset_table: rebuild the table from the workbook and journal
+    from .catalogue_watcher import CatalogueWatcher
+    from .config import EXCEL_PATH, JOURNAL_PATH, OFFSET_TABLE_PATH
+    watcher = CatalogueWatcher(EXCEL_PATH, journal_path=JOURNAL_PATH, table_path=OFFSET_TABLE_PATH)
+    table = open_offset_table(OFFSET_TABLE_PATH)
+    print(f"{OFFSET_TABLE_PATH}: {table.count} fittings, {len(table.sizes_by_type)} types")
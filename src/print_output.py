@@ -0,0 +1,294 @@
+import re
+import tempfile
+import zlib
+from .formatting import DEFAULT_FORMATTER
+
+# US Letter in points
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 36
+
+# Label grid (2 x 5 labels of 4" x 2" on Letter, the common shipping-label stock)
+LABEL_COLUMNS = 2
+LABEL_ROWS = 5
+LABEL_WIDTH = 288
+LABEL_HEIGHT = 144
+
+# Cut sheet table rows
+SHEET_ROW_HEIGHT = 14
+SHEET_FONT_SIZE = 8
+
+# Cut labels carry a Code 39 barcode of the job and cut number
+BARCODE_NARROW = 0.75
+BARCODE_WIDE = 2.0
+BARCODE_HEIGHT = 26
+
+# Code 39: 9 elements per character (bar, space, bar, ...), 1 = wide
+_CODE39 = {
+    "0": "000110100", "1": "100100001", "2": "001100001", "3": "101100000", "4": "000110001",
+    "5": "100110000", "6": "001110000", "7": "000100101", "8": "100100100", "9": "001100100",
+    "A": "100001001", "B": "001001001", "C": "101001000", "D": "000011001", "E": "100011000",
+    "F": "001011000", "G": "000001101", "H": "100001100", "I": "001001100", "J": "000011100",
+    "K": "100000011", "L": "001000011", "M": "101000010", "N": "000010011", "O": "100010010",
+    "P": "001010010", "Q": "000000111", "R": "100000110", "S": "001000110", "T": "000010110",
+    "U": "110000001", "V": "011000001", "W": "111000000", "X": "010010001", "Y": "110010000",
+    "Z": "011010000", "-": "010000101", ".": "110000100", " ": "011000100", "*": "010010100",
+    "$": "010101000", "/": "010100010", "+": "010001010", "%": "000101010",
+}
+
+# Characters the base-14 fonts can't show in WinAnsi, with printable stand-ins
+_REPLACEMENTS = {"→": "->", "✓": "x", "≈": "~"}
+
+
+def _barcode_ops(pattern: str) -> bytes:
+    # Bars of one character from its origin, then a move to the next character's origin
+    ops, x = [], 0.0
+    for i, wide in enumerate(pattern):
+        width = BARCODE_WIDE if wide == "1" else BARCODE_NARROW
+        if i % 2 == 0:
+            ops.append(b"%.2f 0 %.2f %d re f" % (x, width, BARCODE_HEIGHT))
+        x += width
+    ops.append(b"1 0 0 1 %.2f 0 cm " % (x + BARCODE_NARROW))
+    return b" ".join(ops)
+
+
+# Drawing operations per character, built once
+_BARCODE_OPS = {char: _barcode_ops(pattern) for char, pattern in _CODE39.items()}
+
+
+def barcode_value(job_name: str, cut_number) -> str:
+    """
+    Code 39 payload for a cut: up to 8 characters of the job name plus the cut number.
+    Example: barcode_value("Smith Residence", 12) returns "SMITH-RE-12"
+    """
+    job_code = re.sub(r"[^0-9A-Z]+", "-", job_name.upper()).strip("-")[:8].strip("-")
+    return f"{job_code}-{cut_number}" if job_code else str(cut_number)
+
+
+def barcode_width(value: str) -> float:
+    """Width in points of the barcode for a payload (start/stop characters included)."""
+    characters = len(value) + 2
+    return characters * (6 * BARCODE_NARROW + 3 * BARCODE_WIDE) + (characters - 1) * BARCODE_NARROW
+
+
+def _pdf_text(text) -> bytes:
+    # Literal PDF string in WinAnsi (cp1252), with the delimiters escaped
+    text = str(text)
+    for char, replacement in _REPLACEMENTS.items():
+        text = text.replace(char, replacement)
+    data = text.encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _fit(text, width: float, size: float) -> str:
+    # Cut text that would run past `width` (average Helvetica glyph is about half the font size)
+    text = str(text)
+    limit = max(int(width / (size * 0.5)), 1)
+    return text if len(text) <= limit else text[:max(limit - 1, 0)] + "…"
+
+
+class _Canvas:
+    """Drawing operations for one page's content stream."""
+
+    def __init__(self):
+        self.ops = []
+
+    def text(self, x: float, y: float, text, size: float = 10, bold: bool = False):
+        font = b"/F2" if bold else b"/F1"
+        self.ops.append(b"BT %s %.1f Tf %.2f %.2f Td %s Tj ET" % (font, size, x, y, _pdf_text(text)))
+
+    def rect(self, x: float, y: float, width: float, height: float, fill: bool = False):
+        self.ops.append(b"%.2f %.2f %.2f %.2f re %s" % (x, y, width, height, b"f" if fill else b"S"))
+
+    def line(self, x1: float, y1: float, x2: float, y2: float):
+        self.ops.append(b"%.2f %.2f m %.2f %.2f l S" % (x1, y1, x2, y2))
+
+    def barcode(self, x: float, y: float, value: str):
+        """Draw a Code 39 barcode with its bottom-left corner at (x, y)."""
+        bars = b"".join(_BARCODE_OPS[char] for char in f"*{value}*")
+        self.ops.append(b"q 1 0 0 1 %.2f %.2f cm %s Q" % (x, y, bars))
+
+    def content(self) -> bytes:
+        return b"0.5 w\n" + b"\n".join(self.ops)
+
+
+def stream_pdf(pages, title: str = ""):
+    """
+    Yield a PDF file as byte chunks, one page at a time.
+
+    Args:
+        pages: Iterable of page content streams (bytes); consumed lazily
+        title: Document title
+
+    Only object offsets are kept between pages, so memory does not grow with page content.
+    """
+    position = 0
+    offsets = {}
+    page_ids = []
+
+    def emit(number: int, body: bytes) -> bytes:
+        nonlocal position
+        offsets[number] = position
+        data = b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        position += len(data)
+        return data
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    position = len(header)
+    yield header
+    # 2 is the page tree, written once every page is known
+    yield emit(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    yield emit(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    yield emit(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    yield emit(5, b"<< /Title %s /Producer (PVC Cut Calculator) >>" % _pdf_text(title))
+
+    next_id = 6
+    for content in pages:
+        stream = zlib.compress(content)
+        yield emit(next_id, b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(stream), stream))
+        yield emit(next_id + 1, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                                b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+                                % (PAGE_WIDTH, PAGE_HEIGHT, next_id))
+        page_ids.append(next_id + 1)
+        next_id += 2
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    yield emit(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)))
+
+    xref = [b"xref\n0 %d\n0000000000 65535 f \n" % next_id]
+    xref += [b"%010d 00000 n \n" % offsets[number] for number in range(1, next_id)]
+    yield b"".join(xref)
+    yield b"trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (next_id, position)
+
+
+def _length_text(cut: dict) -> str:
+    suffix = " mm" if DEFAULT_FORMATTER.unit == "mm" else '"'
+    return f"{cut['length_fraction']}{suffix}"
+
+
+def _connections(cut: dict) -> list:
+    if cut.get('connection_bushing'):
+        return [("A", cut['connection_a']), ("Bushing", cut['connection_bushing']), ("B", cut['connection_b'])]
+    return [("A", cut['connection_a']), ("B", cut['connection_b'])]
+
+
+def _draw_label(canvas: _Canvas, x: float, y: float, cut: dict, job_name: str, barcodes: bool):
+    # (x, y) is the label's bottom-left corner
+    canvas.rect(x + 4, y + 4, LABEL_WIDTH - 8, LABEL_HEIGHT - 8)
+    left, top, width = x + 14, y + LABEL_HEIGHT - 24, LABEL_WIDTH - 28
+    canvas.text(left, top, f"CUT {cut['number']}", 13, bold=True)
+    canvas.text(left + 90, top, _fit(f"{job_name} · {cut['type']}", width - 90, 8), 8)
+    canvas.text(left, top - 24, _length_text(cut), 20, bold=True)
+    details = f"C2C {cut['c2c']:g}\""
+    if cut.get('shave'):
+        details += " · shaved"
+    canvas.text(left + 150, top - 22, _fit(details, width - 150, 8), 8)
+    line_y = top - 38
+    for name, connection in _connections(cut):
+        canvas.text(left, line_y, _fit(f"{name}: {connection}", width, 7.5), 7.5)
+        line_y -= 10
+    if cut.get('notes'):
+        canvas.text(left, line_y, _fit(f"Note: {cut['notes']}", width, 7.5), 7.5)
+    if barcodes:
+        value = barcode_value(job_name, cut['number'])
+        if barcode_width(value) <= width:
+            canvas.barcode(left, y + 12, value)
+            canvas.text(left + barcode_width(value) + 6, y + 14, value, 7)
+
+
+def iter_label_pages(cuts, job_name: str, barcodes: bool = True):
+    """
+    Yield one content stream per page of cut labels (LABEL_COLUMNS x LABEL_ROWS per page).
+
+    Args:
+        cuts: Iterable of Jobs tab cut dicts; read one page at a time
+        job_name: Printed on every label (and encoded in the barcode)
+        barcodes: If True, add a Code 39 barcode of the job and cut number
+    """
+    per_page = LABEL_COLUMNS * LABEL_ROWS
+    left = (PAGE_WIDTH - LABEL_COLUMNS * LABEL_WIDTH) / 2
+    top = PAGE_HEIGHT - (PAGE_HEIGHT - LABEL_ROWS * LABEL_HEIGHT) / 2
+    canvas, count = _Canvas(), 0
+    for cut in cuts:
+        row, column = divmod(count % per_page, LABEL_COLUMNS)
+        _draw_label(canvas, left + column * LABEL_WIDTH, top - (row + 1) * LABEL_HEIGHT, cut, job_name, barcodes)
+        count += 1
+        if count % per_page == 0:
+            yield canvas.content()
+            canvas = _Canvas()
+    if count == 0 or count % per_page:
+        yield canvas.content()
+
+
+# Cut sheet columns: heading, width in points, text for a cut
+_SHEET_COLUMNS = [
+    ("", 14, lambda cut: ""),
+    ("#", 24, lambda cut: cut['number']),
+    ("Type", 44, lambda cut: cut['type']),
+    ("Connection A", 128, lambda cut: cut['connection_a']),
+    ("Connection B", 128, lambda cut: (f"{cut['connection_bushing']} -> " if cut.get('connection_bushing') else "")
+     + cut['connection_b']),
+    ("C2C", 38, lambda cut: f"{cut['c2c']:g}"),
+    ("Length", 68, lambda cut: cut['length_fraction']),
+    ("Shave", 28, lambda cut: "yes" if cut.get('shave') else ""),
+    ("Notes", 68, lambda cut: cut.get('notes') or ""),
+]
+
+
+def iter_sheet_pages(cuts, job_name: str):
+    """
+    Yield one content stream per page of the cut sheet: a checkbox table of every cut,
+    with the header repeated on each page.
+    """
+    body_top = PAGE_HEIGHT - MARGIN - 40
+    rows_per_page = int((body_top - MARGIN - 20) // SHEET_ROW_HEIGHT)
+    length_heading = f"Length ({DEFAULT_FORMATTER.label})"
+
+    def start_page(page: int) -> _Canvas:
+        canvas = _Canvas()
+        canvas.text(MARGIN, PAGE_HEIGHT - MARGIN - 12, f"PVC Cut Sheet: {job_name}", 14, bold=True)
+        canvas.text(PAGE_WIDTH - MARGIN - 40, MARGIN - 14, f"Page {page}", 8)
+        x = MARGIN
+        for heading, width, _ in _SHEET_COLUMNS:
+            canvas.text(x + 2, body_top + 4, length_heading if heading == "Length" else heading, SHEET_FONT_SIZE, bold=True)
+            x += width
+        canvas.line(MARGIN, body_top, PAGE_WIDTH - MARGIN, body_top)
+        return canvas
+
+    page, row = 1, 0
+    canvas = start_page(page)
+    for cut in cuts:
+        if row == rows_per_page:
+            yield canvas.content()
+            page, row = page + 1, 0
+            canvas = start_page(page)
+        y = body_top - (row + 1) * SHEET_ROW_HEIGHT
+        canvas.rect(MARGIN + 3, y + 3, 8, 8)
+        x = MARGIN + _SHEET_COLUMNS[0][1]
+        for _, width, value in _SHEET_COLUMNS[1:]:
+            canvas.text(x + 2, y + 4, _fit(value(cut), width - 4, SHEET_FONT_SIZE), SHEET_FONT_SIZE)
+            x += width
+        canvas.line(MARGIN, y, PAGE_WIDTH - MARGIN, y)
+        row += 1
+    yield canvas.content()
+
+
+def stream_labels_pdf(cuts, job_name: str, barcodes: bool = True):
+    """Byte chunks of a PDF of cut labels for a job (see iter_label_pages)."""
+    return stream_pdf(iter_label_pages(cuts, job_name, barcodes), title=f"{job_name} cut labels")
+
+
+def stream_sheet_pdf(cuts, job_name: str):
+    """Byte chunks of a PDF cut sheet for a job (see iter_sheet_pages)."""
+    return stream_pdf(iter_sheet_pages(cuts, job_name), title=f"{job_name} cut sheet")
+
+
+def spool(chunks, max_memory: int = 1024 * 1024):
+    """
+    Collect byte chunks in a temporary file (kept in memory up to max_memory bytes, then
+    on disk) and return it rewound, ready to hand to a download.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    for chunk in chunks:
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
@@ -0,0 +1,254 @@
+import csv
+import os
+import re
+import shlex
+from .client import connect
+from .config import REPL_HISTORY_PATH
+from .lengths import parse_length
+from .search import SearchIndex, normalize_size_query
+
+try:
+    import readline
+except ImportError:  # Windows without pyreadline: no line editing or history
+    readline = None
+
+HELP = """Commands (fittings are a type word or two and a size; omit them to reuse the last ones):
+  std   TYPE_A SIZE_A TYPE_B SIZE_B c2c LEN [shave] [g1a] [g1b] [note TEXT]
+  lay   TYPE_A SIZE_A LAYIN_TYPE LAYIN_SIZE TYPE_B SIZE_B c2c LEN lay LEN [shave] [note TEXT]
+  bush  TYPE_A SIZE_A BUSHING_SIZE TYPE_B SIZE_B c2c LEN [shave] [note TEXT]
+  LEN                 repeat the last command with a new C2C, e.g. 14-3/8
+  types               list connector types
+  sizes TYPE          list the sizes of a type
+  list                cuts calculated this session
+  file PATH           append every cut to a cut list CSV from now on
+  help, quit
+Example: std tee 2 elbow 2 c2c 14-3/8 shave"""
+
+# Request op and fittings of each command; the bushing is given by its size only
+COMMANDS = {
+    "std": ("standard", ("a", "b")),
+    "lay": ("lay_in", ("a", "lay_in", "b")),
+    "bush": ("bushing", ("a", "bushing", "b")),
+}
+FLAGS = {"shave": "shave", "g1a": "g1_a", "g1b": "g1_b"}
+KEYWORDS = {"c2c", "lay", "note"}
+
+# Columns of the cut list file; the cut-list upload in the Jobs tab reads Standard and Bushing rows
+CUT_LIST_COLUMNS = ["cut_type", "type_a", "size_a", "type_b", "size_b", "size_bushing", "type_lay_in",
+                    "size_lay_in", "c2c", "c2c_lay_in", "use_g1_a", "use_g1_b", "shave", "length",
+                    "length_fraction", "notes"]
+CUT_TYPES = {"standard": "Standard", "lay_in": "Lay-in", "bushing": "Bushing"}
+
+_SIZE = re.compile(r"^\d+(?:\.\d+)?(?:x\d+(?:\.\d+)?)*$|^\d+[\s-]+\d+/\d+$|^\d+/\d+$", re.IGNORECASE)
+
+
+def _is_size(token: str) -> bool:
+    return bool(_SIZE.match(token))
+
+
+class CutRepl:
+    """
+    Interactive calculator: one compact command per cut, catalogue loaded once.
+
+    Requests go through client.connect(), so a running daemon answers them, otherwise
+    they are computed in this process. The last fittings and flags of each command are
+    remembered, and every cut can be appended to a cut list CSV as it is calculated.
+    """
+
+    def __init__(self, calculator=None, cut_list_path: str = None):
+        self.calculator = calculator or connect()
+        reply = self.calculator.request({"op": "catalogue"})
+        self.catalogue = reply["types"]
+        self.type_index = SearchIndex(self.catalogue)
+        self.last = {}           # {command: request dict} of the last successful cut per command
+        self.last_command = None
+        self.cuts = []           # (request, reply) for every cut this session
+        self.cut_list_path = cut_list_path
+
+    def resolve_type(self, words: list) -> str:
+        """Connector type for the words typed, e.g. ['elbow'] -> 'Elbow 90(Socket x Socket)'."""
+        query = " ".join(words)
+        if query in self.catalogue:
+            return query
+        matches = self.type_index.search(query, limit=1)
+        if not matches:
+            raise ValueError(f"No connector type matches '{query}'. Type 'types' to list them")
+        return matches[0]
+
+    def parse(self, line: str) -> dict:
+        """
+        Request dict for one command line.
+        Raises ValueError for lines that can't be read.
+        """
+        tokens = shlex.split(line)
+        if len(tokens) == 1 and _is_size(tokens[0]) or tokens[0].lower() == "c2c":
+            # A bare length (or 'c2c LEN ...') repeats the last command with a new C2C
+            if self.last_command is None:
+                raise ValueError("Nothing to repeat yet")
+            tokens = [self.last_command] + (["c2c"] if _is_size(tokens[0]) else []) + tokens
+        command = tokens[0].lower()
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown command '{tokens[0]}'. Type 'help'")
+        op, roles = COMMANDS[command]
+
+        # Fittings up to the first keyword: type words followed by a size. A number is the size
+        # only when it ends its fitting ('elbow 90 2' is type 'elbow 90', size 2), i.e. no size
+        # follows it, or only the bushing's bare size when the next fitting is the bushing.
+        position = 1
+        while position < len(tokens) and tokens[position].lower() not in FLAGS.keys() | KEYWORDS:
+            position += 1
+        fitting_tokens = tokens[1:position]
+        sized = [_is_size(token) for token in fitting_tokens] + [False, False]
+        groups, words = [], []
+        for i, token in enumerate(fitting_tokens):
+            role = roles[len(groups)] if len(groups) < len(roles) else None
+            next_role = roles[len(groups) + 1] if len(groups) + 1 < len(roles) else None
+            if not sized[i]:
+                words.append(token)
+            elif (role == "bushing" and not words) or not sized[i + 1] \
+                    or (next_role == "bushing" and not sized[i + 2]):
+                groups.append((words, normalize_size_query(token)))
+                words = []
+            else:
+                words.append(token)
+        if words:
+            raise ValueError(f"'{' '.join(words)}' has no size")
+
+        previous = self.last.get(command, {})
+        request = {"op": op}
+        if groups:
+            if len(groups) != len(roles):
+                raise ValueError(f"'{command}' takes {len(roles)} fittings, got {len(groups)}")
+            for role, (type_words, size) in zip(roles, groups):
+                if role == "bushing":
+                    if type_words:
+                        raise ValueError(f"Give the bushing as a size only, not '{' '.join(type_words)} {size}'")
+                    request["size_bushing"] = size
+                elif not type_words:
+                    raise ValueError(f"Fitting {role.replace('_', '-')} needs a type before size {size}")
+                else:
+                    request[f"type_{role}"] = self.resolve_type(type_words)
+                    request[f"size_{role}"] = size
+        elif previous:
+            # Reuse the fittings, and unless new flags are given the flags and lay-in C2C
+            new_flags = FLAGS.keys() & {token.lower() for token in tokens}
+            reused = ("type_", "size_") if new_flags else ("type_", "size_", "shave", "g1_", "c2c_lay_in")
+            request.update({key: value for key, value in previous.items() if key.startswith(reused)})
+        else:
+            raise ValueError(f"No fittings given and no previous '{command}' cut to reuse")
+
+        c2c_key = "c2c_overall" if op == "lay_in" else "c2c"
+        while position < len(tokens):
+            keyword = tokens[position].lower()
+            if keyword == "note":
+                request["notes"] = " ".join(tokens[position + 1:])
+                break
+            if keyword in FLAGS:
+                request[FLAGS[keyword]] = True
+                position += 1
+                continue
+            if keyword not in KEYWORDS or position + 1 >= len(tokens):
+                raise ValueError(f"Expected a keyword and value at '{tokens[position]}'")
+            request[c2c_key if keyword == "c2c" else "c2c_lay_in"] = tokens[position + 1]
+            position += 2
+        for key in (c2c_key, "c2c_lay_in") if op == "lay_in" else (c2c_key,):
+            if key not in request:
+                raise ValueError(f"Missing {'lay' if key == 'c2c_lay_in' else 'c2c'} length")
+        return request
+
+    def calculate(self, line: str) -> str:
+        """Run one cut command and return the text to show."""
+        request = self.parse(line)
+        reply = self.calculator.request(request)
+        if not reply["ok"]:
+            raise ValueError(reply["error"])
+        command = next(name for name, (op, _) in COMMANDS.items() if op == request["op"])
+        self.last[command] = request
+        self.last_command = command
+        self.cuts.append((request, reply))
+        if self.cut_list_path:
+            self._append(request, reply)
+        return self._describe(len(self.cuts), request, reply)
+
+    def _describe(self, number: int, request: dict, reply: dict) -> str:
+        fittings = [f"{request[f'type_{role}']} {request[f'size_{role}']}" for role in ("a", "lay_in", "b")
+                    if f"type_{role}" in request]
+        if "size_bushing" in request:
+            fittings.insert(1, f"Bushing {request['size_bushing']}")
+        lines = [f"#{number} {CUT_TYPES[request['op']]}: {' -> '.join(fittings)}" + (" (shave)" if request.get("shave") else "")]
+        for i, (cut, text) in enumerate(zip(reply["cuts"], reply["text"]), 1):
+            label = f"Cut {i}" if len(reply["cuts"]) > 1 else "Cut"
+            lines.append(f"  {label} = {text} {reply['unit']} ({cut:.4f})")
+        return "\n".join(lines)
+
+    def _append(self, request: dict, reply: dict):
+        new_file = not os.path.exists(self.cut_list_path) or os.path.getsize(self.cut_list_path) == 0
+        with open(self.cut_list_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CUT_LIST_COLUMNS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            row = {key: request.get(key, "") for key in CUT_LIST_COLUMNS}
+            row.update(cut_type=CUT_TYPES[request["op"]],
+                       use_g1_a="yes" if request.get("g1_a") else "", use_g1_b="yes" if request.get("g1_b") else "",
+                       shave="yes" if request.get("shave") else "")
+            # C2C as the exact number calculated with, so the upload reads the same value
+            row["c2c"] = repr(float(parse_length(request["c2c_overall" if request["op"] == "lay_in" else "c2c"])))
+            if request["op"] == "lay_in":
+                row["c2c_lay_in"] = repr(float(parse_length(request["c2c_lay_in"])))
+            # One row per cut (lay-in gives two)
+            for cut, text in zip(reply["cuts"], reply["text"]):
+                writer.writerow({**row, "length": repr(cut), "length_fraction": text})
+
+    def execute(self, line: str) -> str:
+        """Run one line of input and return the text to show (raises EOFError on quit)."""
+        line = line.strip()
+        if not line:
+            return ""
+        command, _, argument = line.partition(" ")
+        command = command.lower()
+        if command in ("quit", "exit", "q"):
+            raise EOFError
+        if command in ("help", "?"):
+            return HELP
+        if command == "types":
+            return "\n".join(f"  {conn_type}" for conn_type in self.catalogue)
+        if command == "sizes":
+            conn_type = self.resolve_type(argument.split())
+            return f"{conn_type}: {', '.join(self.catalogue[conn_type])}"
+        if command == "list":
+            return "\n".join(self._describe(n, request, reply)
+                             for n, (request, reply) in enumerate(self.cuts, 1)) or "No cuts yet"
+        if command == "file":
+            if not argument.strip():
+                raise ValueError("Give a file path, e.g. file cuts.csv")
+            self.cut_list_path = os.path.abspath(os.path.expanduser(argument.strip()))
+            return f"Appending cuts to {self.cut_list_path}"
+        return self.calculate(line)
+
+    def run(self):
+        """Read commands until EOF or quit."""
+        if readline is not None:
+            try:
+                readline.read_history_file(REPL_HISTORY_PATH)
+            except OSError:
+                pass
+        print("PVC CUT CALCULATOR - type 'help' for commands")
+        try:
+            while True:
+                try:
+                    output = self.execute(input("cut> "))
+                except EOFError:
+                    print()
+                    break
+                except (ValueError, OSError, ArithmeticError) as e:
+                    # OSError covers a lost daemon connection and an unwritable cut list file
+                    output = f"Error: {e}"
+                if output:
+                    print(output)
+        finally:
+            if readline is not None:
+                try:
+                    readline.write_history_file(REPL_HISTORY_PATH)
+                except OSError:
+                    pass
+            self.calculator.close()
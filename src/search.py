@@ -0,0 +1,123 @@
+import heapq
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from .lengths import parse_length
+
+# Score for a query token that equals / starts / only fuzzily matches an entry token
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+FUZZY_MIN_SIMILARITY = 0.4
+
+_TOKEN = re.compile(r"[a-z]+|\d+(?:\.\d+)?(?:x\d+(?:\.\d+)?)*x?")
+_FRACTION_SIZE = re.compile(r"^\d+[\s-]+\d+/\d+$|^\d+/\d+$")
+
+
+def normalize_size_query(text: str) -> str:
+    """
+    Normalize a size as typed by a user to the catalogue's decimal form.
+    Example: '1-1/2' returns '1.5'; '2X2X1' returns '2x2x1'
+    """
+    text = text.strip().lower()
+    if _FRACTION_SIZE.match(text):
+        value = float(parse_length(text))
+        return str(int(value)) if value.is_integer() else str(value)
+    return text.replace(" ", "")
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word and size tokens, e.g. 'Tee (Reducing) 2x2x1' -> ['tee', 'reducing', '2x2x1']."""
+    return _TOKEN.findall(text.lower())
+
+
+def _trigrams(token: str) -> set:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Prefix + trigram index over short labels (connector types or sizes).
+
+    Tokens are kept in a sorted list so all tokens starting with a prefix are one bisect
+    away; a trigram table catches typos. Queries return the best-scoring labels first.
+    """
+
+    def __init__(self, labels):
+        self.labels = list(dict.fromkeys(labels))
+        postings = defaultdict(set)
+        for entry, label in enumerate(self.labels):
+            for token in tokenize(label) or [label.lower()]:
+                postings[token].add(entry)
+        self._tokens = sorted(postings)
+        self._postings = [postings[token] for token in self._tokens]
+        self._trigrams = defaultdict(set)
+        for position, token in enumerate(self._tokens):
+            for gram in _trigrams(token):
+                self._trigrams[gram].add(position)
+
+    def _token_scores(self, query_token: str) -> dict:
+        # Best score per entry for one query token
+        scores = {}
+        start = bisect_left(self._tokens, query_token)
+        position = start
+        while position < len(self._tokens) and self._tokens[position].startswith(query_token):
+            score = EXACT_SCORE if self._tokens[position] == query_token else PREFIX_SCORE
+            for entry in self._postings[position]:
+                if scores.get(entry, 0.0) < score:
+                    scores[entry] = score
+            position += 1
+        if scores:
+            return scores
+
+        # No prefix hit: fall back to trigram similarity (typos, transpositions)
+        query_grams = _trigrams(query_token)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for candidate in self._trigrams.get(gram, ()):
+                shared[candidate] += 1
+        for candidate, count in shared.items():
+            similarity = count / len(query_grams | _trigrams(self._tokens[candidate]))
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                for entry in self._postings[candidate]:
+                    if scores.get(entry, 0.0) < similarity:
+                        scores[entry] = similarity
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Labels matching every token of the query, best first (ties keep catalogue order).
+        An empty query returns the first `limit` labels.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return self.labels[:limit]
+        totals = None
+        for query_token in query_tokens:
+            scores = self._token_scores(query_token)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {entry: totals[entry] + score for entry, score in scores.items() if entry in totals}
+            if not totals:
+                return []
+        best = heapq.nsmallest(limit, totals.items(), key=lambda item: (-item[1], item[0]))
+        return [self.labels[entry] for entry, _ in best]
+
+
+class ConnectorSearchIndex:
+    """Search over connector type names and, per type, their normalized sizes."""
+
+    def __init__(self, connector_types, connector_sizes: dict):
+        self.types = SearchIndex(connector_types)
+        self._sizes = {conn_type: SearchIndex([str(size) for size in sizes])
+                       for conn_type, sizes in connector_sizes.items()}
+
+    def search_types(self, query: str, limit: int = 10) -> list:
+        return self.types.search(query, limit)
+
+    def search_sizes(self, conn_type: str, query: str, limit: int = 20) -> list:
+        index = self._sizes.get(conn_type)
+        if index is None:
+            return []
+        return index.search(normalize_size_query(query), limit)
@@ -0,0 +1,144 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import pandas as pd
+
+# Span categories
+SECTION = "section"     # a tab or other block of the page
+LOADER = "loader"       # offset lookups and cut calculations
+IMAGE = "image"         # connector image loading
+IO = "io"               # workbook, journal and config.py reads/writes
+WIDGETS = "widgets"     # section time not covered by another span (widget construction)
+
+# Reruns kept per session
+DEFAULT_WINDOW = 50
+
+# Streamlit runs each session's script in its own thread, so the active trace is per thread
+_active = threading.local()
+
+
+class RerunTrace:
+    """Spans recorded during one script run: (category, name, start offset, seconds, depth)."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.spans = []
+        self.total = None
+        self.status = "running"
+        self._depth = 0
+
+    @contextmanager
+    def span(self, category: str, name: str):
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.spans.append((category, name, start - self._start, time.perf_counter() - start, self._depth))
+
+    def finish(self, status: str = "complete"):
+        self.total = time.perf_counter() - self._start
+        self.status = status
+
+    def breakdown(self) -> list:
+        """
+        Spans as dicts, plus one WIDGETS row per section for the time not spent in nested spans.
+        """
+        rows = [{"category": c, "name": n, "start_ms": s * 1000, "ms": d * 1000, "depth": depth}
+                for c, n, s, d, depth in self.spans]
+        for category, name, start, seconds, depth in self.spans:
+            if category != SECTION:
+                continue
+            nested = sum(d for c, _, s, d, child_depth in self.spans
+                         if child_depth == depth + 1 and start <= s and s + d <= start + seconds)
+            rows.append({"category": WIDGETS, "name": name, "start_ms": start * 1000,
+                         "ms": max(seconds - nested, 0.0) * 1000, "depth": depth + 1})
+        return rows
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "status": self.status,
+            "total_ms": None if self.total is None else self.total * 1000,
+            "spans": self.breakdown(),
+        }
+
+
+class RerunTracer:
+    """
+    Rolling window of rerun traces for one session.
+
+    begin() at the top of the script, end() at the bottom. A rerun cut short by
+    st.rerun()/st.stop() is closed as 'interrupted' by the next begin().
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.traces = deque(maxlen=window)
+        self.current = None
+
+    def begin(self) -> RerunTrace:
+        if self.current is not None and self.current.total is None:
+            self.current.finish("interrupted")
+        self.current = RerunTrace()
+        self.traces.append(self.current)
+        _active.trace = self.current
+        return self.current
+
+    def end(self):
+        if self.current is not None and self.current.total is None:
+            self.current.finish()
+        _active.trace = None
+
+    def summary(self) -> pd.DataFrame:
+        """Per (category, name): runs, mean / p95 / max milliseconds over the finished reruns."""
+        rows = [dict(span, rerun=i) for i, trace in enumerate(self.traces) if trace.total is not None
+                for span in trace.breakdown()]
+        rows += [{"category": "rerun", "name": "total", "ms": trace.total * 1000, "rerun": i}
+                 for i, trace in enumerate(self.traces) if trace.total is not None]
+        if not rows:
+            return pd.DataFrame(columns=["category", "name", "calls", "mean_ms", "p95_ms", "max_ms"])
+        # Several calls in one rerun count as one sample of their summed time
+        per_rerun = pd.DataFrame(rows).groupby(["category", "name", "rerun"])["ms"].agg(["sum", "count"])
+        grouped = per_rerun.groupby(level=["category", "name"])
+        return pd.DataFrame({
+            "calls": grouped["count"].sum(),
+            "mean_ms": grouped["sum"].mean(),
+            "p95_ms": grouped["sum"].quantile(0.95),
+            "max_ms": grouped["sum"].max(),
+        }).reset_index().sort_values("mean_ms", ascending=False, ignore_index=True)
+
+    def export_jsonl(self) -> str:
+        """One JSON line per rerun in the window."""
+        return "".join(json.dumps(trace.to_dict()) + "\n" for trace in self.traces)
+
+
+@contextmanager
+def section(category: str, name: str):
+    """Time a block in the active rerun trace (no-op outside a traced rerun)."""
+    trace = getattr(_active, "trace", None)
+    if trace is None:
+        yield
+        return
+    with trace.span(category, name):
+        yield
+
+
+def traced(category: str, name: str = None):
+    """Decorator: time every call of a function as a span of the given category."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = getattr(_active, "trace", None)
+            if trace is None:
+                return func(*args, **kwargs)
+            with trace.span(category, label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
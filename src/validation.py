@@ -0,0 +1,161 @@
+import os
+import threading
+from fractions import Fraction
+import pandas as pd
+from .config import OFFSET_COLUMN, OFFSET_COLUMN_G1, SUPPORTED_CONNECTOR_TYPES
+
+# An offset larger than this multiple of the largest nominal dimension in the size is suspicious
+OUTLIER_RATIO = 1.5
+
+# Sizes are a decimal, or two/three decimals joined by 'x' (bushings, reducing tees)
+SIZE_PATTERN = r"^\d+(?:\.\d+)?(?:x\d+(?:\.\d+)?){0,2}$"
+
+ISSUE_COLUMNS = ["row", "part", "size", "check", "message"]
+
+# Accepted headers (lowercased) of the Database sheet's part and size columns
+PART_COLUMN_NAMES = {"part", "part name", "part_type", "connection_type"}
+SIZE_COLUMN_NAMES = {"size", "size (inches)", "size(inches)", "size_inches", "size (in.)", "size_in"}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def parse_offset_column(values: pd.Series):
+    """
+    Parse an offset column. Returns (numeric Series, mask of present-but-unparseable cells).
+    Numbers convert in one vectorized step; only leftover strings ('15/32') are parsed one by one.
+    """
+    numeric = pd.to_numeric(values, errors="coerce")
+    leftovers = numeric.isna() & values.notna() & (values.astype(str).str.strip() != "")
+    bad = pd.Series(False, index=values.index)
+    for row in values.index[leftovers]:
+        try:
+            numeric[row] = float(Fraction(str(values[row]).strip()))
+        except (ValueError, ZeroDivisionError):
+            bad[row] = True
+    return numeric, bad
+
+
+def find_part_size_columns(columns) -> tuple:
+    """
+    Names of the Database sheet's part and size columns, e.g. ('Part', 'Size (inches)').
+    Raises ValueError if either is missing.
+    """
+    found_part = next((c for c in columns if str(c).strip().lower() in PART_COLUMN_NAMES), None)
+    found_size = next((c for c in columns if str(c).strip().lower() in SIZE_COLUMN_NAMES), None)
+    if found_part is None or found_size is None:
+        raise ValueError(
+            "Database sheet must contain a 'Part' column and a 'Size' column (e.g. 'Size (inches)')."
+        )
+    return found_part, found_size
+
+
+def normalize_size_column(sizes: pd.Series) -> pd.Series:
+    # Same normalization as DimensionLoader._normalize_size_value, column-wise
+    text = sizes.astype(str).str.strip().str.lower()
+    numeric = pd.to_numeric(text, errors="coerce")
+    as_number = numeric.map(lambda v: str(int(v)) if float(v).is_integer() else str(v), na_action="ignore")
+    return as_number.where(numeric.notna() & ~text.str.contains("x"), text).where(sizes.notna(), "")
+
+
+def validate_catalogue(df: pd.DataFrame, part_col: str, size_col: str, supported_types: list = None) -> pd.DataFrame:
+    """
+    Check the whole Database sheet at once and return one row per issue.
+
+    Checks: duplicate (type, size) keys, unparseable Offset / Offset (G1) values,
+    missing offsets, zero or negative offsets, outliers relative to the nominal size,
+    sizes that don't match SIZE_PATTERN, and parts not in supported_types
+    (default SUPPORTED_CONNECTOR_TYPES). Fully blank separator rows are ignored.
+    'row' is the spreadsheet row number (journal rows follow the workbook's).
+    """
+    supported_types = SUPPORTED_CONNECTOR_TYPES if supported_types is None else supported_types
+    rows = df[df.notna().any(axis=1)]
+    part = rows[part_col].astype(str).str.strip().where(rows[part_col].notna(), "")
+    size = normalize_size_column(rows[size_col])
+    issues = []
+
+    def report(mask, check, message):
+        if mask.any():
+            hit = rows.index[mask]
+            messages = message[mask] if isinstance(message, pd.Series) else message
+            issues.append(pd.DataFrame({
+                "row": hit + 2, "part": part[mask].values, "size": size[mask].values,
+                "check": check, "message": messages,
+            }))
+
+    report(part == "", "missing part", "Row has no Part")
+    report((part != "") & ~part.isin(supported_types), "unsupported type",
+           "Part is not in SUPPORTED_CONNECTOR_TYPES and is ignored by the loader")
+    report(size == "", "missing size", "Row has no Size")
+    report((size != "") & ~size.str.match(SIZE_PATTERN), "size format",
+           "Size does not look like '2', '1.5' or '2x2x1'")
+
+    keyed = (part != "") & (size != "")
+    duplicate = keyed & pd.Series(list(zip(part, size)), index=rows.index).duplicated(keep=False)
+    report(duplicate, "duplicate", "Same Part and Size appear more than once; lookups use the first row")
+
+    offset, bad_offset = parse_offset_column(rows[OFFSET_COLUMN])
+    report(bad_offset, "unparseable offset", "Offset is not a number or fraction: " + rows[OFFSET_COLUMN].astype(str))
+    report(keyed & offset.isna() & ~bad_offset, "missing offset", "Row has no Offset")
+    report(offset <= 0, "non-positive offset", "Offset must be greater than zero")
+
+    dimensions = size.where(size.str.match(SIZE_PATTERN), "").str.split("x", expand=True)
+    largest = dimensions.apply(pd.to_numeric, errors="coerce").max(axis=1)
+    report(offset > largest * OUTLIER_RATIO, "outlier offset",
+           f"Offset is more than {OUTLIER_RATIO}x the largest nominal size")
+
+    if OFFSET_COLUMN_G1 in rows.columns:
+        g1, bad_g1 = parse_offset_column(rows[OFFSET_COLUMN_G1])
+        report(bad_g1, "unparseable G1", "Offset (G1) is not a number or fraction: " + rows[OFFSET_COLUMN_G1].astype(str))
+        report(g1 <= 0, "non-positive G1", "Offset (G1) must be greater than zero")
+        report(g1 > largest * OUTLIER_RATIO, "outlier G1",
+               f"Offset (G1) is more than {OUTLIER_RATIO}x the largest nominal size")
+
+    if not issues:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    return pd.concat(issues, ignore_index=True).sort_values(["row", "check"], ignore_index=True)
+
+
+def _stamp(path):
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_validation_report(excel_path: str, df: pd.DataFrame, part_col: str, size_col: str,
+                          journal_path: str = None, supported_types: list = None) -> pd.DataFrame:
+    """
+    validate_catalogue, cached per workbook version (path, modification time and size,
+    plus the journal's), so every loader built from the same files shares one report.
+    """
+    try:
+        stat = os.stat(excel_path)
+        key = (os.path.abspath(excel_path), stat.st_mtime_ns, stat.st_size, _stamp(journal_path),
+               tuple(supported_types or ()))
+    except (OSError, TypeError):
+        return validate_catalogue(df, part_col, size_col, supported_types)
+    with _cache_lock:
+        report = _cache.get(key)
+    if report is None:
+        report = validate_catalogue(df, part_col, size_col, supported_types)
+        with _cache_lock:
+            # Only the latest version of each workbook is worth keeping
+            for old_key in [k for k in _cache if k[0] == key[0]]:
+                del _cache[old_key]
+            _cache[key] = report
+    return report
+
+
+if __name__ == "__main__":
+    from .config import EXCEL_PATH, JOURNAL_PATH
+    from .loader import DimensionLoader
+
+    issues = DimensionLoader(EXCEL_PATH, journal_path=JOURNAL_PATH).validation_report
+    if issues.empty:
+        print("No catalogue issues found.")
+    else:
+        print(issues.to_string(index=False))
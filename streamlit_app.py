@@ -1,143 +1,90 @@
 import streamlit as st
+import copy
+import functools
 import sys
+import time
 from pathlib import Path
 from PIL import Image
 import os
 import pandas as pd
-import re
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.loader import DimensionLoader
+from src.catalogue import CatalogueOverlay, SharedCatalogue
+from src.catalogue_watcher import CatalogueWatcher
+from src.catalogue_writer import CatalogueWriter
 from src.api import get_cut_length, get_lay_in_cuts, get_bushing_cut
-from src.config import EXCEL_PATH, SUPPORTED_CONNECTOR_TYPES, CONNECTOR_SIZES
-from src.main import decimal_to_fraction_16ths
+from src.config import EXCEL_PATH, JOURNAL_PATH, JOURNAL_COMPACT_INTERVAL, OFFSET_TABLE_PATH, SUPPORTED_CONNECTOR_TYPES, CONNECTOR_SIZES
+from src.catalogue_journal import CatalogueJournal, ADD_TYPE, ADD_SIZE, DELETE_TYPE, DELETE_SIZE, UPDATE_OFFSET
+from src.formatting import DEFAULT_FORMATTER, format_length
+from src.bundle import bundle_html, bundle_stamp
+from src.print_output import spool, stream_labels_pdf, stream_sheet_pdf
+from src.lengths import SHAVE_INCHES, SHAVE_TEXT
+from src.job_queue import CutJobQueue
+from src.job_store import CutJob
+from src.cut_list import read_cut_list, compute_cut_list
+from src.fitting_import import read_fitting_import, plan_fitting_import, apply_fitting_import, NEW_TYPE, NEW_SIZE, UPDATE
+from src.search import ConnectorSearchIndex
+from src.tracing import RerunTracer, section, traced, SECTION, LOADER, IMAGE, IO
+
+# Calculation entry points show up as loader spans in the rerun tracer
+get_cut_length, get_lay_in_cuts, get_bushing_cut, compute_cut_list = (
+    traced(LOADER)(func) for func in (get_cut_length, get_lay_in_cuts, get_bushing_cut, compute_cut_list))
+read_cut_list = traced(IO)(read_cut_list)
+
+# Selectors with more options than this get a search box and show only the top matches
+SEARCH_THRESHOLD = 25
+SEARCH_LIMIT = 20
+
+# Job checklists show this many cuts per page
+CHECKLIST_PAGE_SIZE = 50
+
+# Seconds between progress updates of running bulk cut lists
+BULK_CUT_REFRESH_SECONDS = 1.0
 
 # ============================================================================
 # HELPER FUNCTIONS FOR PERMANENT DATABASE STORAGE
 # ============================================================================
 
-def save_connector_to_excel(connector_type: str, sizes_list: list):
-    """Save new connector type and sizes to Excel database."""
-    try:
-        # Read existing Excel file
-        df = pd.read_excel(EXCEL_PATH, sheet_name="Database")
-        
-        # Create new rows for each size
-        new_rows = []
-        for size_data in sizes_list:
-            new_row = {
-                'Part': connector_type,
-                'Size': size_data['size'],
-                'Offset': size_data['offset'],
-                'Offset (G1)': size_data['g1_offset'] if size_data['g1_offset'] > 0 else None
-            }
-            new_rows.append(new_row)
-        
-        # Append new rows to dataframe
-        new_df = pd.DataFrame(new_rows)
-        df = pd.concat([df, new_df], ignore_index=True)
-        
-        # Save back to Excel
-        with pd.ExcelWriter(EXCEL_PATH, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Database', index=False)
-        
-        return True
-    except Exception as e:
-        st.error(f"Error saving to Excel: {e}")
-        return False
+def journal_user() -> str:
+    """Name recorded with catalogue edits (entered in Manage Fittings)."""
+    return st.session_state.get('journal_user', '').strip() or "anonymous"
 
-def add_new_connector_to_config(connector_type: str, sizes_list: list, image_filename: str = None):
-    """Add a completely new connector type to config.py."""
+def current_sizes_data(connector_type: str, size: str = None) -> list:
+    """Current offsets of a connector type (or one size) as size dicts, kept in the journal for undo."""
+    loader = get_catalogue_watcher().current()
+    sizes = loader.snapshot.offsets.get(connector_type, {})
+    wanted = None if size is None else set(loader.size_changes([size], remove=True))
+    return [{'size': s, 'offset': entry.offset, 'g1_offset': entry.g1_offset}
+            for s, entry in sizes.items() if wanted is None or s in wanted]
+
+@traced(IO)
+def save_connector_to_journal(connector_type: str, sizes_list: list):
+    """Queue a new connector type or new sizes for the catalogue journal (folded into the Excel database later)."""
     try:
-        import re
-        config_path = Path(__file__).parent / "src" / "config.py"
-        
-        with open(config_path, 'r') as f:
-            content = f.read()
-        
-        # Add to SUPPORTED_CONNECTOR_TYPES
-        old_supported = 'SUPPORTED_CONNECTOR_TYPES = [\n    "Tee (Socket x Socket x Socket)",\n    "Tee (Reducing)",\n    "Bushing (Spigot x Socket)",\n    "Elbow 90(Socket x Socket)",\n    "Union (Socket x Socket)",\n]'
-        new_supported = f'SUPPORTED_CONNECTOR_TYPES = [\n    "Tee (Socket x Socket x Socket)",\n    "Tee (Reducing)",\n    "Bushing (Spigot x Socket)",\n    "Elbow 90(Socket x Socket)",\n    "Union (Socket x Socket)",\n    "{connector_type}",\n]'
-        content = content.replace(old_supported, new_supported)
-        
-        # Add to CONNECTOR_SIZES
-        sizes_str = str([s['size'] for s in sizes_list])
-        old_ending = '    "Union (Socket x Socket)": ["1.5", "2", "2.5", "3", "4"],\n}'
-        new_ending = f'    "Union (Socket x Socket)": ["1.5", "2", "2.5", "3", "4"],\n    "{connector_type}": {sizes_str},\n}}'
-        content = content.replace(old_ending, new_ending)
-        
-        # Add to CONNECTOR_IMAGE_MAP if image provided
-        if image_filename:
-            old_image_ending = '    "Union (Socket x Socket)": "union.png",\n}'
-            new_image_ending = f'    "Union (Socket x Socket)": "union.png",\n    "{connector_type}": "{image_filename}",\n}}'
-            content = content.replace(old_image_ending, new_image_ending)
-        
-        with open(config_path, 'w') as f:
-            f.write(content)
-        
+        op = ADD_SIZE if connector_type in get_catalogue_watcher().current().snapshot.offsets else ADD_TYPE
+        # Sizes that already exist are replaced; their old offsets let undo restore them
+        previous = [size_data for new_size in sizes_list
+                    for size_data in current_sizes_data(connector_type, new_size['size'])] if op == ADD_SIZE else []
+        get_catalogue_writer().append(op, connector_type, sizes_list, user=journal_user(), previous=previous or None)
         return True
     except Exception as e:
-        st.error(f"Error adding new connector to config.py: {e}")
+        st.error(f"Error saving to the catalogue journal: {e}")
         return False
 
-def add_size_to_existing_connector_in_config(connector_type: str, new_size: str):
-    """Add a single size to an existing connector type in config.py."""
+@traced(IO)
+def update_config_py(connector_type: str, sizes_list: list, image_filename: str = None):
+    """Queue adding a connector type or sizes (and optionally its image mapping) to src/config.py."""
     try:
-        import re
-        config_path = Path(__file__).parent / "src" / "config.py"
-        
-        with open(config_path, 'r') as f:
-            content = f.read()
-        
-        # Find the existing size list for this connector (escape special regex chars in connector_type)
-        escaped_type = re.escape(connector_type)
-        pattern = f'"{escaped_type}": \\[(.*?)\\]'
-        match = re.search(pattern, content, re.DOTALL)
-        
-        if match:
-            existing_str = match.group(1)
-            # Extract existing sizes
-            existing_sizes = [item.strip().strip('"').strip("'") for item in existing_str.split(',') if item.strip()]
-            
-            # Add new size if not already present
-            if new_size not in existing_sizes:
-                existing_sizes.append(new_size)
-            
-            # Reconstruct the size list
-            sizes_str = str(existing_sizes)
-            replacement = f'"{connector_type}": {sizes_str}'
-            content = re.sub(pattern, replacement, content, flags=re.DOTALL)
-            
-            with open(config_path, 'w') as f:
-                f.write(content)
-            return True
-        else:
-            st.error(f"Connector type '{connector_type}' not found in config")
-            return False
+        get_catalogue_writer().add_to_config({connector_type: [s['size'] for s in sizes_list]},
+                                             {connector_type: image_filename} if image_filename else None)
+        return True
     except Exception as e:
-        st.error(f"Error adding size to connector in config.py: {e}")
+        st.error(f"Error updating config.py: {e}")
         return False
 
-def update_config_py(connector_type: str, sizes_list: list, image_filename: str = None):
-    """Update src/config.py with new connector type, sizes, and optionally image mapping.
-    
-    This is a wrapper that determines whether to add a new connector or update existing one.
-    """
-    from src.config import SUPPORTED_CONNECTOR_TYPES
-    
-    # Check if this is a new connector type
-    if connector_type not in SUPPORTED_CONNECTOR_TYPES:
-        # New connector - add all sizes at once
-        return add_new_connector_to_config(connector_type, sizes_list, image_filename)
-    else:
-        # Existing connector - add individual sizes
-        for size_data in sizes_list:
-            if not add_size_to_existing_connector_in_config(connector_type, size_data['size']):
-                return False
-        return True
-
+@traced(IO)
 def delete_connector_image(connector_type: str):
     """Delete image file associated with a connector type from images/ folder."""
     try:
@@ -153,45 +100,53 @@ def delete_connector_image(connector_type: str):
         st.warning(f"Could not delete image file: {e}")
         return True
 
-def delete_connector_from_excel(connector_type: str, size: str = None):
-    """Delete connector type or specific size from Excel database."""
+@traced(IO)
+def delete_connector_from_journal(connector_type: str, size: str = None):
+    """Queue the deletion of a connector type or specific size for the catalogue journal."""
     try:
-        df = pd.read_excel(EXCEL_PATH, sheet_name="Database")
+        previous = current_sizes_data(connector_type, size)
+        writer = get_catalogue_writer()
         if size:
-            df = df[~((df['Part'] == connector_type) & (df['Size'] == size))]
+            writer.append(DELETE_SIZE, connector_type, [size], user=journal_user(), previous=previous)
         else:
-            df = df[df['Part'] != connector_type]
-        
-        with pd.ExcelWriter(EXCEL_PATH, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Database', index=False)
+            writer.append(DELETE_TYPE, connector_type, user=journal_user(), previous=previous)
         return True
     except Exception as e:
-        st.error(f"Error deleting from Excel: {e}")
+        st.error(f"Error saving to the catalogue journal: {e}")
         return False
 
+@traced(IO)
 def delete_connector_from_config(connector_type: str, size: str = None):
-    """Delete connector type or specific size from src/config.py."""
+    """Queue removing a connector type or specific size from src/config.py."""
     try:
-        config_path = Path(__file__).parent / "src" / "config.py"
-        with open(config_path, 'r') as f:
-            content = f.read()
-        
-        if size:
-            lines = content.split('\n')
-            content = '\n'.join([line for line in lines if not (f'"{connector_type}"' in line and f'"{size}"' in line)])
-        else:
-            # Remove entire connector type from all config lists
-            content = content.replace(f'    "{connector_type}",\n', '')
-            content = re.sub(f'    "{connector_type}": .*?\n', '', content)
-            content = re.sub(f'    "{connector_type}": "[^"]*",\n', '', content)
-        
-        with open(config_path, 'w') as f:
-            f.write(content)
+        get_catalogue_writer().remove_from_config(connector_type, size)
         return True
     except Exception as e:
         st.error(f"Error updating config.py: {e}")
         return False
 
+def apply_journal_entry_to_session(entry: dict):
+    """Bring this session's type/size lists and config.py in line with a journal entry (used by undo)."""
+    conn_type = entry['type']
+    sizes = [size_data['size'] for size_data in entry['sizes']]
+    overlay = st.session_state.catalogue_overlay
+    if entry['op'] == DELETE_TYPE:
+        overlay.remove_type(conn_type)
+        delete_connector_from_config(conn_type)
+    elif entry['op'] == DELETE_SIZE:
+        overlay.remove_sizes(conn_type, sizes)
+        for size in sizes:
+            delete_connector_from_config(conn_type, size)
+    elif entry['op'] in (ADD_TYPE, ADD_SIZE):
+        if conn_type not in overlay.types():
+            overlay.add_type(conn_type, sizes)
+        else:
+            overlay.add_sizes(conn_type, sizes)
+        update_config_py(conn_type, entry['sizes'])
+    for size in sizes:
+        overlay.offsets.pop((conn_type, size), None)
+
+@traced(IO)
 def save_image_to_folder(image_obj, filename: str):
     """Save image to images/ folder. Accepts both Streamlit uploaded files and PIL Images."""
     try:
@@ -209,30 +164,132 @@ def save_image_to_folder(image_obj, filename: str):
         st.error(f"Error saving image: {e}")
         return False
 
+@st.cache_resource
+def get_catalogue_watcher():
+    """Catalogue shared by every session, reloaded in the background when the workbook changes."""
+    return CatalogueWatcher(EXCEL_PATH, journal_path=JOURNAL_PATH, compact_interval=JOURNAL_COMPACT_INTERVAL,
+                            table_path=OFFSET_TABLE_PATH).start()
+
+@st.cache_resource
+def get_catalogue_writer():
+    """Write-behind queue that saves catalogue edits to the journal and config.py in the background."""
+    writer = CatalogueWriter(CatalogueJournal(JOURNAL_PATH), config_path=str(Path(__file__).parent / "src" / "config.py"))
+    # Workbook reloads re-apply edits that are published but still queued
+    get_catalogue_watcher().pending_entries = writer.queued_entries
+    return writer.start()
+
+@st.cache_resource
+def get_shared_catalogue():
+    """Connector types and sizes from config.py, shared read-only by every session."""
+    return SharedCatalogue(SUPPORTED_CONNECTOR_TYPES, CONNECTOR_SIZES)
+
+@st.cache_resource(max_entries=16)
+def build_connector_search_index(_overlay: CatalogueOverlay, edits: tuple):
+    """Search index for one set of session edits (sessions with the same edits share it)."""
+    types = list(_overlay.types())
+    return ConnectorSearchIndex(types, {conn_type: list(_overlay.sizes(conn_type)) for conn_type in types})
+
+def get_connector_search_index():
+    """Search index over this session's connector types and sizes."""
+    overlay = st.session_state.catalogue_overlay
+    return build_connector_search_index(overlay, overlay.diff_key())
+
+@st.cache_resource
+def get_cut_job_queue():
+    """Background worker pool shared by every session (one per server process)."""
+    return CutJobQueue()
+
+def parse_bulk_cut_text(text: str):
+    """Parse pasted cut-list lines into cut specs. Returns (specs, errors).
+
+    One cut per line, comma or tab separated:
+    Type A, Size A, Type B, Size B, C2C[, Shave y/n][, Notes]
+    """
+    specs, errors = [], []
+    for line_num, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        fields = [f.strip() for f in line.split('\t' if '\t' in line else ',')]
+        if len(fields) < 5:
+            errors.append(f"Line {line_num}: expected at least 5 values, got {len(fields)}")
+            continue
+        specs.append({
+            'type': 'Standard',
+            'type_a': fields[0],
+            'size_a': fields[1],
+            'type_b': fields[2],
+            'size_b': fields[3],
+            'c2c': fields[4],
+            'shave': len(fields) > 5 and fields[5].lower() in ('y', 'yes', 'true', '1'),
+            'notes': ', '.join(fields[6:]),
+        })
+    return specs, errors
+
+def collect_bulk_cut_results() -> int:
+    """
+    Append cuts finished by background jobs to their jobs, in one state update per job.
+    Returns the number of bulk jobs that finished.
+    """
+    queue = get_cut_job_queue()
+    finished_jobs = 0
+    for job_id in list(st.session_state.bulk_cut_jobs):
+        bulk_job = queue.get(job_id)
+        if bulk_job is None:
+            st.session_state.bulk_cut_jobs.remove(job_id)
+            continue
+        finished = bulk_job.finished
+        new_cuts = bulk_job.take_results()
+        if new_cuts and bulk_job.job_name in st.session_state.jobs:
+            st.session_state.jobs[bulk_job.job_name].extend(new_cuts)
+        if finished:
+            st.session_state.bulk_cut_jobs.remove(job_id)
+            st.session_state.bulk_cut_history.append({'job_id': job_id, **bulk_job.progress()})
+            queue.forget(job_id)
+            finished_jobs += 1
+    return finished_jobs
+
+def show_bulk_cut_progress():
+    """Progress of this session's bulk cut lists; runs as a fragment that refreshes itself while they run."""
+    if collect_bulk_cut_results():
+        # Show the new cuts in the job list too
+        st.rerun()
+    for job_id in st.session_state.bulk_cut_jobs:
+        bulk_job = get_cut_job_queue().get(job_id)
+        if bulk_job is not None:
+            progress = bulk_job.progress()
+            st.progress(progress['fraction'], text=f"{bulk_job.job_name}: {progress['done']}/{progress['total']} cuts ({progress['status']})")
+    
+    for finished_job in st.session_state.bulk_cut_history[-3:]:
+        st.caption(f"Cut list #{finished_job['job_id']}: {finished_job['computed']} cuts added, "
+                   f"{len(finished_job['errors'])} errors ({finished_job['status']})")
+        for row, message in finished_job['errors']:
+            st.caption(f"Cut {row + 1}: {message}")
+
 def init_session_state():
     """Initialize session state variables."""
-    if 'loader' not in st.session_state:
-        try:
-            st.session_state.loader = DimensionLoader(EXCEL_PATH)
-        except Exception as e:
-            st.error(f"Error loading database: {e}")
-            st.stop()
-    
-    if 'connector_types_modified' not in st.session_state:
-        st.session_state.connector_types_modified = list(SUPPORTED_CONNECTOR_TYPES)
-    
-    if 'connector_sizes_modified' not in st.session_state:
-        st.session_state.connector_sizes_modified = dict(CONNECTOR_SIZES)
+    try:
+        get_catalogue_watcher()
+    except Exception as e:
+        st.error(f"Error loading database: {e}")
+        st.stop()
     
-    if 'connector_offsets' not in st.session_state:
-        st.session_state.connector_offsets = {}
+    # Only this session's edits; the type/size lists themselves are shared
+    if 'catalogue_overlay' not in st.session_state:
+        st.session_state.catalogue_overlay = CatalogueOverlay(get_shared_catalogue())
     
     if 'jobs' not in st.session_state:
         st.session_state.jobs = {}
     
     if 'current_job' not in st.session_state:
         st.session_state.current_job = None
+    
+    if 'bulk_cut_jobs' not in st.session_state:
+        st.session_state.bulk_cut_jobs = []
+    
+    if 'bulk_cut_history' not in st.session_state:
+        st.session_state.bulk_cut_history = []
 
+@traced(IMAGE)
 def display_connector_image(connector_type: str, width: int = 150, flip: bool = False):
     """Display image for the selected connector type. Optionally flip the image horizontally."""
     from src.config import CONNECTOR_IMAGE_MAP
@@ -260,21 +317,41 @@ def display_connector_image(connector_type: str, width: int = 150, flip: bool =
         except Exception:
             pass
 
+def search_selectbox(label: str, options: list, conn_type: str = None, key: str = None, label_visibility: str = "visible"):
+    """Selectbox for connector types (or sizes of conn_type) that renders only the top search
+    matches once there are more than SEARCH_THRESHOLD options."""
+    if len(options) <= SEARCH_THRESHOLD:
+        return st.selectbox(label, options, key=key, label_visibility=label_visibility)
+    
+    query = st.text_input(f"Search {label}", key=f"{key}_search", placeholder="Type to search...",
+                          label_visibility=label_visibility)
+    search_index = get_connector_search_index()
+    if conn_type is not None:
+        matches = search_index.search_sizes(conn_type, query, SEARCH_LIMIT)
+    else:
+        matches = search_index.search_types(query, SEARCH_LIMIT)
+    if not matches:
+        # Keep a selection (callers look up images and offsets with it): offer everything
+        st.caption("No matches, showing all")
+        matches = options
+    return st.selectbox(label, matches, key=key, label_visibility=label_visibility)
+
 def select_connector_pair(col1_label: str, col2_label: str, key_prefix: str):
     """Helper function to select two connectors. Returns (type_a, size_a, type_b, size_b)."""
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown(f"**{col1_label}**")
-        type_a = st.selectbox(
+        type_a = search_selectbox(
             f"{col1_label} Type",
-            st.session_state.connector_types_modified,
+            st.session_state.catalogue_overlay.types(),
             key=f"{key_prefix}_type_a",
             label_visibility="collapsed"
         )
-        size_a = st.selectbox(
+        size_a = search_selectbox(
             f"{col1_label} Size",
-            st.session_state.connector_sizes_modified.get(type_a, []),
+            st.session_state.catalogue_overlay.sizes(type_a),
+            conn_type=type_a,
             key=f"{key_prefix}_size_a",
             label_visibility="collapsed"
         )
@@ -282,15 +359,16 @@ def select_connector_pair(col1_label: str, col2_label: str, key_prefix: str):
     
     with col2:
         st.markdown(f"**{col2_label}**")
-        type_b = st.selectbox(
+        type_b = search_selectbox(
             f"{col2_label} Type",
-            st.session_state.connector_types_modified,
+            st.session_state.catalogue_overlay.types(),
             key=f"{key_prefix}_type_b",
             label_visibility="collapsed"
         )
-        size_b = st.selectbox(
+        size_b = search_selectbox(
             f"{col2_label} Size",
-            st.session_state.connector_sizes_modified.get(type_b, []),
+            st.session_state.catalogue_overlay.sizes(type_b),
+            conn_type=type_b,
             key=f"{key_prefix}_size_b",
             label_visibility="collapsed"
         )
@@ -352,12 +430,23 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Time this rerun (shown in the diagnostics panel: add ?diagnostics=1 to the URL)
+if 'rerun_tracer' not in st.session_state:
+    st.session_state.rerun_tracer = RerunTracer()
+st.session_state.rerun_tracer.begin()
+
 # Initialize session state
-init_session_state()
+with section(SECTION, "init_session_state"):
+    init_session_state()
 
-# Update loader with session offsets
-loader = st.session_state.loader
-loader.session_offsets = st.session_state.connector_offsets
+# Pin this rerun to the current catalogue; a shallow copy shares the loaded data
+# and keeps this session's offsets off the shared loader
+catalogue_watcher = get_catalogue_watcher()
+loader = copy.copy(catalogue_watcher.current())
+loader.session_offsets = st.session_state.catalogue_overlay.offsets
+
+# Pick up cuts finished by background cut-list jobs since the last rerun
+collect_bulk_cut_results()
 
 # Title and description
 st.title("🔧 PVC Cut Calculator")
@@ -369,7 +458,7 @@ jobs_tab, standard_tab, layin_tab, bushing_tab, manage_tab = st.tabs(["Jobs", "S
 # ============================================================================
 # TAB 1: STANDARD CUT (single cut between two connectors)
 # ============================================================================
-with standard_tab:
+with standard_tab, section(SECTION, "Standard Cut tab"):
     st.subheader("Standard Cut (Center-to-Center)")
     st.markdown("Calculate a single cut between two connectors.")
     
@@ -416,7 +505,7 @@ with standard_tab:
     
     with col2:
         include_shave = st.checkbox(
-            "Include Shave (-1/16\")",
+            f"Include Shave (-{SHAVE_TEXT}\")",
             value=False,
             key="std_shave"
         )
@@ -436,7 +525,7 @@ with standard_tab:
             )
             
             if include_shave:
-                cut_length -= 1/16
+                cut_length -= SHAVE_INCHES
             
             # Display result
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
@@ -446,7 +535,7 @@ with standard_tab:
             with col1:
                 st.markdown(f"**Decimal:** {cut_length:.5f}\"")
             with col2:
-                st.markdown(f"**Fraction (1/16ths):** {decimal_to_fraction_16ths(cut_length)}")
+                st.markdown(f"**Fraction ({DEFAULT_FORMATTER.label}):** {format_length(cut_length)}")
             
             st.markdown("---")
             st.markdown("**Calculation Details:**")
@@ -461,7 +550,7 @@ with standard_tab:
 # ============================================================================
 # TAB 2: LAY-IN CUT (three fittings: A -> Lay-in -> B)
 # ============================================================================
-with layin_tab:
+with layin_tab, section(SECTION, "Lay-in Cut tab"):
     st.subheader("Lay-in Cut (Three Fittings)")
     st.markdown("Calculate two cuts for lay-in connector configuration: Fitting A -> Lay-in Fitting -> Fitting B")
     
@@ -469,15 +558,16 @@ with layin_tab:
     
     with col1:
         st.markdown("**Fitting A**")
-        type_a = st.selectbox(
+        type_a = search_selectbox(
             "Connection Type A",
-            st.session_state.connector_types_modified,
+            st.session_state.catalogue_overlay.types(),
             key="lay_type_a",
             label_visibility="collapsed"
         )
-        size_a = st.selectbox(
+        size_a = search_selectbox(
             "Size A",
-            st.session_state.connector_sizes_modified.get(type_a, []),
+            st.session_state.catalogue_overlay.sizes(type_a),
+            conn_type=type_a,
             key="lay_size_a",
             label_visibility="collapsed"
         )
@@ -486,15 +576,16 @@ with layin_tab:
     
     with col2:
         st.markdown("**Lay-in Fitting**")
-        type_lay_in = st.selectbox(
+        type_lay_in = search_selectbox(
             "Lay-in Connection Type",
-            st.session_state.connector_types_modified,
+            st.session_state.catalogue_overlay.types(),
             key="lay_type_lay_in",
             label_visibility="collapsed"
         )
-        size_lay_in = st.selectbox(
+        size_lay_in = search_selectbox(
             "Lay-in Size",
-            st.session_state.connector_sizes_modified.get(type_lay_in, []),
+            st.session_state.catalogue_overlay.sizes(type_lay_in),
+            conn_type=type_lay_in,
             key="lay_size_lay_in",
             label_visibility="collapsed"
         )
@@ -503,15 +594,16 @@ with layin_tab:
     
     with col3:
         st.markdown("**Fitting B**")
-        type_b = st.selectbox(
+        type_b = search_selectbox(
             "Connection Type B",
-            st.session_state.connector_types_modified,
+            st.session_state.catalogue_overlay.types(),
             key="lay_type_b",
             label_visibility="collapsed"
         )
-        size_b = st.selectbox(
+        size_b = search_selectbox(
             "Size B",
-            st.session_state.connector_sizes_modified.get(type_b, []),
+            st.session_state.catalogue_overlay.sizes(type_b),
+            conn_type=type_b,
             key="lay_size_b",
             label_visibility="collapsed"
         )
@@ -541,7 +633,7 @@ with layin_tab:
         )
     
     include_shave = st.checkbox(
-        "Include Shave (-1/16\") on both cuts",
+        f"Include Shave (-{SHAVE_TEXT}\") on both cuts",
         value=False,
         key="lay_shave"
     )
@@ -562,8 +654,8 @@ with layin_tab:
             )
             
             if include_shave:
-                cut1 -= 1/16
-                cut2 -= 1/16
+                cut1 -= SHAVE_INCHES
+                cut2 -= SHAVE_INCHES
             
             # Display result
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
@@ -573,12 +665,12 @@ with layin_tab:
             with col1:
                 st.markdown("**Cut 1 (A → Lay-in):**")
                 st.markdown(f"- Decimal: {cut1:.5f}\"")
-                st.markdown(f"- Fraction: {decimal_to_fraction_16ths(cut1)}")
+                st.markdown(f"- Fraction: {format_length(cut1)}")
             
             with col2:
                 st.markdown("**Cut 2 (Lay-in → B):**")
                 st.markdown(f"- Decimal: {cut2:.5f}\"")
-                st.markdown(f"- Fraction: {decimal_to_fraction_16ths(cut2)}")
+                st.markdown(f"- Fraction: {format_length(cut2)}")
             
             st.markdown("---")
             st.markdown("**Calculation Details:**")
@@ -593,7 +685,7 @@ with layin_tab:
 # ============================================================================
 # TAB 3: BUSHING CUT (three fittings: A -> Bushing -> B)
 # ============================================================================
-with bushing_tab:
+with bushing_tab, section(SECTION, "Bushing Cut tab"):
     st.subheader("Bushing Cut (Three Fittings)")
     st.markdown("Calculate cut length with bushing: Fitting A -> Bushing -> Fitting B")
     
@@ -601,15 +693,16 @@ with bushing_tab:
     
     with col1:
         st.markdown("**Fitting A**")
-        type_a = st.selectbox(
+        type_a = search_selectbox(
             "Connection Type A",
-            st.session_state.connector_types_modified,
+            st.session_state.catalogue_overlay.types(),
             key="bush_type_a",
             label_visibility="collapsed"
         )
-        size_a = st.selectbox(
+        size_a = search_selectbox(
             "Size A",
-            st.session_state.connector_sizes_modified.get(type_a, []),
+            st.session_state.catalogue_overlay.sizes(type_a),
+            conn_type=type_a,
             key="bush_size_a",
             label_visibility="collapsed"
         )
@@ -619,9 +712,10 @@ with bushing_tab:
         st.markdown("**Bushing**")
         type_bushing = "Bushing (Spigot x Socket)"
         st.markdown("Type: Bushing (Spigot x Socket)")
-        size_bushing = st.selectbox(
+        size_bushing = search_selectbox(
             "Bushing Size",
-            st.session_state.connector_sizes_modified.get(type_bushing, []),
+            st.session_state.catalogue_overlay.sizes(type_bushing),
+            conn_type=type_bushing,
             key="bush_size_bushing",
             label_visibility="collapsed"
         )
@@ -629,15 +723,16 @@ with bushing_tab:
     
     with col3:
         st.markdown("**Fitting B**")
-        type_b = st.selectbox(
+        type_b = search_selectbox(
             "Connection Type B",
-            st.session_state.connector_types_modified,
+            st.session_state.catalogue_overlay.types(),
             key="bush_type_b",
             label_visibility="collapsed"
         )
-        size_b = st.selectbox(
+        size_b = search_selectbox(
             "Size B",
-            st.session_state.connector_sizes_modified.get(type_b, []),
+            st.session_state.catalogue_overlay.sizes(type_b),
+            conn_type=type_b,
             key="bush_size_b",
             label_visibility="collapsed"
         )
@@ -654,7 +749,7 @@ with bushing_tab:
     )
     
     include_shave = st.checkbox(
-        "Include Shave (-1/16\")",
+        f"Include Shave (-{SHAVE_TEXT}\")",
         value=False,
         key="bush_shave"
     )
@@ -674,7 +769,7 @@ with bushing_tab:
             )
             
             if include_shave:
-                cut_length -= 1/16
+                cut_length -= SHAVE_INCHES
             
             # Display result
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
@@ -684,7 +779,7 @@ with bushing_tab:
             with col1:
                 st.markdown(f"**Decimal:** {cut_length:.5f}\"")
             with col2:
-                st.markdown(f"**Fraction (1/16ths):** {decimal_to_fraction_16ths(cut_length)}")
+                st.markdown(f"**Fraction ({DEFAULT_FORMATTER.label}):** {format_length(cut_length)}")
             
             st.markdown("---")
             st.markdown("**Calculation Details:**")
@@ -699,7 +794,7 @@ with bushing_tab:
 # ============================================================================
 # TAB 4: JOBS - Create and manage job checklists
 # ============================================================================
-with jobs_tab:
+with jobs_tab, section(SECTION, "Jobs tab"):
     st.subheader("Job Management")
     st.markdown("Create a job, add cuts to a checklist, and export for printing.")
     
@@ -718,10 +813,9 @@ with jobs_tab:
                 if new_job_name in st.session_state.jobs:
                     st.error("Job already exists!")
                 else:
-                    st.session_state.jobs[new_job_name] = {
-                        'cuts': [],
-                        'created_at': str(st.session_state.get('current_timestamp', ''))
-                    }
+                    st.session_state.jobs[new_job_name] = CutJob(
+                        created_at=str(st.session_state.get('current_timestamp', ''))
+                    )
                     st.session_state.current_job = new_job_name
                     st.success(f"Job '{new_job_name}' created!")
                     st.rerun()
@@ -764,28 +858,30 @@ with jobs_tab:
         if cut_type == "Standard Cut":
             col1, col2 = st.columns(2)
             with col1:
-                job_type_a = st.selectbox(
+                job_type_a = search_selectbox(
                     "Connection Type A",
-                    st.session_state.connector_types_modified,
+                    st.session_state.catalogue_overlay.types(),
                     key="job_std_type_a"
                 )
-                job_size_a = st.selectbox(
+                job_size_a = search_selectbox(
                     "Size A",
-                    st.session_state.connector_sizes_modified.get(job_type_a, []),
+                    st.session_state.catalogue_overlay.sizes(job_type_a),
+                    conn_type=job_type_a,
                     key="job_std_size_a"
                 )
                 # Display image for job_type_a
                 display_connector_image(job_type_a, width=120)
             
             with col2:
-                job_type_b = st.selectbox(
+                job_type_b = search_selectbox(
                     "Connection Type B",
-                    st.session_state.connector_types_modified,
+                    st.session_state.catalogue_overlay.types(),
                     key="job_std_type_b"
                 )
-                job_size_b = st.selectbox(
+                job_size_b = search_selectbox(
                     "Size B",
-                    st.session_state.connector_sizes_modified.get(job_type_b, []),
+                    st.session_state.catalogue_overlay.sizes(job_type_b),
+                    conn_type=job_type_b,
                     key="job_std_size_b"
                 )
                 # Display image for job_type_b (flip if Elbow 90)
@@ -826,7 +922,7 @@ with jobs_tab:
                 key="job_std_c2c"
             )
             
-            job_shave = st.checkbox("Include Shave (-1/16\")", key="job_std_shave")
+            job_shave = st.checkbox(f"Include Shave (-{SHAVE_TEXT}\")", key="job_std_shave")
             job_notes = st.text_input("Notes (optional)", key="job_std_notes", placeholder="e.g., kitchen sink drain")
             
             if st.button("Add Cut to Job", key="add_std_cut"):
@@ -843,22 +939,21 @@ with jobs_tab:
                     )
                     
                     if job_shave:
-                        cut_length -= 1/16
+                        cut_length -= SHAVE_INCHES
                     
-                    cut_num = len(st.session_state.jobs[st.session_state.current_job]['cuts']) + 1
                     cut_data = {
-                        'number': cut_num,
                         'type': 'Standard',
                         'connection_a': f"{job_type_a} ({job_size_a}\")",
                         'connection_b': f"{job_type_b} ({job_size_b}\")",
                         'c2c': job_c2c,
                         'length_decimal': cut_length,
-                        'length_fraction': decimal_to_fraction_16ths(cut_length),
+                        'length_fraction': format_length(cut_length),
                         'shave': job_shave,
-                        'notes': job_notes
+                        'notes': job_notes,
+                        'catalogue_version': loader.catalogue_version
                     }
                     
-                    st.session_state.jobs[st.session_state.current_job]['cuts'].append(cut_data)
+                    cut_num = st.session_state.jobs[st.session_state.current_job].add(cut_data)
                     st.success(f"Cut {cut_num} added!")
                     st.rerun()
                 except Exception as e:
@@ -950,9 +1045,9 @@ with jobs_tab:
         #                 'c2c_overall': job_c2c_overall,
         #                 'c2c_lay_in': job_c2c_lay_in,
         #                 'cut1_decimal': cut1,
-        #                 'cut1_fraction': decimal_to_fraction_16ths(cut1),
+        #                 'cut1_fraction': format_length(cut1),
         #                 'cut2_decimal': cut2,
-        #                 'cut2_fraction': decimal_to_fraction_16ths(cut2),
+        #                 'cut2_fraction': format_length(cut2),
         #                 'shave': job_shave,
         #                 'notes': job_notes
         #             }
@@ -967,14 +1062,15 @@ with jobs_tab:
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                job_type_a = st.selectbox(
+                job_type_a = search_selectbox(
                     "Fitting A Type",
-                    st.session_state.connector_types_modified,
+                    st.session_state.catalogue_overlay.types(),
                     key="job_bush_type_a"
                 )
-                job_size_a = st.selectbox(
+                job_size_a = search_selectbox(
                     "Size A",
-                    st.session_state.connector_sizes_modified.get(job_type_a, []),
+                    st.session_state.catalogue_overlay.sizes(job_type_a),
+                    conn_type=job_type_a,
                     key="job_bush_size_a"
                 )
                 # Display image for job_type_a
@@ -983,23 +1079,25 @@ with jobs_tab:
             with col2:
                 st.markdown("**Bushing**")
                 st.markdown("Type: Bushing (Spigot x Socket)")
-                job_size_bushing = st.selectbox(
+                job_size_bushing = search_selectbox(
                     "Bushing Size",
-                    st.session_state.connector_sizes_modified.get("Bushing (Spigot x Socket)", []),
+                    st.session_state.catalogue_overlay.sizes("Bushing (Spigot x Socket)"),
+                    conn_type="Bushing (Spigot x Socket)",
                     key="job_bush_size_bushing"
                 )
                 # Display image for bushing
                 display_connector_image("Bushing (Spigot x Socket)", width=100)
             
             with col3:
-                job_type_b = st.selectbox(
+                job_type_b = search_selectbox(
                     "Fitting B Type",
-                    st.session_state.connector_types_modified,
+                    st.session_state.catalogue_overlay.types(),
                     key="job_bush_type_b"
                 )
-                job_size_b = st.selectbox(
+                job_size_b = search_selectbox(
                     "Size B",
-                    st.session_state.connector_sizes_modified.get(job_type_b, []),
+                    st.session_state.catalogue_overlay.sizes(job_type_b),
+                    conn_type=job_type_b,
                     key="job_bush_size_b"
                 )
                 # Display image for job_type_b (flip if Elbow 90)
@@ -1013,7 +1111,7 @@ with jobs_tab:
                 key="job_bush_c2c"
             )
             
-            job_shave = st.checkbox("Include Shave (-1/16\")", key="job_bush_shave")
+            job_shave = st.checkbox(f"Include Shave (-{SHAVE_TEXT}\")", key="job_bush_shave")
             job_notes = st.text_input("Notes (optional)", key="job_bush_notes")
             
             if st.button("Add Cut to Job", key="add_bush_cut"):
@@ -1030,121 +1128,181 @@ with jobs_tab:
                     )
                     
                     if job_shave:
-                        cut_length -= 1/16
+                        cut_length -= SHAVE_INCHES
                     
-                    cut_num = len(st.session_state.jobs[st.session_state.current_job]['cuts']) + 1
                     cut_data = {
-                        'number': cut_num,
                         'type': 'Bushing',
                         'connection_a': f"{job_type_a} ({job_size_a}\")",
                         'connection_bushing': f"Bushing ({job_size_bushing}\")",
                         'connection_b': f"{job_type_b} ({job_size_b}\")",
                         'c2c': job_c2c,
                         'length_decimal': cut_length,
-                        'length_fraction': decimal_to_fraction_16ths(cut_length),
+                        'length_fraction': format_length(cut_length),
                         'shave': job_shave,
-                        'notes': job_notes
+                        'notes': job_notes,
+                        'catalogue_version': loader.catalogue_version
                     }
                     
-                    st.session_state.jobs[st.session_state.current_job]['cuts'].append(cut_data)
+                    cut_num = st.session_state.jobs[st.session_state.current_job].add(cut_data)
                     st.success(f"Cut {cut_num} added!")
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {e}")
         
+        # Bulk cut list computed by the shared background queue
+        with st.expander("Bulk Cut List (background)", expanded=bool(st.session_state.bulk_cut_jobs)):
+            st.markdown("Paste one standard cut per line: `Type A, Size A, Type B, Size B, C2C[, Shave y/n][, Notes]`. "
+                        "Cuts are computed in the background, so you can keep working in other tabs.")
+            bulk_text = st.text_area("Cut list", key="bulk_cut_text", height=150, label_visibility="collapsed")
+            
+            if st.button("Submit Cut List", key="submit_bulk_cuts"):
+                bulk_specs, parse_errors = parse_bulk_cut_text(bulk_text)
+                for parse_error in parse_errors:
+                    st.error(parse_error)
+                if bulk_specs:
+                    bulk_job = get_cut_job_queue().submit(loader, st.session_state.current_job, bulk_specs)
+                    st.session_state.bulk_cut_jobs.append(bulk_job.job_id)
+                    st.success(f"Submitted {len(bulk_specs)} cuts")
+                elif not parse_errors:
+                    st.error("Please paste at least one cut")
+            
+            # Only the progress reruns on the timer, and only while cut lists are running
+            st.fragment(show_bulk_cut_progress,
+                        run_every=BULK_CUT_REFRESH_SECONDS if st.session_state.bulk_cut_jobs else None)()
+        
+        # Upload a whole cut list file and compute it in one pass
+        with st.expander("Upload Cut List (CSV or XLSX)", expanded=False):
+            st.markdown("Columns: `Type A`, `Size A`, `Type B`, `Size B`, `C2C` and optionally "
+                        "`Cut Type` (Standard/Bushing), `Bushing Size`, `G1 A`, `G1 B`, `Shave`, `Notes`.")
+            uploaded_cut_list = st.file_uploader(
+                "Cut list file",
+                type=["csv", "xlsx"],
+                key="cut_list_upload",
+                label_visibility="collapsed"
+            )
+            
+            if uploaded_cut_list is not None and st.button("Add Uploaded Cuts", key="add_uploaded_cuts"):
+                try:
+                    uploaded_cuts, row_errors = compute_cut_list(loader, read_cut_list(uploaded_cut_list, uploaded_cut_list.name))
+                except ValueError as e:
+                    st.error(f"Error: {e}")
+                else:
+                    for row_num, message in row_errors:
+                        st.error(f"Row {row_num}: {message}")
+                    if uploaded_cuts:
+                        st.session_state.jobs[st.session_state.current_job].extend(uploaded_cuts)
+                        st.success(f"Added {len(uploaded_cuts)} cuts" + (f" ({len(row_errors)} rows skipped)" if row_errors else ""))
+        
         # Display checklist
         st.markdown("#### Checklist")
         
-        if st.session_state.jobs[st.session_state.current_job]['cuts']:
+        job = st.session_state.jobs[st.session_state.current_job]
+        if job:
+            # Job summary from whole columns
+            job_totals = job.totals()
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Cuts", job_totals['cuts'])
+            col2.metric("Total Pipe", f"{format_length(job_totals['total_length'])} {DEFAULT_FORMATTER.unit}")
+            col3.metric("Shaved", job_totals['shaved'])
+            st.caption(" | ".join(f"{cut_type}: {count}" for cut_type, count in job_totals['by_type'].items()))
+            
+            # Large jobs are shown a page at a time
+            page_count = -(-len(job) // CHECKLIST_PAGE_SIZE)
+            page = 1
+            if page_count > 1:
+                page_key = f"checklist_page_{st.session_state.current_job}"
+                if st.session_state.get(page_key, 1) > page_count:
+                    st.session_state[page_key] = page_count  # the job shrank below the page shown
+                page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key=page_key)
+            
             # Create checklist with columns for checkbox, cut info, and delete
-            for cut in st.session_state.jobs[st.session_state.current_job]['cuts']:
-                col1, col2, col3 = st.columns([0.5, 5, 0.5])
+            with section(SECTION, "Jobs: cut list"):
+                for cut in job.cuts((page - 1) * CHECKLIST_PAGE_SIZE, page * CHECKLIST_PAGE_SIZE):
+                    col1, col2, col3 = st.columns([0.5, 5, 0.5])
                 
-                with col1:
-                    checked = st.checkbox(
-                        "Done",
-                        key=f"cut_{cut['number']}_check",
-                        label_visibility="collapsed"
-                    )
+                    with col1:
+                        checked = st.checkbox(
+                            "Done",
+                            key=f"cut_{cut['number']}_check",
+                            label_visibility="collapsed"
+                        )
                 
-                with col2:
-                    if cut['type'] == 'Standard':
-                        st.markdown(f"""
-                        **Cut {cut['number']}** | {cut['type']} Cut  
-                        {cut['connection_a']} → {cut['connection_b']}  
-                        C2C: {cut['c2c']}" | Length: **{cut['length_fraction']}** ({cut['length_decimal']:.4f}")  
-                        {f"✓ Shave applied" if cut['shave'] else ""}  
-                        {f"_Note: {cut['notes']}_" if cut['notes'] else ""}
-                        """)
-                    # elif cut['type'] == 'Lay-in':
-                    #     st.markdown(f"""
-                    #     **Cut {cut['number']}** | {cut['type']} Cut  
-                    #     {cut['connection_a']} → {cut['connection_lay_in']} → {cut['connection_b']}  
-                    #     Cut 1 (A→Lay-in): **{cut['cut1_fraction']}** ({cut['cut1_decimal']:.4f}")  
-                    #     Cut 2 (Lay-in→B): **{cut['cut2_fraction']}** ({cut['cut2_decimal']:.4f}")  
-                    #     {f"✓ Shave applied" if cut['shave'] else ""}  
-                    #     {f"_Note: {cut['notes']}_" if cut['notes'] else ""}
-                    #     """)
-                    elif cut['type'] == 'Bushing':
-                        st.markdown(f"""
-                        **Cut {cut['number']}** | {cut['type']} Cut  
-                        {cut['connection_a']} → {cut['connection_bushing']} → {cut['connection_b']}  
-                        C2C: {cut['c2c']}" | Length: **{cut['length_fraction']}** ({cut['length_decimal']:.4f}")  
-                        {f"✓ Shave applied" if cut['shave'] else ""}  
-                        {f"_Note: {cut['notes']}_" if cut['notes'] else ""}
-                        """)
+                    with col2:
+                        if cut['type'] == 'Standard':
+                            st.markdown(f"""
+                            **Cut {cut['number']}** | {cut['type']} Cut  
+                            {cut['connection_a']} → {cut['connection_b']}  
+                            C2C: {cut['c2c']}" | Length: **{cut['length_fraction']}** ({cut['length_decimal']:.4f}")  
+                            {f"✓ Shave applied" if cut['shave'] else ""}  
+                            {f"_Note: {cut['notes']}_" if cut['notes'] else ""}  
+                            {f"Catalogue v{cut['catalogue_version']}" if cut.get('catalogue_version') else ""}
+                            """)
+                        # elif cut['type'] == 'Lay-in':
+                        #     st.markdown(f"""
+                        #     **Cut {cut['number']}** | {cut['type']} Cut  
+                        #     {cut['connection_a']} → {cut['connection_lay_in']} → {cut['connection_b']}  
+                        #     Cut 1 (A→Lay-in): **{cut['cut1_fraction']}** ({cut['cut1_decimal']:.4f}")  
+                        #     Cut 2 (Lay-in→B): **{cut['cut2_fraction']}** ({cut['cut2_decimal']:.4f}")  
+                        #     {f"✓ Shave applied" if cut['shave'] else ""}  
+                        #     {f"_Note: {cut['notes']}_" if cut['notes'] else ""}
+                        #     """)
+                        elif cut['type'] == 'Bushing':
+                            st.markdown(f"""
+                            **Cut {cut['number']}** | {cut['type']} Cut  
+                            {cut['connection_a']} → {cut['connection_bushing']} → {cut['connection_b']}  
+                            C2C: {cut['c2c']}" | Length: **{cut['length_fraction']}** ({cut['length_decimal']:.4f}")  
+                            {f"✓ Shave applied" if cut['shave'] else ""}  
+                            {f"_Note: {cut['notes']}_" if cut['notes'] else ""}  
+                            {f"Catalogue v{cut['catalogue_version']}" if cut.get('catalogue_version') else ""}
+                            """)
                 
-                with col3:
-                    if st.button("🗑️", key=f"delete_cut_{cut['number']}", help="Delete this cut"):
-                        st.session_state.jobs[st.session_state.current_job]['cuts'].remove(cut)
-                        st.success("Cut removed!")
-                        st.rerun()
+                    with col3:
+                        if st.button("🗑️", key=f"delete_cut_{cut['number']}", help="Delete this cut"):
+                            job.delete(cut['number'])
+                            st.success("Cut removed!")
+                            st.rerun()
                 
-                st.divider()
+                    st.divider()
             
             # Export section
             st.markdown("#### Export Checklist")
             
             col1, col2 = st.columns(2)
+            job_name = st.session_state.current_job
             
             with col1:
-                # Generate text version for printing
-                export_text = f"PVC CUT CALCULATOR - JOB CHECKLIST\n"
-                export_text += f"Job: {st.session_state.current_job}\n"
-                export_text += f"{'='*60}\n\n"
-                
-                for cut in st.session_state.jobs[st.session_state.current_job]['cuts']:
-                    export_text += f"[ ] CUT {cut['number']}\n"
-                    if cut['type'] == 'Standard':
-                        export_text += f"    Type: Standard Cut\n"
-                        export_text += f"    {cut['connection_a']} → {cut['connection_b']}\n"
-                        export_text += f"    C2C: {cut['c2c']}\"\n"
-                        export_text += f"    Length: {cut['length_fraction']} ({cut['length_decimal']:.4f}\")\n"
-                    # elif cut['type'] == 'Lay-in':
-                    #     export_text += f"    Type: Lay-in Cut\n"
-                    #     export_text += f"    {cut['connection_a']} → {cut['connection_lay_in']} → {cut['connection_b']}\n"
-                    #     export_text += f"    Cut 1: {cut['cut1_fraction']} ({cut['cut1_decimal']:.4f}\")\n"
-                    #     export_text += f"    Cut 2: {cut['cut2_fraction']} ({cut['cut2_decimal']:.4f}\")\n"
-                    elif cut['type'] == 'Bushing':
-                        export_text += f"    Type: Bushing Cut\n"
-                        export_text += f"    {cut['connection_a']} → {cut['connection_bushing']} → {cut['connection_b']}\n"
-                        export_text += f"    C2C: {cut['c2c']}\"\n"
-                        export_text += f"    Length: {cut['length_fraction']} ({cut['length_decimal']:.4f}\")\n"
-                    
-                    if cut['shave']:
-                        export_text += f"    ✓ Shave applied\n"
-                    if cut['notes']:
-                        export_text += f"    Note: {cut['notes']}\n"
-                    export_text += "\n"
-                
+                # Exports are only built when a download is clicked
                 st.download_button(
                     label="📥 Download Checklist (TXT)",
-                    data=export_text,
-                    file_name=f"{st.session_state.current_job}_checklist.txt",
+                    data=lambda: job.checklist_text(job_name),
+                    file_name=f"{job_name}_checklist.txt",
                     mime="text/plain"
                 )
+                st.download_button(
+                    label="📊 Download Cuts (CSV)",
+                    data=lambda: job.to_frame().to_csv(index=False),
+                    file_name=f"{job_name}_cuts.csv",
+                    mime="text/csv",
+                    key="download_cuts_csv"
+                )
             
             with col2:
+                # PDFs are only rendered when a download is clicked, streamed into a spooled file
+                label_barcodes = st.checkbox("Barcodes on labels", value=True, key="label_barcodes")
+                st.download_button(
+                    label="🏷️ Download Cut Labels (PDF)",
+                    data=lambda: spool(stream_labels_pdf(job.cuts(), job_name, label_barcodes)),
+                    file_name=f"{job_name}_labels.pdf",
+                    mime="application/pdf",
+                    key="download_labels_pdf"
+                )
+                st.download_button(
+                    label="📄 Download Cut Sheet (PDF)",
+                    data=lambda: spool(stream_sheet_pdf(job.cuts(), job_name)),
+                    file_name=f"{job_name}_cut_sheet.pdf",
+                    mime="application/pdf",
+                    key="download_sheet_pdf"
+                )
                 st.info("💡 Tip: Use your browser's Print function (Cmd+P) to print this checklist or save as PDF")
         
         else:
@@ -1153,10 +1311,24 @@ with jobs_tab:
 # ============================================================================
 # TAB 5: MANAGE FITTINGS - Add new connector types and sizes
 # ============================================================================
-with manage_tab:
+with manage_tab, section(SECTION, "Manage Fittings tab"):
     st.subheader("Manage Fittings")
     st.markdown("Add new connector types and sizes to your database.")
-    
+
+    # Offline calculator: the catalogue and formulas in one HTML file, for tablets without signal
+    offline_stamp = bundle_stamp(loader)
+    col_offline, col_offline_info = st.columns([1, 2])
+    with col_offline:
+        st.download_button(
+            label="📲 Download Offline Calculator (HTML)",
+            data=lambda: bundle_html(loader),
+            file_name=f"pvc_cut_calculator_{offline_stamp}.html",
+            mime="text/html",
+            key="download_offline_bundle"
+        )
+    with col_offline_info:
+        st.caption(f"Current catalogue stamp: `{offline_stamp}`. An offline copy showing a different stamp is out of date.")
+
     tab_view, tab_add = st.tabs(["View Current Fittings", "Add New Fitting"])
     
     # ========================
@@ -1165,28 +1337,47 @@ with manage_tab:
     with tab_view:
         st.markdown("### Current Connector Types")
         
-        for conn_type in st.session_state.connector_types_modified:
+        catalogue_issues = loader.validation_report
+        if not catalogue_issues.empty:
+            st.warning(f"⚠️ The database has {len(catalogue_issues)} data issue(s). Lookups for these rows may fail or be ambiguous.")
+            with st.expander("Show database issues", expanded=False):
+                st.dataframe(catalogue_issues, hide_index=True, use_container_width=True)
+        
+        fitting_query = st.text_input("Search fittings", key="manage_search", placeholder="e.g. tee or elbow")
+        search_index = get_connector_search_index()
+        shown_types = st.session_state.catalogue_overlay.types()
+        if fitting_query.strip():
+            shown_types = search_index.search_types(fitting_query, SEARCH_LIMIT)
+        if len(shown_types) > SEARCH_THRESHOLD:
+            st.caption(f"Showing {SEARCH_LIMIT} of {len(shown_types)} connector types. Search to narrow the list.")
+            shown_types = shown_types[:SEARCH_LIMIT]
+        
+        for conn_type in shown_types:
             with st.expander(f"📦 {conn_type}", expanded=False):
-                sizes = st.session_state.connector_sizes_modified.get(conn_type, [])
+                sizes = st.session_state.catalogue_overlay.sizes(conn_type)
+                if len(sizes) > SEARCH_THRESHOLD:
+                    size_query = st.text_input("Search sizes", key=f"manage_size_search_{conn_type}", placeholder="e.g. 2x2 or 1-1/2")
+                    st.caption(f"{len(sizes)} sizes; showing the top {SEARCH_LIMIT} matches")
+                    sizes = search_index.search_sizes(conn_type, size_query, SEARCH_LIMIT)
                 
                 # Delete entire connector type button
                 col1, col2 = st.columns([4, 1])
                 with col2:
                     if st.button("🗑️ Delete Type", key=f"delete_type_{conn_type}", type="secondary", help="Delete entire connector type"):
-                        # Delete from Excel, config, and images folder
-                        if delete_connector_from_excel(conn_type):
+                        # Delete from the catalogue (journal), config, and images folder
+                        if delete_connector_from_journal(conn_type):
                             if delete_connector_from_config(conn_type):
                                 # Delete associated image
                                 delete_connector_image(conn_type)
+                                catalogue_watcher.remove_type(conn_type, f"Deleted type {conn_type}")
                                 
-                                st.session_state.connector_types_modified.remove(conn_type)
-                                del st.session_state.connector_sizes_modified[conn_type]
+                                st.session_state.catalogue_overlay.remove_type(conn_type)
                                 st.success(f"✅ Removed '{conn_type}' from database, config, and images folder!")
                                 st.rerun()
                             else:
-                                st.error("Deleted from Excel but failed to update config.py")
+                                st.error("Recorded in the journal but failed to update config.py")
                         else:
-                            st.error("Failed to delete from Excel database")
+                            st.error("Failed to record the deletion in the catalogue journal")
                 
                 if sizes:
                     st.markdown(f"**Available Sizes ({len(sizes)}):**")
@@ -1197,17 +1388,18 @@ with manage_tab:
                             st.code(size, language="text")
                         with col3:
                             if st.button("✕", key=f"delete_size_{conn_type}_{size}", help="Delete this size"):
-                                # Delete from Excel and config
-                                if delete_connector_from_excel(conn_type, size):
+                                # Delete from the catalogue (journal) and config
+                                if delete_connector_from_journal(conn_type, size):
                                     if delete_connector_from_config(conn_type, size):
-                                        updated_sizes = [s for s in st.session_state.connector_sizes_modified[conn_type] if s != size]
-                                        st.session_state.connector_sizes_modified[conn_type] = updated_sizes
+                                        catalogue_watcher.publish_sizes(conn_type, loader.size_changes([size], remove=True),
+                                                                        f"Deleted {conn_type} size {size}")
+                                        st.session_state.catalogue_overlay.remove_sizes(conn_type, [size])
                                         st.success(f"✅ Removed '{size}' from database and config!")
                                         st.rerun()
                                     else:
-                                        st.error("Deleted from Excel but failed to update config.py")
+                                        st.error("Recorded in the journal but failed to update config.py")
                                 else:
-                                    st.error("Failed to delete from Excel database")
+                                    st.error("Failed to record the deletion in the catalogue journal")
                                 st.rerun()
                 else:
                     st.warning("No sizes defined for this connector type")
@@ -1220,7 +1412,8 @@ with manage_tab:
         
         option = st.radio(
             "What would you like to add?",
-            ["Add New Connector Type", "Add Size to Existing Type"],
+            ["Add New Connector Type", "Add Size to Existing Type", "Update Offset of Existing Size",
+             "Import Fittings from File"],
             key="fitting_option"
         )
         
@@ -1394,7 +1587,7 @@ with manage_tab:
             if st.button("✅ Create Connector Type", key="add_new_type", type="primary"):
                 if not new_type_name.strip():
                     st.error("Please enter a connector type name")
-                elif new_type_name in st.session_state.connector_types_modified:
+                elif new_type_name in st.session_state.catalogue_overlay.types():
                     st.error(f"Connector type '{new_type_name}' already exists!")
                 elif not st.session_state.new_conn_sizes_list:
                     st.error("Please add at least one size with offset")
@@ -1402,24 +1595,18 @@ with manage_tab:
                     # Extract sizes and offsets
                     sizes_list = [s['size'] for s in st.session_state.new_conn_sizes_list]
                     
-                    # Save to Excel database
-                    if save_connector_to_excel(new_type_name, st.session_state.new_conn_sizes_list):
+                    # Record in the catalogue journal
+                    if save_connector_to_journal(new_type_name, st.session_state.new_conn_sizes_list):
                         # Update config.py with image filename
                         if update_config_py(new_type_name, st.session_state.new_conn_sizes_list, final_filename):
-                            # Add to session state
-                            st.session_state.connector_types_modified.append(new_type_name)
-                            st.session_state.connector_sizes_modified[new_type_name] = sizes_list
-                            
-                            # Store offset data
-                            if 'connector_offsets' not in st.session_state:
-                                st.session_state.connector_offsets = {}
+                            catalogue_watcher.publish_sizes(new_type_name, loader.size_changes(st.session_state.new_conn_sizes_list),
+                                                            f"Added type {new_type_name}")
                             
+                            # Add to this session's overlay, with the offsets entered
+                            overlay = st.session_state.catalogue_overlay
+                            overlay.add_type(new_type_name, sizes_list)
                             for size_data in st.session_state.new_conn_sizes_list:
-                                offset_key = f"{new_type_name}|{size_data['size']}"
-                                st.session_state.connector_offsets[offset_key] = {
-                                    'offset': size_data['offset'],
-                                    'g1_offset': size_data['g1_offset'] if size_data['g1_offset'] > 0 else None
-                                }
+                                overlay.set_offset(new_type_name, size_data['size'], size_data['offset'], size_data['g1_offset'])
                             
                             # Store image if uploaded
                             if uploaded_image is not None and final_filename:
@@ -1440,17 +1627,17 @@ with manage_tab:
                                         'flip_vertical': st.session_state.image_flip_vertical
                                     }
                                     st.success(f"✅ Created '{new_type_name}' with {len(sizes_list)} sizes!")
-                                    st.success(f"✅ Saved to Excel database and config.py!")
+                                    st.success(f"✅ Saving to the catalogue journal and config.py (see Save Status)")
                                     st.success(f"📸 Image saved to images/ as '{final_filename}'!")
                                 else:
                                     st.error("Failed to save image to images/ folder")
                             else:
                                 st.success(f"✅ Created '{new_type_name}' with {len(sizes_list)} sizes!")
-                                st.success(f"✅ Saved to Excel database and config.py!")
+                                st.success(f"✅ Saving to the catalogue journal and config.py (see Save Status)")
                             
                             st.info(f"""
-                            ℹ️ **Changes have been saved permanently to:**
-                            - Excel database: `data/PVC Cut Database .xlsx`
+                            ℹ️ **Changes are being saved in the background to:**
+                            - Catalogue journal: `data/catalogue_journal.jsonl` (folded into `data/PVC Cut Database .xlsx` periodically)
                             - Configuration: `src/config.py`
                             
                             **Note:** You may need to restart the app to fully load the changes in all modules.
@@ -1460,16 +1647,16 @@ with manage_tab:
                             st.session_state.new_conn_sizes_list = []
                             st.rerun()
                         else:
-                            st.error("Failed to update config.py. Changes saved to Excel only.")
+                            st.error("Failed to update config.py. Changes recorded in the catalogue journal only.")
                     else:
-                        st.error("Failed to save to Excel database.")
+                        st.error("Failed to record the change in the catalogue journal.")
         
-        else:  # Add Size to Existing Type
+        elif option == "Add Size to Existing Type":
             st.markdown("#### Add Size to Existing Type")
             
-            existing_type = st.selectbox(
+            existing_type = search_selectbox(
                 "Select Connector Type",
-                st.session_state.connector_types_modified,
+                st.session_state.catalogue_overlay.types(),
                 key="select_existing_type"
             )
             
@@ -1510,49 +1697,216 @@ with manage_tab:
                     st.error("Please enter a valid offset value")
                 else:
                     new_size = new_size_input.strip()
-                    current_sizes = st.session_state.connector_sizes_modified.get(existing_type, [])
+                    current_sizes = st.session_state.catalogue_overlay.sizes(existing_type)
                     
                     if new_size in current_sizes:
                         st.error(f"Size '{new_size}' already exists in '{existing_type}'")
                     else:
-                        # Save to Excel
+                        # Record in the catalogue journal
                         size_data = {
                             'size': new_size,
                             'offset': offset_value,
                             'g1_offset': g1_offset_value
                         }
                         
-                        if save_connector_to_excel(existing_type, [size_data]):
+                        if save_connector_to_journal(existing_type, [size_data]):
                             # Update config.py
                             if update_config_py(existing_type, [size_data]):
-                                # Add new size to session state
-                                updated_sizes = current_sizes + [new_size]
-                                st.session_state.connector_sizes_modified[existing_type] = updated_sizes
-                                
-                                # Store offset data in session state
-                                if 'connector_offsets' not in st.session_state:
-                                    st.session_state.connector_offsets = {}
+                                catalogue_watcher.publish_sizes(existing_type, loader.size_changes([size_data]),
+                                                                f"Added {existing_type} size {new_size}")
                                 
-                                offset_key = f"{existing_type}|{new_size}"
-                                st.session_state.connector_offsets[offset_key] = {
-                                    'offset': offset_value,
-                                    'g1_offset': g1_offset_value if g1_offset_value > 0 else None
-                                }
+                                # Add the new size and its offset to this session's overlay
+                                st.session_state.catalogue_overlay.add_sizes(existing_type, [new_size])
+                                st.session_state.catalogue_overlay.set_offset(existing_type, new_size, offset_value, g1_offset_value)
                                 
                                 st.success(f"✅ Added size '{new_size}' to '{existing_type}'!")
-                                st.success(f"✅ Saved to Excel database and config.py!")
+                                st.success(f"✅ Saving to the catalogue journal and config.py (see Save Status)")
                                 st.info(f"""
-                                ℹ️ **Changes have been saved permanently to:**
-                                - Excel database: `data/PVC Cut Database .xlsx`
+                                ℹ️ **Changes are being saved in the background to:**
+                                - Catalogue journal: `data/catalogue_journal.jsonl` (folded into `data/PVC Cut Database .xlsx` periodically)
                                 - Configuration: `src/config.py`
                                 
                                 **Note:** You may need to restart the app to fully load the changes in all modules.
                                 """)
                                 st.rerun()
                             else:
-                                st.error("Failed to update config.py. Changes saved to Excel only.")
+                                st.error("Failed to update config.py. Changes recorded in the catalogue journal only.")
                         else:
-                            st.error("Failed to save to Excel database.")
+                            st.error("Failed to record the change in the catalogue journal.")
+    
+        elif option == "Update Offset of Existing Size":
+            st.markdown("#### Update Offset of Existing Size")
+            
+            update_type = search_selectbox(
+                "Select Connector Type",
+                st.session_state.catalogue_overlay.types(),
+                key="select_update_type"
+            )
+            update_size = search_selectbox(
+                "Select Size",
+                st.session_state.catalogue_overlay.sizes(update_type),
+                conn_type=update_type,
+                key="select_update_size"
+            )
+            previous = current_sizes_data(update_type, update_size) if update_size else []
+            if previous:
+                st.caption(f"Current offset: {previous[0]['offset']}\"" +
+                           (f" | G1: {previous[0]['g1_offset']}\"" if previous[0]['g1_offset'] else ""))
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                updated_offset = st.number_input("New Offset", min_value=0.0, step=0.0625,
+                                                 key="update_offset_value", format="%.4f")
+            with col2:
+                updated_g1 = st.number_input("New G1 Offset (optional)", min_value=0.0, step=0.0625,
+                                             key="update_g1_offset_value", format="%.4f")
+            
+            if st.button("Update Offset", key="update_offset_button", type="primary"):
+                if not update_size:
+                    st.error("Please select a size")
+                elif updated_offset == 0.0:
+                    st.error("Please enter a valid offset value")
+                else:
+                    size_data = {'size': update_size, 'offset': updated_offset, 'g1_offset': updated_g1}
+                    try:
+                        get_catalogue_writer().append(UPDATE_OFFSET, update_type, [size_data],
+                                                      user=journal_user(), previous=previous)
+                        catalogue_watcher.publish_sizes(update_type, loader.size_changes([size_data]),
+                                                        f"Updated {update_type} size {update_size}")
+                        if (update_type, update_size) in st.session_state.catalogue_overlay.offsets:
+                            st.session_state.catalogue_overlay.set_offset(update_type, update_size, updated_offset, updated_g1)
+                        st.success(f"✅ Updated offset of '{update_type}' size '{update_size}'!")
+                    except Exception as e:
+                        st.error(f"Error saving to the catalogue journal: {e}")
+    
+        else:  # Import Fittings from File
+            st.markdown("#### Import Fittings from File")
+            st.caption("CSV or XLSX with Part, Size, Offset and (optionally) Offset (G1) columns. "
+                       "Rows are checked and compared with the catalogue first; the whole import is "
+                       "then saved in one step.")
+            import_file = st.file_uploader("Fitting list", type=["csv", "xlsx"], key="fitting_import_file")
+            if import_file is not None:
+                try:
+                    with section(IO, "fitting import read"):
+                        import_df = read_fitting_import(import_file, import_file.name)
+                    fitting_import = plan_fitting_import(import_df, loader.snapshot)
+                except ValueError as e:
+                    st.error(str(e))
+                    fitting_import = None
+
+                if fitting_import is not None:
+                    summary = fitting_import.summary()
+                    metric_cols = st.columns(5)
+                    for col, (label, key) in zip(metric_cols, [("New types", NEW_TYPE), ("New sizes", NEW_SIZE),
+                                                               ("Updated", UPDATE), ("Unchanged", "unchanged"),
+                                                               ("Errors", "errors")]):
+                        col.metric(label, summary[key])
+
+                    if not fitting_import.errors.empty:
+                        st.warning(f"{summary['errors']} row(s) can't be imported and will be skipped:")
+                        st.dataframe(fitting_import.errors, hide_index=True, use_container_width=True)
+                    import_changes = fitting_import.changes
+                    if import_changes.empty:
+                        st.info("Nothing to import: every valid row matches the catalogue.")
+                    else:
+                        st.dataframe(import_changes, hide_index=True, use_container_width=True)
+                        if (import_changes['warning'] != "").any():
+                            st.warning("Some offsets look large for their size (see the warning column).")
+                        if st.button(f"Import {len(import_changes)} change(s)", key="apply_fitting_import", type="primary"):
+                            try:
+                                with section(IO, "fitting import apply"):
+                                    catalogue_writer = get_catalogue_writer()
+                                    apply_fitting_import(fitting_import, catalogue_writer, catalogue_watcher, journal_user())
+                                    catalogue_writer.add_to_config(fitting_import.sizes_by_type())
+                            except Exception as e:
+                                st.error(f"Error saving to the catalogue journal: {e}")
+                            else:
+                                overlay = st.session_state.catalogue_overlay
+                                for conn_type, sizes in fitting_import.sizes_by_type().items():
+                                    if conn_type in overlay.types():
+                                        overlay.add_sizes(conn_type, sizes)
+                                    else:
+                                        overlay.add_type(conn_type, sizes)
+                                st.success(f"✅ Imported {len(import_changes)} change(s) in one catalogue update")
+
+    # ========================
+    # Change log (catalogue journal)
+    # ========================
+    st.markdown("---")
+    st.markdown("### Change Log")
+    st.text_input("Your name (recorded with each change)", key="journal_user")
+    
+    # Save status of the write-behind queue: edits are live at once and written shortly after
+    catalogue_writer = get_catalogue_writer()
+    save_status = catalogue_writer.status()
+    unsaved = save_status['pending_entries'] + save_status['pending_config_edits']
+    if save_status['last_error']:
+        st.error(f"💾 {unsaved} change(s) not saved yet: {save_status['last_error']}. "
+                 f"They are kept and retried automatically.")
+        if st.button("Retry saving now", key="retry_catalogue_save"):
+            catalogue_writer.flush(timeout=30)
+            st.rerun()
+    elif unsaved or save_status['compaction_pending']:
+        st.caption(f"💾 Saving {unsaved} change(s)…" if unsaved else "💾 Folding changes into the workbook…")
+    elif save_status['last_saved_at']:
+        st.caption(f"💾 All changes saved ({time.strftime('%H:%M:%S', time.localtime(save_status['last_saved_at']))})")
+    if save_status['compaction_error']:
+        st.warning(f"Could not fold changes into the workbook: {save_status['compaction_error']}. "
+                   f"Your changes are saved in the change log; fold again to retry.")
+    
+    catalogue_journal = CatalogueJournal(JOURNAL_PATH)
+    pending_entries = catalogue_journal.entries()
+    change_history = catalogue_journal.history()
+    if change_history:
+        pending_seqs = {entry['seq'] for entry in pending_entries}
+        st.dataframe(
+            pd.DataFrame([{
+                "#": entry['seq'],
+                "Time": time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['at'])),
+                "User": entry['user'],
+                "Change": entry['op'].replace('_', ' ') + (f" (undo #{entry['undoes']})" if 'undoes' in entry else ""),
+                "Type": entry['type'],
+                "Sizes": ", ".join(f"{s['size']}" + (f" = {s['offset']}\"" if s.get('offset') else "") for s in entry['sizes']),
+                "In workbook": entry['seq'] not in pending_seqs,
+            } for entry in reversed(change_history[-200:])]),
+            hide_index=True,
+        )
+    else:
+        st.caption("No catalogue changes recorded yet.")
+    
+    if pending_entries:
+        col1, col2 = st.columns(2)
+        with col1:
+            undo_seq = st.selectbox(
+                "Undo change",
+                [entry['seq'] for entry in reversed(pending_entries)],
+                format_func=lambda seq: next(f"#{e['seq']} {e['op'].replace('_', ' ')} {e['type']}"
+                                             for e in pending_entries if e['seq'] == seq),
+                key="undo_seq"
+            )
+            if st.button("↩️ Undo", key="undo_change"):
+                try:
+                    # Queued edits go into the journal first, so the undo lands after them
+                    if not catalogue_writer.flush(timeout=30):
+                        raise ValueError(f"Queued changes could not be saved: {catalogue_writer.status()['last_error']}")
+                    undo_entries = catalogue_journal.undo(undo_seq, user=journal_user())
+                    with section(IO, "catalogue reload"):
+                        catalogue_watcher.reload()
+                    for undo_entry in undo_entries:
+                        apply_journal_entry_to_session(undo_entry)
+                    st.success(f"✅ Undid change #{undo_seq}")
+                    st.rerun()
+                except ValueError as e:
+                    st.error(str(e))
+        with col2:
+            st.caption(f"{len(pending_entries)} change(s) not yet folded into the workbook "
+                       f"(done automatically every {JOURNAL_COMPACT_INTERVAL // 60} minutes)")
+            if st.button("Fold changes into workbook now", key="compact_journal"):
+                # The workbook rewrite runs on the writer thread after any queued edits;
+                # the watcher reloads the workbook when it sees the change
+                catalogue_writer.request_compaction(functools.partial(catalogue_watcher.compact, raise_errors=True))
+                st.success(f"✅ Folding {len(pending_entries)} change(s) into the workbook in the background")
+                st.rerun()
     
     # Display current session state
     st.markdown("---")
@@ -1560,16 +1914,39 @@ with manage_tab:
     
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Total Connector Types", len(st.session_state.connector_types_modified))
+        st.metric("Total Connector Types", len(st.session_state.catalogue_overlay.types()))
     
     with col2:
-        total_sizes = sum(len(sizes) for sizes in st.session_state.connector_sizes_modified.values())
+        overlay = st.session_state.catalogue_overlay
+        total_sizes = sum(len(overlay.sizes(conn_type)) for conn_type in overlay.types())
         st.metric("Total Sizes", total_sizes)
     
+    st.caption(f"Offset catalogue version {loader.catalogue_version}, workbook loaded "
+               f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(catalogue_watcher.loaded_at))}")
+    if st.checkbox("Show catalogue versions", key="show_catalogue_versions"):
+        st.dataframe(
+            pd.DataFrame(
+                [(version, source, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created)))
+                 for version, source, created in reversed(catalogue_watcher.history.entries())],
+                columns=["Version", "Change", "Time"],
+            ),
+            hide_index=True,
+        )
+    if catalogue_watcher.last_error:
+        st.warning(f"Workbook changed but could not be reloaded: {catalogue_watcher.last_error}")
+    
     if st.checkbox("Show detailed session data", key="show_session_data"):
+        overlay = st.session_state.catalogue_overlay
         st.json({
-            "types": st.session_state.connector_types_modified,
-            "sizes": st.session_state.connector_sizes_modified
+            "types": list(overlay.types()),
+            "sizes": {conn_type: list(overlay.sizes(conn_type)) for conn_type in overlay.types()},
+            "session_edits": {
+                "added_types": overlay.added_types,
+                "removed_types": sorted(overlay.removed_types),
+                "added_sizes": overlay.added_sizes,
+                "removed_sizes": {t: sorted(sizes) for t, sizes in overlay.hidden_sizes.items()},
+                "offsets": {f"{t} | {size}": entry.offset for (t, size), entry in overlay.offsets.items()},
+            }
         })
 
 # Footer
@@ -1582,3 +1959,25 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+st.session_state.rerun_tracer.end()
+
+# Hidden diagnostics panel: rerun timings for this session
+if st.query_params.get("diagnostics") == "1":
+    rerun_tracer = st.session_state.rerun_tracer
+    with st.expander("🩺 Diagnostics: rerun timings", expanded=True):
+        finished = [trace for trace in rerun_tracer.traces if trace.total is not None]
+        st.caption(f"{len(finished)} of the last {len(rerun_tracer.traces)} reruns finished "
+                   f"(the rest were cut short by st.rerun)")
+        if finished:
+            st.markdown(f"**This rerun:** {finished[-1].total * 1000:.1f} ms")
+            st.dataframe(pd.DataFrame(finished[-1].breakdown()).sort_values("ms", ascending=False),
+                         hide_index=True)
+            st.markdown("**Rolling window:**")
+            st.dataframe(rerun_tracer.summary().round(2), hide_index=True)
+        st.download_button(
+            label="📥 Download traces (JSONL)",
+            data=rerun_tracer.export_jsonl(),
+            file_name="rerun_traces.jsonl",
+            mime="application/json"
+        )
@@ -0,0 +1,36 @@
+import pandas as pd
+from src.catalogue import CatalogueSnapshot
+from src.catalogue_journal import CatalogueJournal
+from src.fitting_import import apply_fitting_import, plan_fitting_import
+
+TEE = "Tee (Socket x Socket x Socket)"
+
+
+def _import(offsets, g1_offsets=None):
+    return pd.DataFrame({
+        "part": [TEE] * len(offsets),
+        "size": [str(i + 1) for i in range(len(offsets))],
+        "offset": offsets,
+        "g1_offset": g1_offsets or [""] * len(offsets),
+    })
+
+
+def test_non_finite_offsets_are_row_errors(tmp_path):
+    df = _import(["inf", "1e309", "-inf", "nan", "1.5"], ["", "", "", "", "inf"])
+    plan = plan_fitting_import(df, CatalogueSnapshot.build({}))
+
+    assert plan.rows.empty
+    assert list(plan.errors["message"]) == ["Offset must be a finite number"] * 3 + [
+        "Offset is not a number or fraction", "Offset (G1) must be a finite number"]
+
+    # Nothing reaches the journal
+    journal = CatalogueJournal(str(tmp_path / "journal.jsonl"))
+    assert apply_fitting_import(plan, journal) == []
+    assert journal.entries() == []
+
+
+def test_finite_offsets_are_planned():
+    plan = plan_fitting_import(_import(["1.5", "15/32"], ["", "0.75"]), CatalogueSnapshot.build({}))
+
+    assert plan.errors.empty
+    assert list(plan.rows["offset"]) == [1.5, 15 / 32]